@@ -0,0 +1,297 @@
+import argparse
+import json
+import os
+import platform
+import queue
+import sys
+import sysconfig
+import threading
+import time
+
+# --- Concurrency Benchmarks ---
+# Measures the patterns from notes.py section 24 (Lock, Event, Queue, app.after)
+# so the numbers behind the auto_clicker's design choices can be checked on any
+# interpreter, including free-threaded (no-GIL) builds:
+#   event_wake      how long a thread blocked in Event.wait() takes to wake up after set(),
+#                   compared with polling a flag with time.sleep()
+#   queue           items/s through queue.Queue and queue.SimpleQueue, 1 and N producers
+#   lock            increments/s of a shared counter under one Lock, 1..N threads
+#   after           Tk after(0): cost of posting from a worker thread, and latency until
+#                   the callback runs on the main loop (skipped without a display)
+#
+# Usage:
+#   python bench_concurrency.py                        # everything, table on stdout
+#   python bench_concurrency.py --only event_wake,lock --json results.json
+#   python bench_concurrency.py --quick               # smaller counts, for a smoke test
+#
+# The JSON file has an "environment" block (version, build, GIL state, CPU count) so
+# results from different Pythons can be compared side by side.
+
+
+def environment():
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None) # 3.13+
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "build": sys.version,
+        "free_threaded_build": bool(sysconfig.get_config_var("Py_GIL_DISABLED")),
+        "gil_enabled": is_gil_enabled() if is_gil_enabled else True,
+        "switch_interval_s": sys.getswitchinterval(),
+        "cpu_count": os.cpu_count(),
+        "platform": platform.platform(),
+    }
+
+
+def percentiles(samples):
+    """Latency summary in microseconds."""
+    samples = sorted(samples)
+    pct = lambda q: samples[min(len(samples) - 1, int(q * len(samples)))] * 1e6
+    return {
+        "count": len(samples),
+        "p50_us": round(pct(0.5), 2),
+        "p99_us": round(pct(0.99), 2),
+        "max_us": round(samples[-1] * 1e6, 2),
+        "mean_us": round(sum(samples) / len(samples) * 1e6, 2),
+    }
+
+
+# --- Event wake-up vs sleep polling ---
+def _wake_latencies(wait_for_signal, signal, reset, rounds):
+    """
+    A waiter thread blocks in wait_for_signal(); the main thread calls signal() and
+    the waiter records how long after that it woke up. One round at a time.
+    """
+    latencies = []
+    signalled_at = [0.0]
+    ready = threading.Event()
+    done = threading.Event()
+
+    def waiter():
+        for _ in range(rounds):
+            ready.set()
+            wait_for_signal()
+            latencies.append(time.perf_counter() - signalled_at[0])
+            reset()
+            done.set()
+
+    thread = threading.Thread(target=waiter, daemon=True)
+    thread.start()
+    for _ in range(rounds):
+        ready.wait()
+        ready.clear()
+        time.sleep(0.0005) # Let the waiter actually block (or start a sleep)
+        signalled_at[0] = time.perf_counter()
+        signal()
+        done.wait()
+        done.clear()
+    thread.join()
+    return latencies
+
+
+def bench_event_wake(rounds, poll_intervals=(0.001, 0.01)):
+    results = {}
+    event = threading.Event()
+    results["event_wait"] = percentiles(_wake_latencies(event.wait, event.set, event.clear, rounds))
+
+    for poll in poll_intervals:
+        flag = [False]
+
+        def poll_wait(poll=poll):
+            while not flag[0]:
+                time.sleep(poll)
+
+        signal = lambda: flag.__setitem__(0, True)
+        reset = lambda: flag.__setitem__(0, False)
+        # Polling is slow by design; fewer rounds keep the run short
+        poll_rounds = max(10, min(rounds, int(2.0 / poll)))
+        results[f"sleep_poll_{poll * 1000:g}ms"] = percentiles(_wake_latencies(poll_wait, signal, reset, poll_rounds))
+    return results
+
+
+# --- Queue throughput ---
+def _queue_throughput(queue_class, items, producers):
+    q = queue_class()
+    per_producer = items // producers
+    total = per_producer * producers
+    stop = object()
+
+    def produce():
+        put = q.put
+        for i in range(per_producer):
+            put(i)
+
+    def consume():
+        get = q.get
+        received = 0
+        while True:
+            item = get()
+            if item is stop:
+                break
+            received += 1
+        assert received == total, (received, total)
+
+    consumer = threading.Thread(target=consume)
+    threads = [threading.Thread(target=produce) for _ in range(producers)]
+    start = time.perf_counter()
+    consumer.start()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    q.put(stop)
+    consumer.join()
+    seconds = time.perf_counter() - start
+    return {"items": total, "seconds": round(seconds, 4), "items_per_s": round(total / seconds)}
+
+
+def bench_queue(items, max_threads):
+    results = {}
+    for queue_class in (queue.Queue, queue.SimpleQueue):
+        for producers in sorted({1, max_threads}):
+            results[f"{queue_class.__name__}_{producers}p1c"] = _queue_throughput(queue_class, items, producers)
+    return results
+
+
+# --- Lock contention ---
+def _lock_contention(threads, increments):
+    lock = threading.Lock()
+    counter = [0]
+    barrier = threading.Barrier(threads + 1)
+
+    def work():
+        barrier.wait()
+        for _ in range(increments):
+            with lock:
+                counter[0] += 1
+
+    workers = [threading.Thread(target=work) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    seconds = time.perf_counter() - start
+    total = threads * increments
+    assert counter[0] == total, (counter[0], total)
+    return {"threads": threads, "increments": total, "seconds": round(seconds, 4),
+            "increments_per_s": round(total / seconds), "ns_per_increment": round(seconds / total * 1e9, 1)}
+
+
+def bench_lock(increments, max_threads):
+    counts = []
+    n = 1
+    while n < max_threads:
+        counts.append(n)
+        n *= 2
+    counts.append(max_threads)
+    return {f"{n}_threads": _lock_contention(n, increments) for n in counts}
+
+
+# --- Tk after(0) dispatch ---
+def bench_after(calls):
+    """
+    A worker thread posts `calls` after(0, ...) callbacks (one at a time, waiting for each
+    to run, as the clicker's status updates do) and then a burst of `calls` at once.
+    Uses plain tkinter; CustomTkinter's CTk is a Tk subclass with the same after().
+    """
+    try:
+        import tkinter
+        root = tkinter.Tk()
+    except Exception as e: # ImportError, or TclError without a display
+        return {"skipped": f"{type(e).__name__}: {e}"}
+    root.withdraw()
+    latencies = []
+    post_costs = []
+    burst = {}
+    ran = threading.Event()
+
+    def worker():
+        for _ in range(calls):
+            posted = time.perf_counter()
+            root.after(0, lambda posted=posted: (latencies.append(time.perf_counter() - posted), ran.set()))
+            post_costs.append(time.perf_counter() - posted)
+            ran.wait()
+            ran.clear()
+        # Burst: how fast can a thread queue updates, and how long until the last one runs
+        remaining = [calls]
+        start = time.perf_counter()
+
+        def callback():
+            remaining[0] -= 1
+            if remaining[0] == 0:
+                burst["drain_s"] = time.perf_counter() - start
+                root.quit()
+        for _ in range(calls):
+            root.after(0, callback)
+        burst["post_s"] = time.perf_counter() - start
+
+    thread = threading.Thread(target=worker, daemon=True)
+    root.after(0, thread.start)
+    root.mainloop()
+    thread.join()
+    root.destroy()
+    return {
+        "post_from_thread": percentiles(post_costs),
+        "thread_to_main_latency": percentiles(latencies),
+        "burst": {"calls": calls, "post_us_per_call": round(burst["post_s"] / calls * 1e6, 2),
+                  "drain_ms": round(burst["drain_s"] * 1000, 2)},
+    }
+
+
+BENCHMARKS = {
+    "event_wake": lambda args: bench_event_wake(args.rounds),
+    "queue": lambda args: bench_queue(args.items, args.threads),
+    "lock": lambda args: bench_lock(args.increments, args.threads),
+    "after": lambda args: bench_after(args.rounds),
+}
+
+
+def print_results(name, results, file=None):
+    print(f"\n[{name}]", file=file)
+    for case, values in results.items():
+        if isinstance(values, dict):
+            print(f"  {case:<28} " + "  ".join(f"{k}={v}" for k, v in values.items()), file=file)
+        else:
+            print(f"  {case:<28} {values}", file=file)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the threading patterns from notes.py section 24.")
+    parser.add_argument("--only", help=f"Comma-separated subset of: {', '.join(BENCHMARKS)}")
+    parser.add_argument("--json", metavar="PATH", help="Write results as JSON ('-' for stdout)")
+    parser.add_argument("--threads", type=int, default=max(2, min(8, os.cpu_count() or 2)),
+                        help="Most threads used by the queue and lock benchmarks")
+    parser.add_argument("--rounds", type=int, default=500, help="Wake-ups / after() calls to time")
+    parser.add_argument("--items", type=int, default=200000, help="Items pushed through each queue")
+    parser.add_argument("--increments", type=int, default=200000, help="Lock increments per thread")
+    parser.add_argument("--quick", action="store_true", help="Small counts (smoke test)")
+    args = parser.parse_args()
+    if args.quick:
+        args.rounds, args.items, args.increments = 50, 20000, 20000
+
+    names = args.only.split(",") if args.only else list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+
+    # With --json - stdout carries only the JSON; the tables go to stderr
+    out = sys.stderr if args.json == "-" else sys.stdout
+    report = {"environment": environment(), "results": {}}
+    env = report["environment"]
+    print(f"Python {env['python']} ({env['implementation']}), free-threaded build: {env['free_threaded_build']}, "
+          f"GIL enabled: {env['gil_enabled']}, CPUs: {env['cpu_count']}", file=out)
+    for name in names:
+        report["results"][name] = BENCHMARKS[name](args)
+        print_results(name, report["results"][name], file=out)
+
+    if args.json == "-":
+        print(json.dumps(report, indent=2))
+    elif args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {args.json}")
+
+
+if __name__ == "__main__":
+    main()
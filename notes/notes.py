@@ -3,6 +3,24 @@
 # ======================================================
 # This file contains comprehensive notes on Python fundamentals
 # covering syntax, data types, control structures, and more
+#
+# Importing this file only defines things: the runnable examples live in
+# per-section demo functions, so nothing prints, no files are written and no
+# heavy packages (NumPy for section 26) are loaded until asked for.
+#   python notes.py            # run every section's demo
+#   python notes.py 6 17       # run only sections 6 and 17
+#   python notes.py --import-time   # measure how long `import notes` takes
+
+# --- Section Demos ---
+# section number -> (title, demo function), filled in by @demo below
+SECTIONS = {}
+
+def demo(number, title):
+    """Registers the decorated function as the runnable example for a section."""
+    def register(func):
+        SECTIONS[number] = (title, func)
+        return func
+    return register
 
 # =========================
 #  1. NAMING CONVENTIONS
@@ -54,148 +72,160 @@ has_permission = False      # Boolean prefixed with "has"
 #  3. VARIABLES & DATA TYPES
 # =========================
 
-# Variable Declaration - Python is dynamically typed
-# No need to declare variable types explicitly
-name = "John"              # String
-age = 30                   # Integer
-height = 1.75             # Float
-is_student = True         # Boolean
-
-# Data Types - Python has several built-in data types
-
-# Numeric Types
-integer = 42              # int - whole numbers
-float_num = 3.14          # float - decimal numbers
-complex_num = 1 + 2j      # complex - numbers with real and imaginary parts
-
-# Sequence Types
-string = "Hello"          # str - sequence of characters
-list_example = [1, 2, 3]  # list - mutable sequence
-tuple_example = (1, 2, 3) # tuple - immutable sequence
-range_example = range(5)  # range - sequence of numbers
-
-# Mapping Type
-dict_example = {          # dict - key-value pairs
-    "name": "John",
-    "age": 30
-}
-
-# Set Types
-set_example = {1, 2, 3}   # set - unordered collection of unique elements
-frozen_set = frozenset([1, 2, 3])  # frozenset - immutable set
-
-# Boolean Type
-true_value = True         # bool - True or False
-false_value = False
-
-# None Type
-none_value = None         # None - represents absence of a value
-
-# Type checking and conversion
-type(integer)             # Check type of variable
-str(integer)              # Convert to string
-int("42")                 # Convert to integer
-float("3.14")             # Convert to float
-bool(1)                   # Convert to boolean
+@demo(3, "Variables & Data Types")
+def data_types_demo():
+    # Variable Declaration - Python is dynamically typed
+    # No need to declare variable types explicitly
+    name = "John"              # String
+    age = 30                   # Integer
+    height = 1.75             # Float
+    is_student = True         # Boolean
+
+    # Data Types - Python has several built-in data types
+
+    # Numeric Types
+    integer = 42              # int - whole numbers
+    float_num = 3.14          # float - decimal numbers
+    complex_num = 1 + 2j      # complex - numbers with real and imaginary parts
+
+    # Sequence Types
+    string = "Hello"          # str - sequence of characters
+    list_example = [1, 2, 3]  # list - mutable sequence
+    tuple_example = (1, 2, 3) # tuple - immutable sequence
+    range_example = range(5)  # range - sequence of numbers
+
+    # Mapping Type
+    dict_example = {          # dict - key-value pairs
+        "name": "John",
+        "age": 30
+    }
+
+    # Set Types
+    set_example = {1, 2, 3}   # set - unordered collection of unique elements
+    frozen_set = frozenset([1, 2, 3])  # frozenset - immutable set
+
+    # Boolean Type
+    true_value = True         # bool - True or False
+    false_value = False
+
+    # None Type
+    none_value = None         # None - represents absence of a value
+
+    # Type checking and conversion
+    type(integer)             # Check type of variable
+    str(integer)              # Convert to string
+    int("42")                 # Convert to integer
+    float("3.14")             # Convert to float
+    bool(1)                   # Convert to boolean
+    print(type(integer), str(integer), int("42"), float("3.14"), bool(1))
 
 # =========================
 #  4. OPERATORS
 # =========================
 
-# Arithmetic operators
-sum = 10 + 5              # Addition
-difference = 10 - 5       # Subtraction
-product = 10 * 5          # Multiplication
-quotient = 10 / 5         # Division (returns float)
-floor_quotient = 10 // 5  # Floor division (returns int)
-remainder = 10 % 3        # Modulus
-power = 10 ** 2           # Exponentiation
-
-# Assignment operators
-x = 10                    # Assignment
-x += 5                    # Addition assignment
-x -= 5                    # Subtraction assignment
-x *= 2                    # Multiplication assignment
-x /= 2                    # Division assignment
-x %= 3                    # Modulus assignment
-x **= 2                   # Exponentiation assignment
-
-# Comparison operators
-is_equal = 10 == 10       # Equal to
-is_not_equal = 10 != 5    # Not equal to
-is_greater = 10 > 5       # Greater than
-is_less = 5 < 10          # Less than
-is_greater_equal = 10 >= 10  # Greater than or equal to
-is_less_equal = 5 <= 10   # Less than or equal to
-
-# Logical operators
-and_result = True and False  # Logical AND
-or_result = True or False    # Logical OR
-not_result = not True        # Logical NOT
-
-# Identity operators
-is_same = x is y           # is - checks if both variables point to same object
-is_not_same = x is not y   # is not - checks if variables point to different objects
-
-# Membership operators
-in_list = 1 in [1, 2, 3]   # in - checks if value exists in sequence
-not_in_list = 4 not in [1, 2, 3]  # not in - checks if value doesn't exist in sequence
+@demo(4, "Operators")
+def operators_demo():
+    # Arithmetic operators
+    total = 10 + 5            # Addition (not `sum`, which would hide the builtin)
+    difference = 10 - 5       # Subtraction
+    product = 10 * 5          # Multiplication
+    quotient = 10 / 5         # Division (returns float)
+    floor_quotient = 10 // 5  # Floor division (returns int)
+    remainder = 10 % 3        # Modulus
+    power = 10 ** 2           # Exponentiation
+
+    # Assignment operators
+    x = 10                    # Assignment
+    x += 5                    # Addition assignment
+    x -= 5                    # Subtraction assignment
+    x *= 2                    # Multiplication assignment
+    x /= 2                    # Division assignment
+    x %= 3                    # Modulus assignment
+    x **= 2                   # Exponentiation assignment
+
+    # Comparison operators
+    is_equal = 10 == 10       # Equal to
+    is_not_equal = 10 != 5    # Not equal to
+    is_greater = 10 > 5       # Greater than
+    is_less = 5 < 10          # Less than
+    is_greater_equal = 10 >= 10  # Greater than or equal to
+    is_less_equal = 5 <= 10   # Less than or equal to
+
+    # Logical operators
+    and_result = True and False  # Logical AND
+    or_result = True or False    # Logical OR
+    not_result = not True        # Logical NOT
+
+    # Identity operators
+    y = x
+    is_same = x is y           # is - checks if both variables point to same object
+    is_not_same = x is not y   # is not - checks if variables point to different objects
+
+    # Membership operators
+    in_list = 1 in [1, 2, 3]   # in - checks if value exists in sequence
+    not_in_list = 4 not in [1, 2, 3]  # not in - checks if value doesn't exist in sequence
+    print(f"x = {x}, x is y: {is_same}, 1 in list: {in_list}")
 
 # =========================
 #  5. CONTROL FLOW
 # =========================
 
-# If statement
-age = 18
-if age >= 18:
-    print("You are an adult")
-elif age >= 13:
-    print("You are a teenager")
-else:
-    print("You are a child")
-
-# Ternary operator
-status = "Adult" if age >= 18 else "Minor"
-
-# Match statement (Python 3.10+)
-match day:
-    case "Monday":
-        print("Start of work week")
-    case "Friday":
-        print("End of work week")
-    case "Saturday" | "Sunday":
-        print("Weekend!")
-    case _:
-        print("Midweek")
+@demo(5, "Control Flow")
+def control_flow_demo():
+    # If statement
+    age = 18
+    if age >= 18:
+        print("You are an adult")
+    elif age >= 13:
+        print("You are a teenager")
+    else:
+        print("You are a child")
+
+    # Ternary operator
+    status = "Adult" if age >= 18 else "Minor"
+
+    # Match statement (Python 3.10+)
+    day = "Friday"
+    match day:
+        case "Monday":
+            print("Start of work week")
+        case "Friday":
+            print("End of work week")
+        case "Saturday" | "Sunday":
+            print("Weekend!")
+        case _:
+            print("Midweek")
 
 # =========================
 #  6. LOOPS
 # =========================
 
-# For loop
-for i in range(5):
-    print(f"Iteration {i}")
-
-# While loop
-count = 0
-while count < 5:
-    print(f"Count: {count}")
-    count += 1
-
-# Break and continue
-for i in range(10):
-    if i == 3:
-        continue  # Skip the rest of the current iteration
-    if i == 8:
-        break     # Exit the loop
-    print(i)
-
-# For-else loop
-for i in range(5):
-    if i == 3:
-        break
-else:
-    print("Loop completed without break")
+@demo(6, "Loops")
+def loops_demo():
+    # For loop
+    for i in range(5):
+        print(f"Iteration {i}")
+
+    # While loop
+    count = 0
+    while count < 5:
+        print(f"Count: {count}")
+        count += 1
+
+    # Break and continue
+    for i in range(10):
+        if i == 3:
+            continue  # Skip the rest of the current iteration
+        if i == 8:
+            break     # Exit the loop
+        print(i)
+
+    # For-else loop
+    for i in range(5):
+        if i == 3:
+            break
+    else:
+        print("Loop completed without break")
 
 # =========================
 #  7. FUNCTIONS
@@ -225,59 +255,72 @@ square = lambda x: x * x
 def greet_typed(name: str) -> str:
     return f"Hello, {name}!"
 
+@demo(7, "Functions")
+def functions_demo():
+    print(greet("John"), greet_with_default(), sum_numbers(1, 2, 3),
+          person_info(name="John", age=30), square(4))
+
 # =========================
 #  8. LISTS
 # =========================
 
-# Creating lists
-fruits = ["Apple", "Banana", "Orange"]
-mixed = [1, "two", True, None, {"name": "object"}, [1, 2]]
-
-# List methods
-fruits.append("Mango")        # Add element to end
-fruits.pop()                  # Remove and return last element
-fruits.insert(1, "Pear")      # Insert element at index
-fruits.remove("Banana")       # Remove first occurrence of element
-fruits.sort()                 # Sort list in place
-fruits.reverse()              # Reverse list in place
-
-# List comprehension
-squares = [x**2 for x in range(10)]
-even_squares = [x**2 for x in range(10) if x % 2 == 0]
+@demo(8, "Lists")
+def lists_demo():
+    # Creating lists
+    fruits = ["Apple", "Banana", "Orange"]
+    mixed = [1, "two", True, None, {"name": "object"}, [1, 2]]
+
+    # List methods
+    fruits.append("Mango")        # Add element to end
+    fruits.pop()                  # Remove and return last element
+    fruits.insert(1, "Pear")      # Insert element at index
+    fruits.remove("Banana")       # Remove first occurrence of element
+    fruits.sort()                 # Sort list in place
+    fruits.reverse()              # Reverse list in place
+
+    # List comprehension
+    squares = [x**2 for x in range(10)]
+    even_squares = [x**2 for x in range(10) if x % 2 == 0]
+    print(fruits, even_squares)
 
 # =========================
 #  9. DICTIONARIES
 # =========================
 
-# Creating dictionaries
-person = {
-    "name": "John",
-    "age": 30,
-    "city": "New York"
-}
+@demo(9, "Dictionaries")
+def dictionaries_demo():
+    # Creating dictionaries
+    person = {
+        "name": "John",
+        "age": 30,
+        "city": "New York"
+    }
 
-# Dictionary methods
-person["email"] = "john@example.com"  # Add new key-value pair
-del person["age"]                     # Remove key-value pair
-person.get("name")                    # Get value safely
-person.keys()                         # Get all keys
-person.values()                       # Get all values
-person.items()                        # Get all key-value pairs
+    # Dictionary methods
+    person["email"] = "john@example.com"  # Add new key-value pair
+    del person["age"]                     # Remove key-value pair
+    person.get("name")                    # Get value safely
+    person.keys()                         # Get all keys
+    person.values()                       # Get all values
+    person.items()                        # Get all key-value pairs
 
-# Dictionary comprehension
-squares_dict = {x: x**2 for x in range(5)}
+    # Dictionary comprehension
+    squares_dict = {x: x**2 for x in range(5)}
+    print(person, squares_dict)
 
 # =========================
 #  10. ERROR HANDLING
 # =========================
 
-# Try-except block
-try:
-    result = 10 / 0
-except ZeroDivisionError as e:
-    print(f"Error: {e}")
-finally:
-    print("This always executes")
+@demo(10, "Error Handling")
+def error_handling_demo():
+    # Try-except block
+    try:
+        result = 10 / 0
+    except ZeroDivisionError as e:
+        print(f"Error: {e}")
+    finally:
+        print("This always executes")
 
 # Custom exceptions
 class ValidationError(Exception):
@@ -293,17 +336,27 @@ def divide(a, b):
 #  11. FILE HANDLING
 # =========================
 
-# Reading files
-with open("file.txt", "r") as file:
-    content = file.read()
+@demo(11, "File Handling")
+def file_handling_demo():
+    import os
+    import tempfile
+    # Works on a scratch copy of file.txt so running the demo leaves nothing behind
+    folder = tempfile.TemporaryDirectory()
+    path = os.path.join(folder.name, "file.txt")
+
+    # Writing files
+    with open(path, "w") as file:
+        file.write("Hello, World!")
 
-# Writing files
-with open("file.txt", "w") as file:
-    file.write("Hello, World!")
+    # Appending to files
+    with open(path, "a") as file:
+        file.write("\nNew line")
 
-# Appending to files
-with open("file.txt", "a") as file:
-    file.write("\nNew line")
+    # Reading files
+    with open(path, "r") as file:
+        content = file.read()
+    print(content)
+    folder.cleanup()
 
 # =========================
 #  12. CLASSES
@@ -324,14 +377,24 @@ class Employee(Person):
         super().__init__(name, age)
         self.employee_id = employee_id
 
+@demo(12, "Classes")
+def classes_demo():
+    employee = Employee("John", 30, "E42")
+    print(employee.greet(), employee.employee_id)
+
 # =========================
 #  13. MODULES & PACKAGES
 # =========================
 
 # Importing modules
-import math
-from datetime import datetime
-import random as rnd
+# (inside a function, like the other imports in this file, so that `import notes`
+# doesn't pay for them; a normal script imports at the top)
+@demo(13, "Modules & Packages")
+def modules_demo():
+    import math
+    from datetime import datetime
+    import random as rnd
+    print(math.pi, datetime.now().year, rnd.randint(1, 6))
 
 # Creating modules
 # Save as mymodule.py
@@ -361,14 +424,14 @@ def my_decorator(func):
 def say_hello():
     print("Hello!")
 
+@demo(14, "Decorators")
+def decorators_demo():
+    say_hello()
+
 # =========================
 #  15. CONTEXT MANAGERS
 # =========================
 
-# Using context managers
-with open("file.txt", "r") as file:
-    content = file.read()
-
 # Custom context manager
 class MyContextManager:
     def __enter__(self):
@@ -378,6 +441,16 @@ class MyContextManager:
     def __exit__(self, exc_type, exc_val, exc_tb):
         print("Exiting context")
 
+@demo(15, "Context Managers")
+def context_managers_demo():
+    # Using context managers (the file is closed when the block ends)
+    with open(__file__, "r") as file:
+        content = file.read()
+    print(f"Read {len(content)} characters")
+
+    with MyContextManager():
+        print("Inside the context")
+
 # =========================
 #  16. ITERATORS & GENERATORS
 # =========================
@@ -402,50 +475,63 @@ def countdown(n):
         yield n
         n -= 1
 
+@demo(16, "Iterators & Generators")
+def iterators_demo():
+    print(list(CountDown(3)), list(countdown(3)))
+
 # =========================
 #  17. REGULAR EXPRESSIONS
 # =========================
 
-import re
+@demo(17, "Regular Expressions")
+def regex_demo():
+    import re
 
-# Basic regex patterns
-pattern = r"\d+"  # Match one or more digits
-text = "123abc456"
-matches = re.findall(pattern, text)
+    # Basic regex patterns
+    pattern = r"\d+"  # Match one or more digits
+    text = "123abc456"
+    matches = re.findall(pattern, text)
 
-# Common regex methods
-re.search(pattern, text)    # Search for pattern
-re.match(pattern, text)     # Match pattern at start
-re.findall(pattern, text)   # Find all matches
-re.sub(pattern, "X", text)  # Replace matches
+    # Common regex methods
+    re.search(pattern, text)    # Search for pattern
+    re.match(pattern, text)     # Match pattern at start
+    re.findall(pattern, text)   # Find all matches
+    re.sub(pattern, "X", text)  # Replace matches
+    print(matches, re.sub(pattern, "X", text))
 
 # =========================
 #  18. DATETIME HANDLING
 # =========================
 
-from datetime import datetime, timedelta
+@demo(18, "Datetime Handling")
+def datetime_demo():
+    from datetime import datetime, timedelta
 
-# Current time
-now = datetime.now()
+    # Current time
+    now = datetime.now()
 
-# Time arithmetic
-future = now + timedelta(days=7)
+    # Time arithmetic
+    future = now + timedelta(days=7)
 
-# Formatting
-formatted = now.strftime("%Y-%m-%d %H:%M:%S")
+    # Formatting
+    formatted = now.strftime("%Y-%m-%d %H:%M:%S")
+    print(formatted, "->", future.strftime("%Y-%m-%d"))
 
 # =========================
 #  19. JSON HANDLING
 # =========================
 
-import json
+@demo(19, "JSON Handling")
+def json_demo():
+    import json
 
-# Converting to JSON
-data = {"name": "John", "age": 30}
-json_string = json.dumps(data)
+    # Converting to JSON
+    data = {"name": "John", "age": 30}
+    json_string = json.dumps(data)
 
-# Parsing JSON
-parsed_data = json.loads(json_string)
+    # Parsing JSON
+    parsed_data = json.loads(json_string)
+    print(json_string, parsed_data == data)
 
 # =========================
 #  20. VIRTUAL ENVIRONMENTS
@@ -795,29 +881,19 @@ with mss() as sct:
 """
 
 # --- C. Color Detection ---
-# Finding pixels matching a target color with tolerance
+# Finding pixels matching a target color with tolerance.
+# The implementation used by the fishing bot is find_target_pixel() in
+# projects/automation_core/detection.py (re-exported in section 26). Things to know:
+#   - Compute the bounds with Python ints, not uint8 arrays: np.uint8(10) - 20 wraps
+#     around to 246 before np.clip ever sees it.
+#   - A range check low <= v <= high on uint8 can be one subtraction and one compare:
+#     (v - low) <= (high - low), because values below `low` wrap to large numbers.
+#   - Check one channel over the whole frame first and the others only on its
+#     candidates, and return the first match instead of building np.where() of all.
 """
-def find_target_pixel(image_np, target_color, tolerance=20):
-    # Convert target color to numpy array
-    target_rgb = np.array(target_color, dtype=np.uint8)
-    
-    # Calculate bounds with tolerance
-    lower_bound = np.clip(target_rgb - tolerance, 0, 255)
-    upper_bound = np.clip(target_rgb + tolerance, 0, 255)
-    
-    # Check if pixels are within bounds
-    in_range = np.logical_and.reduce((
-        image_np[:, :, 0] >= lower_bound[2],  # Blue
-        image_np[:, :, 1] >= lower_bound[1],  # Green
-        image_np[:, :, 2] >= lower_bound[0],  # Red
-        image_np[:, :, 0] <= upper_bound[2],
-        image_np[:, :, 1] <= upper_bound[1],
-        image_np[:, :, 2] <= upper_bound[0]
-    ))
-    
-    # Find matching pixels
-    matches = np.where(in_range)
-    return matches[0][0] if matches[0].size > 0 else None
+from automation_core.detection import find_target_pixel
+
+y = find_target_pixel(img_np, target_color=(181, 36, 35), tolerance=20)  # Row or None
 """
 
 # =======================================================================
@@ -892,31 +968,51 @@ widget.bind("<Key>", lambda e: print(f"Key pressed: {e.char}"), add="+")
 #  24. ADVANCED THREADING & CONCURRENCY
 # =======================================================================
 # This section covers advanced threading concepts used in automation projects.
+# What these patterns cost (Event wake-up vs sleep polling, Queue throughput, Lock
+# contention, app.after(0) dispatch) is measured by notes/bench_concurrency.py.
 
 # --- A. Thread Synchronization ---
-import threading
-from threading import Lock, Event
-
-# Using Lock for thread-safe operations
-counter_lock = Lock()
-counter = 0
-
-def increment_counter():
-    global counter
-    with counter_lock:
-        counter += 1
-
-# Using Event for thread coordination
-stop_event = Event()
-
-def worker_thread():
-    while not stop_event.is_set():
-        # Do work
-        pass
-    print("Thread stopping")
-
-# Signal thread to stop
-stop_event.set()
+# (threading is imported inside the demo so that importing this file stays cheap)
+@demo(24, "Advanced Threading & Concurrency")
+def threading_demo():
+    import threading
+    from threading import Lock, Event
+
+    # Using Lock for thread-safe operations
+    counter_lock = Lock()
+    counter = 0
+
+    def increment_counter():
+        nonlocal counter
+        with counter_lock:
+            counter += 1
+
+    # Using Event for thread coordination
+    stop_event = Event()
+
+    def worker_thread():
+        while not stop_event.is_set():
+            increment_counter() # Do work
+            stop_event.wait(0.01)
+        print("Thread stopping")
+
+    worker = threading.Thread(target=worker_thread)
+    worker.start()
+    stop_event.wait(0.05)
+
+    # Signal thread to stop
+    stop_event.set()
+    worker.join()
+    print(f"Counter reached {counter}")
+
+    # Thread communication with a Queue (section C)
+    from queue import Queue
+    message_queue = Queue()
+    consumer = threading.Thread(target=consumer_thread, args=(message_queue,))
+    consumer.start()
+    producer_thread(message_queue)
+    message_queue.put("STOP")
+    consumer.join()
 
 # --- B. Thread-Safe GUI Updates ---
 def update_gui_from_thread():
@@ -933,15 +1029,11 @@ def update_gui_from_thread():
     ])
 
 # --- C. Thread Communication ---
-# Using Queue for thread-safe communication
-from queue import Queue
-
-message_queue = Queue()
-
-def producer_thread():
+# Using Queue for thread-safe communication (queue.Queue, see threading_demo)
+def producer_thread(message_queue):
     message_queue.put("New message")
 
-def consumer_thread():
+def consumer_thread(message_queue):
     while True:
         message = message_queue.get()
         if message == "STOP":
@@ -974,9 +1066,8 @@ def resource_path(relative_path):
 # config_path = resource_path("config.json")
 
 # --- B. Configuration Management ---
-import json
-
 def load_config():
+    import json
     config_path = resource_path("config.json")
     default_config = {
         "setting1": "default_value",
@@ -993,19 +1084,21 @@ def load_config():
         return default_config
 
 # --- C. Error Handling & Logging ---
-import logging
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('app.log'),
-        logging.StreamHandler()
-    ]
-)
+# Configure logging once, at program start (not at import time: it would create
+# app.log and change the root logger for whoever imported the module)
+def configure_logging(log_file='app.log'):
+    import logging
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler(log_file),
+            logging.StreamHandler()
+        ]
+    )
 
 def safe_operation():
+    import logging
     try:
         # Risky operation
         result = perform_operation()
@@ -1019,50 +1112,86 @@ def safe_operation():
 # =======================================================================
 # This section covers techniques for screen region monitoring and pixel analysis.
 
-# --- A. Screen Region Management ---
+# The working versions of these helpers live in projects/automation_core/detection.py,
+# shared with the fishing bot, and can be used from this file as notes.find_target_pixel etc.
+# They are loaded on first use (module __getattr__, PEP 562), because detection imports NumPy.
+_PROJECTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "projects")
+_DETECTION_NAMES = (
+    "MovementEvent", "calculate_monitor_region", "detect_movement", "find_target_pixel", "monitor_region",
+)
 
-def calculate_monitor_region(screen_width, screen_height, percentage=0.15):
-    """Calculate a centered region based on screen dimensions"""
-    region_width = int(screen_width * percentage)
-    region_height = int(screen_height * percentage)
-    left = int(screen_width / 2 - region_width / 2)
-    top = int(screen_height / 2 - region_height / 2)
-    
-    return {
-        'top': top,
-        'left': left,
-        'width': region_width,
-        'height': region_height
-    }
+def _load_detection():
+    if _PROJECTS_DIR not in sys.path:
+        sys.path.append(_PROJECTS_DIR)
+    from automation_core import detection
+    for helper in _DETECTION_NAMES:
+        globals()[helper] = getattr(detection, helper) # Later lookups skip __getattr__
+    return detection
 
-def detect_movement(current_y, last_y, threshold=3):
-    """Detect significant vertical movement"""
-    if last_y is None:
-        return False, None
-    
-    delta_y = current_y - last_y
-    if abs(delta_y) > threshold:
-        return True, delta_y
-    return False, delta_y
+def __getattr__(name):
+    if name not in _DETECTION_NAMES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(_load_detection(), name)
+
+# --- A. Screen Region Management ---
+# calculate_monitor_region(screen_width, screen_height, percentage=0.15) returns a
+# centered mss region dict: {'top', 'left', 'width', 'height'}
+
+# --- B. Movement Detection ---
+# detect_movement(current_y, last_y, threshold=3) returns (moved, delta_y);
+# moved is True when the target moved more than `threshold` rows since the last frame
 
 # --- C. Continuous Monitoring ---
+# monitor_region() is a generator: it captures the region at a fixed rate and yields a
+# MovementEvent(time, y, last_y, delta_y) for every significant movement, so the caller
+# decides what to do instead of passing in a callback.
+"""
+region = calculate_monitor_region(1920, 1080)
+for event in monitor_region(region, target_color=(181, 36, 35), interval=1/30):
+    print(f"Moved {event.delta_y:+d}px to y={event.y}")
+    if event.delta_y > 3:
+        break  # Leaving the loop closes the generator and its mss handle
+"""
 
-def monitor_region(region, target_color, tolerance=20):
-    with mss.mss() as sct:
-        while True:
-            # Capture and analyze region
-            img = sct.grab(region)
-            img_np = np.array(img)
-            
-            # Find target pixel
-            current_y = find_target_pixel(img_np, target_color, tolerance)
-            
-            if current_y is not None:
-                # Process movement
-                movement_detected, delta_y = detect_movement(current_y, last_y)
-                if movement_detected:
-                    handle_movement(delta_y)
-            
-            # Small delay to prevent high CPU usage
-            time.sleep(1/30)  # 30 FPS
+@demo(26, "Screen Region & Pixel Analysis")
+def pixel_analysis_demo():
+    import numpy as np
+    detection = _load_detection()
+    region = detection.calculate_monitor_region(1920, 1080)
+    frame = np.zeros((region['height'], region['width'], 4), dtype=np.uint8)
+    frame[40, 10] = (35, 36, 181, 255) # BGRA bobber pixel
+    y = detection.find_target_pixel(frame, (181, 36, 35))
+    print(region, "target row:", y, "moved:", detection.detect_movement(y + 5, y))
 
+# =======================================================================
+#  RUNNING THE DEMOS
+# =======================================================================
+def run_sections(numbers=None):
+    """Runs the demos for the given section numbers (all of them by default), in order."""
+    for number in sorted(numbers or SECTIONS):
+        if number not in SECTIONS:
+            print(f"Section {number} has no demo (available: {', '.join(map(str, sorted(SECTIONS)))})")
+            continue
+        title, func = SECTIONS[number]
+        print(f"\n=== {number}. {title} ===")
+        func()
+
+def measure_import_time(runs=10):
+    """Best-of-`runs` time (ms) for `import notes` in a fresh interpreter, from -X importtime."""
+    import subprocess
+    folder = os.path.dirname(os.path.abspath(__file__))
+    times = []
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import notes"],
+                                cwd=folder, capture_output=True, text=True, check=True)
+        # Last line: "import time: <self us> | <cumulative us> | notes"
+        cumulative = result.stderr.strip().splitlines()[-1].split("|")[1]
+        times.append(int(cumulative) / 1000)
+    return min(times)
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["--import-time"]:
+        # Without a cached .pyc (PYTHONDONTWRITEBYTECODE) this includes compiling the file
+        print(f"import notes: {measure_import_time():.2f}ms")
+    else:
+        run_sections([int(arg) for arg in sys.argv[1:]])
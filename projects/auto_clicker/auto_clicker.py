@@ -1,10 +1,19 @@
 import customtkinter as ctk
-import threading
 import time
-from pynput import mouse, keyboard
-import json
 import os
 import sys # For resource_path function
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) # projects/, for automation_core
+from food_catalog import FoodCatalog
+from hunger_planner import HungerPlanner
+from settings_store import SettingsStore
+from automation_core.watchdog import CpuSavings
+
+# --- Deferred Imports ---
+# pynput picks and loads its platform backend (Xlib / win32 / Quartz) when imported, which
+# is a large part of cold start. It is only needed once the window is up, so these are
+# imported by finish_startup() after the first paint (click_scheduler and hotkeys import pynput).
+mouse = None # pynput.mouse
+hotkeys = None # hotkeys module (HotkeyMatcher, hotkey_display_name)
 
 # --- Helper function to find resources (like foods.json) ----
 def resource_path(relative_path):
@@ -20,16 +29,40 @@ def resource_path(relative_path):
         base_path = os.path.abspath(".") 
     return os.path.join(base_path, relative_path)
 
+# --- Helper function for per-user files (like settings.json) ----
+def user_data_path(relative_path):
+    """ Get absolute path to a writable per-user file (resource_path can point into PyInstaller's temp folder) """
+    if sys.platform == "win32":
+        base_path = os.environ.get("APPDATA") or os.path.expanduser("~")
+    elif sys.platform == "darwin":
+        base_path = os.path.expanduser("~/Library/Application Support")
+    else:
+        base_path = os.environ.get("XDG_CONFIG_HOME") or os.path.expanduser("~/.config")
+    return os.path.join(base_path, "StylishAutoClicker", relative_path)
+
+# --- Load Settings (one small read, before the window is built) ---
+settings = SettingsStore(user_data_path("settings.json"))
+settings.load()
+
 # --- Global Variables (Non-GUI specific or initialized after app) ---
 is_running = False
-click_thread = None
-listener_thread = None
-hotkey = keyboard.Key.f6 # Default hotkey
-mouse_controller = mouse.Controller()
+# Hotkey bindings (pynput HotKey format); chords like "<ctrl>+<f12>" are supported
+# Defaults: F6 toggles clicking (changed with "Set Hotkey"), F7 toggles auto-eat, Ctrl+F12 is panic stop
+hotkey_bindings = dict(settings.get("hotkeys"))
+hotkey_matcher = None # HotkeyMatcher: runs the global keyboard listener
+ui_dispatch_latencies = [] # Hotkey event -> Tk main loop callback, in seconds
+mouse_controller = None # pynput mouse.Controller, created by finish_startup()
 is_setting_hotkey = False
-foods_data = {}
+food_catalog = None # FoodCatalog backing foods.json; read food_catalog.snapshot, never a shared dict
 is_auto_eating = False # Flag for auto-eating state
-auto_eat_thread = None   # Thread for auto-eating loop
+interval_is_valid = True # Whether the interval entries currently hold a valid interval
+scheduler = None # ClickScheduler: the single thread that drives clicks and auto-eat
+hunger_planner = HungerPlanner() # Used by auto-eat when "Eat Only When Hungry" is on
+control_server = None # automation_core.control.ControlServer for scripts (started after the first paint)
+window_hidden = False # True while the window is minimized/unmapped (low-power mode)
+pending_status = None # Latest status text received while hidden; shown on restore
+watchdog_paused = False # Clicking stopped by the fisher's stall watchdog ("pause"), restarted by "resume"
+stall_savings = CpuSavings() # Process CPU while clicking vs while paused by the watchdog
 # selected_food_duration will be initialized after app is created
 # mouse_button_var will be initialized after app is created
 
@@ -41,16 +74,16 @@ focusable_entry_widgets = []
 
 
 # --- GUI Setup ---
-ctk.set_appearance_mode("System") # Modes: "System" (default), "Dark", "Light"
-ctk.set_default_color_theme("blue") # Themes: "blue" (default), "green", "dark-blue"
+# Appearance mode "System" and the "blue" theme are customtkinter's defaults and are loaded
+# when it is imported; calling set_default_color_theme("blue") again only re-reads the theme JSON.
 
 app = ctk.CTk() # Initialize the main application window FIRST
 app.title("Stylish Auto Clicker")
-app.geometry("500x500")
+app.geometry("500x720")
 
 # --- Initialize Tkinter Variables (Now that 'app' exists) ---
 selected_food_duration = ctk.StringVar(value="0.0s") # To display eating duration with unit
-mouse_button_var = ctk.StringVar(value="Left") # Default value for mouse button selection
+mouse_button_var = ctk.StringVar(value=settings.get("mouse_button")) # Default "Left"
 
 # Configure grid layout
 app.grid_columnconfigure(0, weight=1)
@@ -78,9 +111,26 @@ status_label = ctk.CTkLabel(
 )
 status_label.grid(row=0, column=0, padx=0, pady=0, sticky="ew") # Label sticks to frame edges
 
+# --- Preset Frame ---
+preset_frame = ctk.CTkFrame(master=app)
+preset_frame.grid(row=1, column=0, padx=20, pady=(0, 10), sticky="new") # Row 1
+preset_frame.grid_columnconfigure(1, weight=1)
+
+preset_label = ctk.CTkLabel(master=preset_frame, text="Preset:", font=ctk.CTkFont(weight="bold"))
+preset_label.grid(row=0, column=0, padx=10, pady=5, sticky="w")
+preset_combobox = ctk.CTkComboBox(master=preset_frame, values=list(settings.get("presets")),
+                                  command=lambda name: apply_preset(name, time.perf_counter()))
+preset_combobox.grid(row=0, column=1, padx=(0, 10), pady=5, sticky="ew")
+preset_combobox.set(settings.get("active_preset") or "")
+interactive_widgets.append(preset_combobox)
+save_preset_button = ctk.CTkButton(master=preset_frame, text="Save Preset", width=100,
+                                   command=lambda: save_preset())
+save_preset_button.grid(row=0, column=2, padx=(0, 10), pady=5, sticky="e")
+interactive_widgets.append(save_preset_button)
+
 # --- Interval Frame ---
 interval_frame = ctk.CTkFrame(master=app)
-interval_frame.grid(row=1, column=0, padx=20, pady=(0, 10), sticky="new") # Row 1, pady adjusted
+interval_frame.grid(row=2, column=0, padx=20, pady=(0, 10), sticky="new") # Row 2, pady adjusted
 interval_frame.grid_columnconfigure((1, 3, 5, 7), weight=1)
 
 interval_label = ctk.CTkLabel(master=interval_frame, text="Click Interval", font=ctk.CTkFont(weight="bold"))
@@ -89,7 +139,7 @@ interval_label.grid(row=0, column=0, columnspan=8, padx=10, pady=(5, 10), sticky
 # Hours
 entry_hours = ctk.CTkEntry(master=interval_frame, width=50, justify='center')
 entry_hours.grid(row=1, column=1, padx=(0, 5), pady=5, sticky="ew")
-entry_hours.insert(0, "0")
+entry_hours.insert(0, settings.get("interval")["hours"])
 interactive_widgets.append(entry_hours)
 focusable_entry_widgets.append(entry_hours)
 hours_label = ctk.CTkLabel(master=interval_frame, text="hours")
@@ -98,7 +148,7 @@ hours_label.grid(row=1, column=2, padx=(0, 10), pady=5, sticky="w")
 # Minutes
 entry_mins = ctk.CTkEntry(master=interval_frame, width=50, justify='center')
 entry_mins.grid(row=1, column=3, padx=(0, 5), pady=5, sticky="ew")
-entry_mins.insert(0, "0")
+entry_mins.insert(0, settings.get("interval")["mins"])
 interactive_widgets.append(entry_mins)
 focusable_entry_widgets.append(entry_mins)
 mins_label = ctk.CTkLabel(master=interval_frame, text="mins")
@@ -107,7 +157,7 @@ mins_label.grid(row=1, column=4, padx=(0, 10), pady=5, sticky="w")
 # Seconds
 entry_secs = ctk.CTkEntry(master=interval_frame, width=50, justify='center')
 entry_secs.grid(row=1, column=5, padx=(0, 5), pady=5, sticky="ew")
-entry_secs.insert(0, "0")
+entry_secs.insert(0, settings.get("interval")["secs"])
 interactive_widgets.append(entry_secs)
 focusable_entry_widgets.append(entry_secs)
 secs_label = ctk.CTkLabel(master=interval_frame, text="secs")
@@ -116,7 +166,7 @@ secs_label.grid(row=1, column=6, padx=(0, 10), pady=5, sticky="w")
 # Milliseconds
 entry_ms = ctk.CTkEntry(master=interval_frame, width=50, justify='center')
 entry_ms.grid(row=1, column=7, padx=(0, 5), pady=5, sticky="ew")
-entry_ms.insert(0, "100")
+entry_ms.insert(0, settings.get("interval")["ms"])
 interactive_widgets.append(entry_ms)
 focusable_entry_widgets.append(entry_ms)
 ms_label = ctk.CTkLabel(master=interval_frame, text="milliseconds")
@@ -124,7 +174,7 @@ ms_label.grid(row=1, column=8, padx=(0, 10), pady=5, sticky="w")
 
 # --- Mouse Button Frame ---
 mouse_button_frame = ctk.CTkFrame(master=app)
-mouse_button_frame.grid(row=2, column=0, padx=20, pady=10, sticky="new") # Row 2
+mouse_button_frame.grid(row=3, column=0, padx=20, pady=10, sticky="new") # Row 3
 mouse_button_frame.grid_columnconfigure(0, weight=1)
 
 mouse_label = ctk.CTkLabel(master=mouse_button_frame, text="Mouse Button", font=ctk.CTkFont(weight="bold"))
@@ -142,12 +192,12 @@ interactive_widgets.append(right_click_radio)
 
 # --- Hotkey Frame ---
 hotkey_frame = ctk.CTkFrame(master=app)
-hotkey_frame.grid(row=3, column=0, padx=20, pady=10, sticky="new") # Row 3
+hotkey_frame.grid(row=4, column=0, padx=20, pady=10, sticky="new") # Row 4
 hotkey_frame.grid_columnconfigure(1, weight=1)
 
 # Label to display the current hotkey
 # Use a StringVar to make the label easily updatable
-hotkey_display_var = ctk.StringVar(value=f"Hotkey: {hotkey.name.capitalize()}") # Display default
+hotkey_display_var = ctk.StringVar(value="Hotkey: ...") # Filled in by start_hotkey_listener()
 hotkey_label = ctk.CTkLabel(master=hotkey_frame, text="Current Hotkey:", font=ctk.CTkFont(weight="bold"))
 hotkey_label.grid(row=0, column=0, padx=10, pady=(5, 10), sticky="w")
 
@@ -158,9 +208,15 @@ hotkey_value_label.grid(row=0, column=1, padx=5, pady=(5, 10), sticky="w")
 set_hotkey_button = ctk.CTkButton(master=hotkey_frame, text="Set Hotkey", command=lambda: set_hotkey())
 set_hotkey_button.grid(row=0, column=2, padx=10, pady=(5, 10), sticky="e")
 
+# Other global hotkeys
+other_hotkeys_var = ctk.StringVar(value="")
+other_hotkeys_label = ctk.CTkLabel(master=hotkey_frame, textvariable=other_hotkeys_var,
+                                   font=ctk.CTkFont(size=11), text_color="gray50")
+other_hotkeys_label.grid(row=1, column=0, columnspan=3, padx=10, pady=(0, 5), sticky="w")
+
 # --- Eating Feature Frame ---
 eating_frame = ctk.CTkFrame(master=app)
-eating_frame.grid(row=4, column=0, padx=20, pady=10, sticky="new") # Row 4
+eating_frame.grid(row=5, column=0, padx=20, pady=10, sticky="new") # Row 5
 eating_frame.grid_columnconfigure(1, weight=1)
 
 eating_label = ctk.CTkLabel(master=eating_frame, text="Eating Feature (Off-Hand)", font=ctk.CTkFont(weight="bold"))
@@ -182,7 +238,7 @@ eat_interval_label = ctk.CTkLabel(master=eating_frame, text="Eat Interval (mins)
 eat_interval_label.grid(row=3, column=0, padx=10, pady=5, sticky="w")
 entry_eat_interval = ctk.CTkEntry(master=eating_frame, width=60, justify='center')
 entry_eat_interval.grid(row=3, column=1, padx=(0,10), pady=5, sticky="ew")
-entry_eat_interval.insert(0, "10") # Default to 10 minutes
+entry_eat_interval.insert(0, settings.get("eat_interval")) # Default to 10 minutes
 interactive_widgets.append(entry_eat_interval)
 focusable_entry_widgets.append(entry_eat_interval)
 
@@ -195,6 +251,24 @@ auto_eat_switch = ctk.CTkSwitch(master=eating_frame, text="", variable=auto_eat_
 auto_eat_switch.grid(row=4, column=1, padx=(0,10), pady=5, sticky="w")
 interactive_widgets.append(auto_eat_switch)
 
+# Hunger Planner Switch (auto-eat only when the modelled food level gets low)
+smart_eat_label = ctk.CTkLabel(master=eating_frame, text="Eat Only When Hungry:")
+smart_eat_label.grid(row=5, column=0, padx=10, pady=5, sticky="w")
+smart_eat_switch_var = ctk.StringVar(value="off")
+smart_eat_switch = ctk.CTkSwitch(master=eating_frame, text="", variable=smart_eat_switch_var,
+                                 onvalue="on", offvalue="off", command=lambda: toggle_smart_eating())
+smart_eat_switch.grid(row=5, column=1, padx=(0,10), pady=5, sticky="w")
+interactive_widgets.append(smart_eat_switch)
+
+# Hit Ratio (how many left clicks actually land on a mob and cost hunger)
+hit_percent_label = ctk.CTkLabel(master=eating_frame, text="Clicks Hitting Mobs (%):")
+hit_percent_label.grid(row=6, column=0, padx=10, pady=5, sticky="w")
+entry_hit_percent = ctk.CTkEntry(master=eating_frame, width=60, justify='center')
+entry_hit_percent.grid(row=6, column=1, padx=(0,10), pady=5, sticky="ew")
+entry_hit_percent.insert(0, settings.get("hit_percent")) # Default 10%
+interactive_widgets.append(entry_hit_percent)
+focusable_entry_widgets.append(entry_hit_percent)
+
 # New styled label replacing the eat_now_button
 off_hand_info_label = ctk.CTkLabel(
     master=eating_frame,
@@ -206,7 +280,7 @@ off_hand_info_label = ctk.CTkLabel(
     padx=10,
     pady=5
 )
-off_hand_info_label.grid(row=5, column=0, columnspan=3, padx=10, pady=10, sticky="ew")
+off_hand_info_label.grid(row=7, column=0, columnspan=3, padx=10, pady=10, sticky="ew")
 
 java_edition_disclaimer_label = ctk.CTkLabel(
     master=eating_frame, 
@@ -214,7 +288,7 @@ java_edition_disclaimer_label = ctk.CTkLabel(
     font=ctk.CTkFont(size=10),
     text_color="gray50"
 )
-java_edition_disclaimer_label.grid(row=6, column=0, columnspan=3, padx=10, pady=(0, 10), sticky="ew") # Adjusted row
+java_edition_disclaimer_label.grid(row=8, column=0, columnspan=3, padx=10, pady=(0, 10), sticky="ew") # Adjusted row
 
 # --- Focus Handling Functions for Entry Widgets ---
 def on_entry_focus_in(focused_widget):
@@ -239,26 +313,6 @@ for entry_widget in focusable_entry_widgets:
     entry_widget.bind("<FocusIn>", lambda event, w=entry_widget: on_entry_focus_in(w), add="+")
     entry_widget.bind("<FocusOut>", lambda event: on_entry_focus_out(event), add="+") # Simplified lambda
 
-# --- Helper Functions ---
-def get_key_name(key):
-    """Returns a user-friendly string representation of a pynput key."""
-    try:
-        # Prefer key.char if it exists and is not None
-        char = getattr(key, 'char', None)
-        if char:
-            # Ensure key.char is a valid character to be used (e.g. not None or special unprintable chars if any)
-            # This check is a bit tricky as pynput might give 'char' for some special keys too.
-            # A more robust way might be to check its type or if it's in a known set of 'printable' chars.
-            # For now, we assume if getattr gives a non-None char, it's intended as the character representation.
-            if hasattr(key, 'char') and key.char is not None:
-                 return key.char # Prefer char for letter/number keys
-        # Otherwise use key.name for special keys
-        if isinstance(key, keyboard.Key):
-            return key.name.capitalize() # Fallback to name for special keys like F6, Shift_L etc.
-    except Exception:
-        pass # Fallback if any attribute access fails
-    return str(key)
-
 # --- Core Functions ---
 def set_hotkey():
     global is_setting_hotkey
@@ -266,10 +320,11 @@ def set_hotkey():
         return
     is_setting_hotkey = True
     # Safely update GUI from main thread or callback
-    app.after(0, lambda: status_var.set("Status: Press the desired hotkey..."))
+    show_status("Status: Press the desired hotkey...")
     app.after(0, lambda: set_hotkey_button.configure(state="disabled"))
     for widget in interactive_widgets:
         widget.configure(state="disabled")
+    hotkey_matcher.capture_next(on_hotkey_captured)
     print("Waiting for new hotkey...")
 
 def get_interval():
@@ -284,281 +339,602 @@ def get_interval():
     except ValueError:
         print("Invalid interval input. Please enter numbers.")
         # Safely update GUI from background thread
-        app.after(0, lambda: status_var.set("Status: Invalid Interval!"))
+        show_status("Status: Invalid Interval!")
         return None
 
-def toggle_clicking():
-    global is_running
+def apply_interval(event=None):
+    """Reads the interval entries (main thread) and hands the interval to the scheduler."""
+    global interval_is_valid, is_running
+    settings.update("interval", {"hours": entry_hours.get(), "mins": entry_mins.get(),
+                                 "secs": entry_secs.get(), "ms": entry_ms.get()})
+    interval = get_interval()
+    interval_is_valid = interval is not None
+    if interval is None:
+        if is_running:
+            print("Stopping due to invalid interval.")
+            is_running = False
+            scheduler.stop_clicking()
+            show_status("Status: Stopped (Invalid Interval)")
+        return
+    scheduler.set_interval(interval)
+
+def apply_mouse_button(*args):
+    """Hands the selected mouse button to the scheduler."""
+    button = mouse.Button.left if mouse_button_var.get() == "Left" else mouse.Button.right
+    scheduler.set_button(button)
+    settings.update("mouse_button", mouse_button_var.get())
+
+def toggle_clicking(event_time=None):
+    global is_running, watchdog_paused
+    if not is_running and not interval_is_valid:
+        print("Invalid interval input. Please enter numbers.")
+        show_status("Status: Stopped (Invalid Interval)")
+        return
     is_running = not is_running
+    watchdog_paused = False # Any start/stop takes over from a watchdog pause
+    stall_savings.switch("active" if is_running else None, time.monotonic())
+    # The scheduler already holds the current interval/button, so no GUI reads are needed here
+    if is_running:
+        scheduler.start_clicking(event_time)
+    else:
+        scheduler.stop_clicking(event_time)
     status = "Running" if is_running else "Stopped"
     print(f"Clicker {status}")
     # This function is called from the listener thread via on_press,
     # so schedule the GUI update on the main thread.
-    app.after(0, lambda: status_var.set(f"Status: {status}"))
-
-def click_loop():
-    """Main loop for the auto-clicking thread."""
-    global is_running
-    last_error_time = 0
-
-    while True:
-        if not is_running:
-            time.sleep(0.1)
-            continue
-
-        interval = get_interval()
-        if interval is None:
-            current_time = time.time()
-            if current_time - last_error_time > 5:
-                print("Stopping due to invalid interval.")
-                last_error_time = current_time
-            is_running = False # Stop the loop
-            # Safely update GUI from this background thread
-            app.after(0, lambda: status_var.set("Status: Stopped (Invalid Interval)"))
-            time.sleep(0.5)
-            continue
-
-        button_to_click = mouse.Button.left if mouse_button_var.get() == "Left" else mouse.Button.right
-
-        try:
-            mouse_controller.click(button_to_click, 1)
-            time.sleep(interval)
-        except Exception as e:
-            print(f"Error during click/sleep: {e}")
-            time.sleep(0.1)
+    show_status(f"Status: {status}")
 
-def on_press(key):
-    global hotkey, is_setting_hotkey, is_running
-
-    if is_setting_hotkey:
-        if key == keyboard.Key.esc: # Allow Esc to cancel setting hotkey
-             is_setting_hotkey = False
-             app.after(0, lambda: set_hotkey_button.configure(state="normal"))
-             for widget in interactive_widgets:
-                 widget.configure(state="normal")
-             # Restore status based on whether clicker is running or stopped
-             current_status = "Running" if is_running else "Stopped"
-             app.after(0, lambda: status_var.set(f"Status: {current_status}"))
-             print("Hotkey setting cancelled.")
-             return
-
-        hotkey = key
-        hotkey_name = get_key_name(key) # Use the refined get_key_name
-        # Safely update GUI from listener thread
-        app.after(0, lambda: hotkey_display_var.set(f"Hotkey: {hotkey_name}"))
-        is_setting_hotkey = False
-        app.after(0, lambda: set_hotkey_button.configure(state="normal"))
-        for widget in interactive_widgets:
-            # This loop correctly re-enables all interactive widgets, including the focusable entries.
-            widget.configure(state="normal") 
-            
-        current_status = "Running" if is_running else "Stopped"
-        if is_auto_eating and is_running:
-            current_status += " (Auto-Eating)"
-        elif is_auto_eating and not is_running:
-             current_status = "Stopped (Auto-Eat Paused)"
-
-        app.after(0, lambda: status_var.set(f"Status: {current_status}"))
-        print(f"New hotkey set to: {hotkey_name}")
+def finish_setting_hotkey():
+    """Re-enables the GUI after a hotkey was captured or the capture was cancelled (main thread)."""
+    global is_setting_hotkey
+    is_setting_hotkey = False
+    set_hotkey_button.configure(state="normal")
+    for widget in interactive_widgets:
+        # This loop correctly re-enables all interactive widgets, including the focusable entries.
+        widget.configure(state="normal")
+    status_var.set(f"Status: {get_main_status()}")
+
+def on_hotkey_captured(new_hotkey):
+    """Called from the listener thread with the chord pressed after "Set Hotkey" (None if Esc)."""
+    if new_hotkey is None: # Allow Esc to cancel setting hotkey
+        print("Hotkey setting cancelled.")
+        app.after(0, finish_setting_hotkey)
         return
-
-    if key == hotkey:
-        toggle_clicking()
+    in_use_by = [a for a, h in hotkey_bindings.items() if h == new_hotkey and a != "toggle_click"]
+    if in_use_by:
+        print(f"Hotkey {new_hotkey} is already used for {in_use_by[0]}.")
+        app.after(0, finish_setting_hotkey)
+        return
+    hotkey_bindings["toggle_click"] = new_hotkey
+    hotkey_matcher.bind("toggle_click", new_hotkey)
+    settings.update("hotkeys", hotkey_bindings)
+    hotkey_name = hotkeys.hotkey_display_name(new_hotkey)
+    # Safely update GUI from listener thread
+    app.after(0, lambda: hotkey_display_var.set(f"Hotkey: {hotkey_name}"))
+    app.after(0, finish_setting_hotkey)
+    print(f"New hotkey set to: {hotkey_name}")
+
+def run_on_ui(func, event_time):
+    """Schedules func on the Tk main loop and records the hotkey -> main loop latency."""
+    def callback():
+        ui_dispatch_latencies.append(time.perf_counter() - event_time)
+        func()
+    app.after(0, callback)
+
+def toggle_auto_eating_from_hotkey():
+    auto_eat_switch_var.set("off" if auto_eat_switch_var.get() == "on" else "on")
+    toggle_auto_eating()
+
+def panic_stop(event_time=None):
+    """Stops clicking and auto-eat at once; the scheduler releases any held eat button."""
+    global is_running, is_auto_eating, watchdog_paused
+    is_running = False
+    is_auto_eating = False
+    watchdog_paused = False
+    stall_savings.switch(None, time.monotonic())
+    scheduler.stop_clicking(event_time)
+    scheduler.set_auto_eat(None)
+    settings.update("auto_eat", False)
+    print("Panic stop!")
+    app.after(0, lambda: auto_eat_switch_var.set("off"))
+    show_status("Status: Stopped (Panic)")
+
+def on_hotkey_action(action, event_time):
+    """Called from the listener thread when a bound hotkey is pressed."""
+    if action == "toggle_click":
+        toggle_clicking(event_time) # Goes straight to the scheduler thread
+    elif action == "toggle_eat":
+        run_on_ui(toggle_auto_eating_from_hotkey, event_time) # Reads Tk widgets, so main thread
+    elif action == "panic_stop":
+        panic_stop(event_time)
+    elif action == "cycle_preset":
+        run_on_ui(lambda: cycle_preset(event_time), event_time)
 
 def start_hotkey_listener():
-    global listener_thread
-    with keyboard.Listener(on_press=on_press) as listener:
-        listener.join()
+    global hotkey_matcher
+    hotkey_matcher = hotkeys.HotkeyMatcher(on_hotkey_action)
+    for action, hotkey in list(hotkey_bindings.items()):
+        try:
+            hotkey_matcher.bind(action, hotkey)
+        except ValueError as e:
+            default = settings.defaults["hotkeys"].get(action)
+            print(f"Invalid hotkey '{hotkey}' for {action}: {e}. Using the default.")
+            if default is None:
+                del hotkey_bindings[action]
+                continue
+            hotkey_bindings[action] = default
+            hotkey_matcher.bind(action, default)
+    display_name = hotkeys.hotkey_display_name
+    hotkey_display_var.set(f"Hotkey: {display_name(hotkey_bindings['toggle_click'])}")
+    other_hotkeys_var.set(f"{display_name(hotkey_bindings['toggle_eat'])}: toggle auto-eat | "
+                          f"{display_name(hotkey_bindings['panic_stop'])}: panic stop | "
+                          f"{display_name(hotkey_bindings['cycle_preset'])}: next preset")
+    hotkey_matcher.start()
 
 # --- Eating Feature Functions ---
 def load_food_data():
-    """Loads food data from a JSON file (placeholder for now)."""
-    global foods_data, selected_food_duration
+    """Loads foods.json into the food catalog and starts watching it for edits."""
+    global food_catalog
     # Use resource_path to find foods.json, assuming it will be bundled at the root
-    foods_file = resource_path("foods.json") 
-    default_foods = {
-        "Most Foods": 1.61,
-        "Kelp": 0.865
-    }
-
-    if os.path.exists(foods_file):
-        try:
-            with open(foods_file, 'r') as f:
-                foods_data = json.load(f)
-            print(f"Loaded food data from {foods_file}")
-        except json.JSONDecodeError:
-            print(f"Error decoding {foods_file}. Using default foods.")
-            foods_data = default_foods
-            _save_default_foods(foods_file, default_foods) # Attempt to save defaults if file was corrupt
-        except Exception as e:
-            print(f"Error loading {foods_file}: {e}. Using default foods.")
-            foods_data = default_foods
-    else:
-        print(f"'{foods_file}' not found. Creating with default foods.")
-        foods_data = default_foods
-        _save_default_foods(foods_file, default_foods)
-
+    food_catalog = FoodCatalog(resource_path("foods.json"),
+                               on_change=lambda snapshot: app.after(0, refresh_food_list))
+    food_catalog.load()
+    saved_food = settings.get("food")
+    if saved_food in food_catalog.snapshot:
+        food_type_combobox.set(saved_food) # Restore the last selection
+    refresh_food_list()
+    food_catalog.start_watching() # Cheap mtime/size check; edits apply without a restart
+
+def refresh_food_list():
+    """Shows the current catalog snapshot in the combobox, keeping the selection if it still exists."""
+    foods = food_catalog.snapshot
     if food_type_combobox: # Check if GUI element exists
-        food_names = list(foods_data.keys())
+        food_names = list(foods.names)
         food_type_combobox.configure(values=food_names)
-        if food_names:
+        current = food_type_combobox.get()
+        if current in foods:
+            update_food_duration_display(current) # Duration may have changed
+        elif food_names:
             food_type_combobox.set(food_names[0])
             update_food_duration_display(food_names[0])
         else:
             food_type_combobox.set("") # Clear if no food data
             selected_food_duration.set("N/A")
 
-def _save_default_foods(file_path, data):
-    """Helper to save default food data to JSON."""
-    try:
-        with open(file_path, 'w') as f:
-            json.dump(data, f, indent=4)
-        print(f"Saved default food data to {file_path}")
-    except Exception as e:
-        print(f"Error saving default food data to {file_path}: {e}")
-
 def update_food_duration_display(selected_food_name):
     """Updates the eating duration label based on selected food."""
-    global foods_data, selected_food_duration
-    if selected_food_name and selected_food_name in foods_data:
-        duration = foods_data[selected_food_name]
-        selected_food_duration.set(f"{duration:.3f}s") # Display with 3 decimal places and unit
+    global selected_food_duration
+    foods = food_catalog.snapshot
+    if selected_food_name and selected_food_name in foods:
+        food = foods.get(selected_food_name)
+        selected_food_duration.set(f"{food.duration:.3f}s") # Display with 3 decimal places and unit
+        scheduler.set_food(food.name, food.duration, food.hunger, food.saturation) # Used by auto-eat
+        settings.update("food", food.name)
     else:
         selected_food_duration.set("N/A")
 
-def perform_eat_action():
-    """Simulates holding right-click to eat food from off-hand."""
-    food_type = food_type_combobox.get()
-
-    if not food_type or food_type not in foods_data:
-        print("No valid food type selected or food data missing.")
-        app.after(0, lambda: status_var.set("Status: Select Food Type!"))
-        return
+def get_main_status():
+    """Returns the clicker/auto-eat status text shown when nothing else is happening."""
+    if watchdog_paused:
+        return "Paused (Game Not Rendering)"
+    current_main_status = "Running" if is_running else "Stopped"
+    if is_auto_eating and is_running:
+        current_main_status += " (Auto-Eating)"
+    elif is_auto_eating and not is_running:
+        current_main_status = "Stopped (Auto-Eat Paused)"
+    return current_main_status
+
+def on_scheduler_event(kind, info):
+    """Called from the scheduler thread; only schedules GUI updates."""
+    food_type = info.get("food")
+    if kind == "eat_start":
+        show_status(f"Status: Eating {food_type}...")
+    elif kind == "eat_end" and info["aborted"]:
+        print(f"Eating '{food_type}' stopped early: released after {info['held']:.3f}s")
+        show_status(f"Status: {get_main_status()}")
+    elif kind == "eat_end":
+        print(f"Finished eating '{food_type}': held {info['held']:.4f}s "
+              f"(target {info['target']:.3f}s, {info['error'] * 1000:+.2f}ms)")
+        if window_hidden:
+            show_status(f"Status: {get_main_status()}") # The "Finished" message would never be seen
+            return
+        show_status(f"Status: Finished Eating {food_type}")
+        # Revert to main clicker status after a short delay
+        app.after(1000, lambda: show_status(f"Status: {get_main_status()}"))
 
+# --- Auto-Eating Logic ---
+def get_eat_interval_seconds():
+    """Reads the eat interval entry (minutes) and returns seconds, or None if invalid."""
     try:
-        duration = foods_data[food_type]
-    except KeyError:
-        print(f"Error: Food type '{food_type}' not found in data.")
-        app.after(0, lambda: status_var.set("Status: Food Data Error!"))
-        return
-
-    print(f"Attempting to eat: '{food_type}' for {duration:.3f}s")
-    app.after(0, lambda: status_var.set(f"Status: Eating {food_type}..."))
-
-    def _eat_action_thread():
-        try:
-            mouse_controller.press(mouse.Button.right)
-            time.sleep(duration) # Hold right click for the food's duration
-            mouse_controller.release(mouse.Button.right)
-            print(f"Finished eating '{food_type}'.")
-            # Update status on main thread after action
-            app.after(0, lambda: status_var.set(f"Status: Finished Eating {food_type}"))
-        except Exception as e:
-            print(f"Error during eat action: {e}")
-            app.after(0, lambda: status_var.set("Status: Error Eating!"))
-        finally:
-            # Revert to main clicker status after a short delay, or if eating was quick
-            current_main_status = "Running" if is_running else "Stopped"
-            if is_auto_eating and is_running:
-                current_main_status += " (Auto-Eating)"
-            elif is_auto_eating and not is_running:
-                current_main_status = "Stopped (Auto-Eat Paused)"
-            app.after(1000, lambda: app.after(0, lambda: status_var.set(f"Status: {current_main_status}")) )
-
-    threading.Thread(target=_eat_action_thread, daemon=True).start()
+        interval_minutes = float(entry_eat_interval.get())
+    except ValueError:
+        return None
+    if interval_minutes <= 0.01: # Minimum interval to avoid issues (e.g. 0.01 min = 0.6s)
+        return None
+    return interval_minutes * 60
 
-# --- Auto-Eating Logic ---
 def toggle_auto_eating():
     global is_auto_eating
     if auto_eat_switch_var.get() == "on":
-        is_auto_eating = True
-        # Check if entry_eat_interval exists and is valid before enabling
-        try:
-            interval_minutes = float(entry_eat_interval.get())
-            if interval_minutes <= 0.01:
-                app.after(0, lambda: status_var.set("Status: Auto-Eat Off (Invalid Interval)"))
-                app.after(0, lambda: auto_eat_switch_var.set("off"))
-                is_auto_eating = False
-                return # Do not proceed if interval is invalid
-        except ValueError:
-            app.after(0, lambda: status_var.set("Status: Auto-Eat Off (Invalid Interval)"))
+        interval_seconds = get_eat_interval_seconds()
+        if interval_seconds is None: # Do not proceed if interval is invalid
+            show_status("Status: Auto-Eat Off (Invalid Interval)")
             app.after(0, lambda: auto_eat_switch_var.set("off"))
             is_auto_eating = False
-            return # Do not proceed if interval is not a number
-            
+            settings.update("auto_eat", False)
+            return
+        is_auto_eating = True
+        # Eats right away if the clicker is running, then every interval while it runs
+        scheduler.set_auto_eat(interval_seconds)
         status_message = "Auto-Eat Enabled"
         if not is_running:
             status_message += " (Paused - Clicker Stopped)"
         print("Auto-eating enabled.")
     else:
         is_auto_eating = False
+        scheduler.set_auto_eat(None)
         status_message = "Auto-Eat Disabled"
         print("Auto-eating disabled.")
+    settings.update("auto_eat", is_auto_eating)
     
-    app.after(0, lambda: status_var.set(f"Status: {status_message}"))
+    show_status(f"Status: {status_message}")
+
+def toggle_smart_eating():
+    """Switches auto-eat between the fixed interval and the hunger planner."""
+    settings.update("smart_eat", smart_eat_switch_var.get() == "on")
+    if smart_eat_switch_var.get() == "on":
+        scheduler.set_planner(hunger_planner)
+        print(f"Hunger planner enabled: eating when food drops to {hunger_planner.threshold}/20.")
+    else:
+        scheduler.set_planner(None)
+        print("Hunger planner disabled: eating every interval.")
 
-def auto_eat_loop():
-    global is_auto_eating, is_running
-    last_eat_error_time = 0
+def get_hit_ratio():
+    """Reads the hit percentage entry and returns a 0-1 ratio, or None if invalid."""
+    try:
+        hit_percent = float(entry_hit_percent.get())
+    except ValueError:
+        return None
+    if not 0 <= hit_percent <= 100:
+        return None
+    return hit_percent / 100
+
+def apply_hit_ratio(event=None):
+    """Pushes an edited hit ratio to the hunger planner; an invalid entry keeps the last one."""
+    settings.update("hit_percent", entry_hit_percent.get())
+    ratio = get_hit_ratio()
+    if ratio is None:
+        print(f"Invalid hit percentage: {entry_hit_percent.get()}")
+        return
+    # The planner is read on the scheduler thread, so change it there
+    scheduler.post(lambda: setattr(hunger_planner, "hit_ratio", ratio))
 
-    while True:
-        time.sleep(0.5) # Main loop check interval
+def apply_eat_interval(event=None):
+    """Pushes an edited eat interval to the scheduler, or turns auto-eat off if it is invalid."""
+    global is_auto_eating
+    settings.update("eat_interval", entry_eat_interval.get())
+    if not is_auto_eating:
+        return
+    interval_seconds = get_eat_interval_seconds()
+    if interval_seconds is None:
+        print(f"Invalid auto-eat interval: {entry_eat_interval.get()}")
+        is_auto_eating = False
+        scheduler.set_auto_eat(None)
+        settings.update("auto_eat", False)
+        app.after(0, lambda: auto_eat_switch_var.set("off"))
+        show_status("Status: Auto-Eat Off (Invalid Interval)")
+        return
+    scheduler.set_eat_interval(interval_seconds)
+
+# --- Low-Power Mode (window minimized) ---
+# While the window is minimized nobody sees the status label, so status changes are not
+# sent to the Tk main loop at all (no wakeup, no label redraw); only the latest text is
+# kept and shown in one pass when the window is restored. Clicking, eating and hotkeys
+# don't depend on the main loop and are unaffected. Main-thread CPU time is accounted
+# per state, so the saving can be read from the close summary.
+main_thread_cpu = {"visible": [0.0, 0.0, 0], "minimized": [0.0, 0.0, 0]} # [CPU s, wall s, clicks]
+cpu_segment_start = None # (time.thread_time(), time.perf_counter(), scheduler.clicks)
+
+def show_status(text):
+    """Sets the status label from any thread, or just remembers the text while hidden."""
+    global pending_status
+    if window_hidden:
+        pending_status = text
+        return
+    app.after(0, lambda: status_var.set(text))
+
+def account_main_thread_cpu():
+    """Adds the main thread's CPU time since the last call to the current state (main thread only)."""
+    global cpu_segment_start
+    now = (time.thread_time(), time.perf_counter(), scheduler.clicks)
+    if cpu_segment_start is not None:
+        usage = main_thread_cpu["minimized" if window_hidden else "visible"]
+        for i in range(3):
+            usage[i] += now[i] - cpu_segment_start[i]
+    cpu_segment_start = now
+
+def on_visibility_change(event, hidden):
+    """<Map>/<Unmap> of the main window: enter or leave low-power mode."""
+    global window_hidden, pending_status
+    if event.widget is not app or scheduler is None or hidden == window_hidden:
+        return
+    account_main_thread_cpu()
+    window_hidden = hidden
+    if not hidden and pending_status is not None:
+        status_var.set(pending_status) # Reconcile in one pass
+        pending_status = None
+    print("Window hidden: low-power mode" if hidden else "Window restored")
+
+def cpu_summary():
+    account_main_thread_cpu()
+    parts = []
+    for state, (cpu, wall, clicks) in main_thread_cpu.items():
+        if wall > 0:
+            parts.append(f"{state} {cpu / wall * 1000:.2f}ms CPU/s over {wall:.1f}s ({clicks / wall:.0f} clicks/s)")
+    return "Main thread: " + ", ".join(parts)
+
+# --- Presets ---
+def current_config():
+    """Snapshot of the engine settings shown in the GUI, in the preset format."""
+    return {
+        "interval": {"hours": entry_hours.get(), "mins": entry_mins.get(),
+                     "secs": entry_secs.get(), "ms": entry_ms.get()},
+        "mouse_button": mouse_button_var.get(),
+        "food": food_type_combobox.get(),
+        "eat_interval": entry_eat_interval.get(),
+        "auto_eat": auto_eat_switch_var.get() == "on",
+        "smart_eat": smart_eat_switch_var.get() == "on",
+        "hit_percent": entry_hit_percent.get(),
+    }
 
-        if not is_auto_eating or not is_running:
-            continue
+def set_entry_text(entry, text):
+    entry.delete(0, "end")
+    entry.insert(0, text)
 
-        try:
-            interval_minutes_str = entry_eat_interval.get()
-            interval_minutes = float(interval_minutes_str)
-            if interval_minutes <= 0.01: # Minimum interval to avoid issues (e.g. 0.01 min = 0.6s)
-                raise ValueError("Eat interval too short or zero.")
-        except ValueError as e:
-            current_time = time.time()
-            if current_time - last_eat_error_time > 5: # Avoid spamming console/status
-                print(f"Invalid auto-eat interval: {interval_minutes_str}. Error: {e}")
-                app.after(0, lambda: status_var.set("Status: Invalid Eat Interval!"))
-                last_eat_error_time = current_time
-            
-            is_auto_eating = False # Turn off auto-eating
-            app.after(0, lambda: auto_eat_switch_var.set("off"))
-            # Consider also updating status_var to show auto-eat is now off due to error
-            app.after(0, lambda: status_var.set("Status: Auto-Eat Off (Invalid Interval)"))
-            continue
-
-        interval_seconds = interval_minutes * 60
-        
-        print(f"Auto-eat: Triggering eat. Next eat in approx {interval_minutes:.2f} minutes.")
-        perform_eat_action() # This is already threaded and handles its own status updates during eating
-        
-        # Sleep for the interval AFTER attempting to eat
-        # We need to account for the time it takes to eat. 
-        # However, perform_eat_action is async. This sleep is for the time *between* eat attempts.
-        # We also need to be ables to interrupt this sleep if is_auto_eating or is_running changes.
-        sleep_chunk = 0.2 # Check every 0.2s
-        slept_time = 0
-        while slept_time < interval_seconds:
-            if not is_auto_eating or not is_running: # Check flags during sleep
-                print("Auto-eating or main clicker stopped during sleep, breaking wait.")
-                break
-            time.sleep(sleep_chunk)
-            slept_time += sleep_chunk
-        else: # Executed if the loop completed without a break
-            print(f"Finished waiting {interval_seconds:.2f}s for auto-eat.")
-            continue # Go to next iteration to potentially eat again
-        
-        # If we broke from the sleep loop, just continue to re-evaluate at the top of the main while True
-        print("Auto-eat sleep interrupted. Re-evaluating.")
-
-
-# --- Initialize & Start Threads ---
-load_food_data() # Load food data on startup
-
-listener_thread = threading.Thread(target=start_hotkey_listener, daemon=True)
-listener_thread.start()
-click_thread = threading.Thread(target=click_loop, daemon=True)
-click_thread.start()
-auto_eat_thread = threading.Thread(target=auto_eat_loop, daemon=True) # Create and start auto-eat thread
-auto_eat_thread.start()
+def save_preset():
+    """Saves the current settings under a name (asked with a dialog)."""
+    name = ctk.CTkInputDialog(text="Preset name:", title="Save Preset").get_input()
+    if not name:
+        return
+    presets = dict(settings.get("presets"))
+    presets[name] = current_config()
+    settings.update("presets", presets)
+    settings.update("active_preset", name)
+    preset_combobox.configure(values=list(presets))
+    preset_combobox.set(name)
+    print(f"Saved preset '{name}'.")
+
+def apply_preset(name, event_time):
+    """
+    Applies a preset while the clicker keeps running (main thread). The scheduler gets
+    the new interval/button in one command, effective from the next click deadline.
+    """
+    global interval_is_valid
+    preset = settings.get("presets").get(name)
+    if preset is None:
+        return
+    config = dict(current_config(), **preset)
+    for entry, key in ((entry_hours, "hours"), (entry_mins, "mins"), (entry_secs, "secs"), (entry_ms, "ms")):
+        set_entry_text(entry, config["interval"][key])
+    set_entry_text(entry_eat_interval, config["eat_interval"])
+    set_entry_text(entry_hit_percent, config["hit_percent"])
+    interval = get_interval()
+    if interval is None:
+        apply_interval() # Stops with "Invalid Interval" like a bad manual edit
+        return
+    mouse_button_var.set(config["mouse_button"])
+    button = mouse.Button.left if config["mouse_button"] == "Left" else mouse.Button.right
+    scheduler.switch_config(interval, button, event_time, eat_interval=get_eat_interval_seconds())
+    interval_is_valid = True
+    settings.update("interval", dict(config["interval"]))
+    apply_eat_interval() # Saves it; turns auto-eat off if the preset's interval is invalid
+    apply_hit_ratio()
+    if config["food"] in food_catalog.snapshot:
+        food_type_combobox.set(config["food"])
+        update_food_duration_display(config["food"])
+    if (smart_eat_switch_var.get() == "on") != config["smart_eat"]:
+        smart_eat_switch_var.set("on" if config["smart_eat"] else "off")
+        toggle_smart_eating()
+    if is_auto_eating != config["auto_eat"]:
+        auto_eat_switch_var.set("on" if config["auto_eat"] else "off")
+        toggle_auto_eating()
+    preset_combobox.set(name)
+    settings.update("active_preset", name)
+    show_status(f"Status: {get_main_status()} - Preset '{name}'") # May be switched by hotkey while minimized
+    print(f"Switched to preset '{name}' in {(time.perf_counter() - event_time) * 1000:.2f}ms (GUI side).")
+
+def cycle_preset(event_time):
+    """Switches to the next saved preset (hotkey)."""
+    names = list(settings.get("presets"))
+    if not names:
+        return
+    current = settings.get("active_preset")
+    next_index = (names.index(current) + 1) % len(names) if current in names else 0
+    apply_preset(names[next_index], event_time)
+
+# --- Control Socket ---
+# Scripts drive the clicker over a local Unix socket (automation_core.control) instead of
+# faking hotkeys. Commands run on the server's connection thread: they talk to the
+# scheduler directly (thread-safe) and leave widget updates to the Tk main loop.
+CONTROL_SOCKET_NAME = "auto_clicker" # -> $XDG_RUNTIME_DIR/auto_clicker.sock (or the temp dir)
+
+def control_set_running(running):
+    if running != is_running:
+        toggle_clicking(time.perf_counter())
+    return {"running": is_running}
+
+def set_interval_entries(seconds):
+    """
+    Shows an interval in the entries and saves it like a manual edit (main thread). The
+    entries only hold whole milliseconds, so the scheduler is then given the exact value again.
+    """
+    total_ms = round(seconds * 1000)
+    hours, rest = divmod(total_ms, 3600000)
+    mins, rest = divmod(rest, 60000)
+    secs, ms = divmod(rest, 1000)
+    for entry, value in ((entry_hours, hours), (entry_mins, mins), (entry_secs, secs), (entry_ms, ms)):
+        set_entry_text(entry, str(value))
+    apply_interval()
+    scheduler.set_interval(seconds) # Posted after apply_interval's rounded value, so it wins
+
+def control_set_interval(seconds):
+    try:
+        seconds = float(seconds)
+    except (TypeError, ValueError):
+        raise ValueError(f"interval must be a number of seconds, got {seconds!r}")
+    if seconds < 0.003:
+        raise ValueError("interval must be at least 0.003s")
+    scheduler.set_interval(seconds) # Live at the next click deadline
+    app.after(0, lambda: set_interval_entries(seconds))
+    return {"interval": seconds}
+
+def control_eat(food=None):
+    if food is None:
+        if scheduler.food is None:
+            raise ValueError("no food selected")
+        name, duration = scheduler.food
+    else:
+        entry = food_catalog.snapshot.get(food)
+        if entry is None:
+            raise ValueError(f"unknown food '{food}'")
+        name, duration = entry.name, entry.duration
+    return {"accepted": scheduler.request_eat(name, duration, source="control")}
+
+def control_pause():
+    """Stall watchdog: the game stopped rendering, so stop clicking (and auto-eat) until "resume"."""
+    global watchdog_paused
+    if is_running and not watchdog_paused:
+        toggle_clicking(time.perf_counter())
+        watchdog_paused = True
+        stall_savings.switch("paused", time.monotonic())
+        print("Paused by the stall watchdog: game not rendering.")
+        show_status(f"Status: {get_main_status()}")
+    return {"paused": watchdog_paused, "running": is_running}
+
+def control_resume():
+    """Stall watchdog: frames change again; restarts clicking only if "pause" stopped it."""
+    if watchdog_paused:
+        toggle_clicking(time.perf_counter()) # Clears watchdog_paused
+        print("Resumed by the stall watchdog.")
+    return {"paused": watchdog_paused, "running": is_running}
+
+def control_switch_preset(name):
+    if name not in settings.get("presets"):
+        raise ValueError(f"unknown preset '{name}'")
+    event_time = time.perf_counter()
+    app.after(0, lambda: apply_preset(name, event_time)) # Reads/writes widgets
+    return {"queued": name}
+
+def control_metrics():
+    return dict(scheduler.stats(), running=is_running, auto_eating=is_auto_eating,
+                interval=scheduler.interval, food=scheduler.food and scheduler.food[0],
+                preset=settings.get("active_preset"), watchdog_paused=watchdog_paused,
+                cpu_seconds=time.process_time(), watchdog=stall_savings.summary(time.monotonic()))
+
+def start_control_server():
+    global control_server
+    from automation_core import control
+    if not control.AVAILABLE:
+        print("Control socket not available on this platform.")
+        return
+    commands = {
+        "start": lambda: control_set_running(True),
+        "stop": lambda: control_set_running(False),
+        "toggle": lambda: control_set_running(not is_running),
+        "set_interval": control_set_interval,
+        "eat": control_eat,
+        "switch_preset": control_switch_preset,
+        "panic_stop": lambda: panic_stop(time.perf_counter()),
+        "pause": control_pause,
+        "resume": control_resume,
+        "metrics": control_metrics,
+    }
+    server = control.ControlServer(control.default_socket_path(CONTROL_SOCKET_NAME), commands)
+    try:
+        server.start()
+    except OSError as e:
+        print(f"Control socket disabled: {e}")
+        return
+    control_server = server
+    print(f"Control socket listening on {server.path}")
+
+def on_close():
+    print(scheduler.stats_summary())
+    print(cpu_summary())
+    print("Stall watchdog: " + stall_savings.describe(time.monotonic()))
+    if ui_dispatch_latencies:
+        print(f"Hotkey -> UI dispatch: mean {sum(ui_dispatch_latencies) / len(ui_dispatch_latencies) * 1000:.3f}ms, "
+              f"max {max(ui_dispatch_latencies) * 1000:.3f}ms")
+    if smart_eat_switch_var.get() == "on":
+        food = food_catalog.snapshot.get(food_type_combobox.get())
+        print(hunger_planner.summary(get_eat_interval_seconds(), food.duration if food else 0.0))
+    food_catalog.stop_watching()
+    if control_server is not None:
+        control_server.close()
+    settings.flush()
+    scheduler.shutdown()
+    app.destroy()
+
+
+# --- Initialize & Start Threads (after the first paint) ---
+STARTUP_PROBE = os.environ.get("AUTO_CLICKER_STARTUP_PROBE") == "1" # Set by bench_startup.py
+first_paint_time = None # time.time() when the main window was first mapped
+
+def on_first_map(event):
+    """Runs once the main window is mapped; finish_startup is queued behind Tk's own redraws."""
+    global first_paint_time
+    if event.widget is not app or first_paint_time is not None:
+        return
+    first_paint_time = time.time()
+    app.after_idle(finish_startup)
+
+def finish_startup():
+    """Imports pynput, loads foods.json and starts the scheduler and hotkey listener."""
+    global mouse, hotkeys, mouse_controller, scheduler
+    from pynput import mouse
+    import hotkeys
+    from click_scheduler import ClickScheduler
+
+    mouse_controller = mouse.Controller()
+    scheduler = ClickScheduler(mouse_controller, on_event=on_scheduler_event)
+    load_food_data()
+    apply_interval()
+    apply_mouse_button()
+    apply_hit_ratio()
+    # Restore the saved eating switches
+    if settings.get("smart_eat"):
+        smart_eat_switch_var.set("on")
+        toggle_smart_eating()
+    if settings.get("auto_eat"):
+        auto_eat_switch_var.set("on")
+        toggle_auto_eating()
+
+    # Keep the scheduler's config in sync with the GUI (read on the main thread only)
+    for entry_widget in (entry_hours, entry_mins, entry_secs, entry_ms):
+        entry_widget.bind("<KeyRelease>", apply_interval, add="+")
+    entry_eat_interval.bind("<KeyRelease>", apply_eat_interval, add="+")
+    entry_hit_percent.bind("<KeyRelease>", apply_hit_ratio, add="+")
+    mouse_button_var.trace_add("write", apply_mouse_button)
+    app.protocol("WM_DELETE_WINDOW", on_close)
+
+    start_hotkey_listener()
+    start_control_server()
+    scheduler.start()
+    account_main_thread_cpu() # Starts the first "visible" segment
+
+    if STARTUP_PROBE:
+        # One machine-readable line for bench_startup.py, then a normal close
+        interactive_time = time.time()
+        print(f"STARTUP_PROBE first_paint={first_paint_time:.6f} interactive={interactive_time:.6f}", flush=True)
+        app.after(0, on_close)
+
+app.bind("<Map>", on_first_map, add="+")
+app.bind("<Map>", lambda event: on_visibility_change(event, hidden=False), add="+")
+app.bind("<Unmap>", lambda event: on_visibility_change(event, hidden=True), add="+")
 
 # --- Run App ---
-app.mainloop() 
\ No newline at end of file
+try:
+    app.mainloop()
+finally:
+    if scheduler is not None:
+        scheduler.shutdown() # Releases the right button if an eat is still held 
\ No newline at end of file
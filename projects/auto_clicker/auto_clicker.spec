@@ -0,0 +1,50 @@
+# -*- mode: python ; coding: utf-8 -*-
+# PyInstaller build for the auto clicker. Build with:  pyinstaller auto_clicker.spec
+#
+# This is a onedir build (dist/StylishAutoClicker/). A onefile build unpacks the whole
+# bundle (Python, Tcl/Tk, customtkinter's themes and assets) into a temp folder on every
+# launch; onedir ships it unpacked, so a cold start only reads what it imports.
+# resource_path() works the same in both: sys._MEIPASS points at the bundle folder.
+
+import sys
+
+from PyInstaller.utils.hooks import collect_data_files
+
+# pynput selects its backend at runtime (pynput._util.backend), so static analysis
+# can't see the platform modules
+if sys.platform == "win32":
+    pynput_backends = ["pynput.keyboard._win32", "pynput.mouse._win32", "pynput._util.win32"]
+elif sys.platform == "darwin":
+    pynput_backends = ["pynput.keyboard._darwin", "pynput.mouse._darwin", "pynput._util.darwin"]
+else:
+    pynput_backends = ["pynput.keyboard._xorg", "pynput.mouse._xorg", "pynput._util.xorg"]
+
+a = Analysis(
+    ["auto_clicker.py"],
+    pathex=[".."], # projects/, for automation_core
+    binaries=[],
+    datas=[("foods.json", ".")] + collect_data_files("customtkinter"),
+    hiddenimports=pynput_backends,
+    hookspath=[],
+    runtime_hooks=[],
+    excludes=["unittest", "pydoc", "doctest"],
+    noarchive=False,
+)
+pyz = PYZ(a.pure)
+
+exe = EXE(
+    pyz,
+    a.scripts,
+    [],
+    exclude_binaries=True, # onedir: binaries go to COLLECT instead of into the exe
+    name="StylishAutoClicker",
+    console=False,
+    upx=False, # UPX-compressed DLLs must be decompressed at every load, which slows startup
+)
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.datas,
+    upx=False,
+    name="StylishAutoClicker",
+)
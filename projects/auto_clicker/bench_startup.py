@@ -0,0 +1,73 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# --- Startup Benchmark ---
+# Measures cold start: from spawning the process to the first interactive frame (window
+# painted, foods.json loaded, scheduler and hotkey listener running). The app is started
+# with AUTO_CLICKER_STARTUP_PROBE=1, prints one STARTUP_PROBE line and closes itself.
+# Times are time.time() in both processes, so they compare across the process boundary.
+#
+# Usage:
+#   python bench_startup.py                                  # python auto_clicker.py
+#   python bench_startup.py --exe dist/StylishAutoClicker/StylishAutoClicker   # onedir build
+#   python bench_startup.py --exe dist/StylishAutoClicker.exe                  # compare with onefile
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+TIMEOUT = 30.0 # Seconds before a launch is counted as failed
+
+
+def launch_once(command):
+    """Starts the app once; returns (first_paint_ms, interactive_ms) after process start, or None."""
+    env = dict(os.environ, AUTO_CLICKER_STARTUP_PROBE="1")
+    spawn_time = time.time()
+    try:
+        result = subprocess.run(command, cwd=SCRIPT_DIR, env=env, capture_output=True,
+                                text=True, timeout=TIMEOUT)
+    except subprocess.TimeoutExpired:
+        print("  launch timed out")
+        return None
+    for line in result.stdout.splitlines():
+        if line.startswith("STARTUP_PROBE"):
+            fields = dict(part.split("=") for part in line.split()[1:])
+            return ((float(fields["first_paint"]) - spawn_time) * 1000,
+                    (float(fields["interactive"]) - spawn_time) * 1000)
+    print(f"  no STARTUP_PROBE line (exit code {result.returncode}): {result.stderr.strip()[-300:]}")
+    return None
+
+
+def describe(name, values):
+    return (f"{name}: min {min(values):.0f}ms, median {statistics.median(values):.0f}ms, "
+            f"max {max(values):.0f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure auto clicker cold start time.")
+    parser.add_argument("--exe", help="Frozen app to launch instead of 'python auto_clicker.py'")
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    command = [args.exe] if args.exe else [sys.executable, os.path.join(SCRIPT_DIR, "auto_clicker.py")]
+    print(f"Launching {' '.join(command)} x{args.runs}")
+    first_paint, interactive = [], []
+    for i in range(args.runs):
+        times = launch_once(command)
+        if times is None:
+            continue
+        first_paint.append(times[0])
+        interactive.append(times[1])
+        print(f"  run {i + 1}: first paint {times[0]:.0f}ms, interactive {times[1]:.0f}ms")
+
+    if not interactive:
+        print("No successful launches.")
+        return 1
+    print(describe("First paint", first_paint))
+    print(describe("First interactive frame", interactive))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,401 @@
+import heapq
+import itertools
+from collections import deque
+import math
+import threading
+import time
+
+from pynput import mouse
+
+from automation_core.clock import RealClock, SPIN_THRESHOLD
+
+# --- Click Scheduler ---
+# A single thread owns the mouse. Clicks and auto-eat windows are timers in one
+# priority queue (heap of deadline, priority, sequence), so a left-click can never land
+# in the middle of a right-button eat hold:
+#   - EAT_START presses the right button and pauses the click stream.
+#   - EAT_END releases it exactly `duration` seconds later.
+#   - Clicks that fall inside the eat window are deferred to the first slot after it,
+#     keeping the original click phase (deadline + n * interval).
+# Other threads never touch the mouse; they post commands that run on the scheduler thread.
+# Eat requests (manual or auto) go through a small bounded queue: a request is rejected
+# while another eat is in flight, so holds can never overlap, and a stop drops any request
+# that hasn't started yet.
+# All scheduling time comes from self.clock (automation_core.clock), so the same code can
+# run on a VirtualClock in simulate_schedule.py. Latencies of real input (hotkeys, preset
+# switches) are still measured with time.perf_counter().
+
+# Timer kinds, in priority order when deadlines tie (lower runs first)
+EAT_END = 0
+EAT_START = 1
+CLICK = 2
+
+EAT_QUEUE_SIZE = 1 # Max eat requests waiting to start
+PLANNER_MIN_CHECK = 0.5 # Never re-check hunger more often than this
+
+
+class ClickScheduler:
+    def __init__(self, mouse_controller, on_event=None, clock=None):
+        self.mouse = mouse_controller
+        self.on_event = on_event # Called as on_event(kind, info_dict) from the scheduler thread
+        self.clock = clock or RealClock()
+        self._timers = [] # Heap of (deadline, kind, seq, generation, payload)
+        self._seq = itertools.count()
+        self._commands = []
+        self._cond = threading.Condition()
+        self._thread = None
+        self._stopped = False
+
+        # Engine config (only changed on the scheduler thread)
+        self.clicking = False
+        self.interval = 0.1
+        self.button = mouse.Button.left
+        self.eat_interval = None # Seconds between auto-eats, or None when auto-eat is off
+        self.food = None # (name, duration) used for auto-eats
+        self.food_restore = (None, None) # (hunger, saturation) of that food, if known
+        self.planner = None # HungerPlanner: when set, auto-eat only eats when hunger requires it
+        self._planner_clicks = 0 # Attack count at the last planner update
+        self._planner_time = None # clock time of the last planner update
+
+        # Timer generations: bumping one invalidates queued timers of that kind
+        self._click_gen = 0
+        self._auto_eat_gen = 0
+        self._eat_gen = 0
+
+        # Eat state (the queue and in-flight flag are guarded by self._cond)
+        self._eat_queue = deque() # (request_time, name, duration, source)
+        self._eat_in_flight = False
+        self.eating_until = None
+        self._eat_press_time = None
+        self._eat_food = None
+        self._eat_duration = None
+
+        # Metrics
+        self.clicks = 0
+        self.attacks = 0 # Left clicks (these drain hunger in game)
+        self.clicks_deferred = 0 # Click slots skipped because they fell inside an eat window
+        self.eats = 0
+        self.hold_errors = [] # Actual hold - target hold, in seconds (completed eats)
+        self.holds = [] # (food, target, actual, aborted) for every eat
+        self.eat_queue_delays = [] # Request -> button press, in seconds
+        self.timer_events = 0 # Timers fired (including stale ones), for overhead measurements
+        self.eat_rejections = 0 # Requests rejected because an eat was in flight or queued
+        self.eats_dropped = 0 # Queued requests discarded by a stop before they started
+        self.dispatch_latencies = deque(maxlen=1000) # Hotkey event -> scheduler wakeup, in seconds
+        self.preset_switch_latencies = deque(maxlen=1000) # Preset selected -> new config live, in seconds
+
+    # --- Thread-safe API (any thread) ---
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def shutdown(self, timeout=1.0):
+        """Stops the scheduler thread; any held eat button is released before it exits."""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    def join(self, timeout=None):
+        """Waits for the scheduler thread to exit (after shutdown())."""
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def post(self, func, event_time=None):
+        """
+        Runs func() on the scheduler thread as soon as possible. event_time (perf_counter)
+        is when the triggering input happened, used to measure dispatch latency.
+        """
+        with self._cond:
+            self._commands.append((func, event_time))
+            self._cond.notify()
+
+    def start_clicking(self, event_time=None):
+        self.post(self._start_clicking, event_time)
+
+    def stop_clicking(self, event_time=None):
+        self.post(self._stop_clicking, event_time)
+
+    def set_interval(self, interval):
+        self.post(lambda: setattr(self, "interval", interval))
+
+    def set_button(self, button):
+        self.post(lambda: setattr(self, "button", button))
+
+    def set_food(self, name, duration, hunger=None, saturation=None):
+        def apply():
+            self.food = (name, duration)
+            self.food_restore = (hunger, saturation)
+        self.post(apply)
+
+    def set_planner(self, planner):
+        """Switches auto-eat between the fixed interval (None) and a HungerPlanner."""
+        def apply():
+            self.planner = planner
+            if planner is not None:
+                planner.reset()
+            self._planner_time = self.clock.now() if self.clicking else None
+            self._planner_clicks = self.attacks
+            self._auto_eat_gen += 1
+            self._arm_auto_eat()
+        self.post(apply)
+
+    def set_auto_eat(self, interval):
+        """Enables auto-eat every `interval` seconds while clicking (eating right away); None disables it."""
+        self.post(lambda: self._set_auto_eat(interval))
+
+    def set_eat_interval(self, interval):
+        """Changes the auto-eat interval from the next scheduled eat on, without eating now."""
+        self.post(lambda: setattr(self, "eat_interval", interval))
+
+    def switch_config(self, interval, button, event_time, eat_interval=None):
+        """
+        Swaps interval/button (and the auto-eat interval) in one command without stopping.
+        The click already scheduled keeps its deadline; the new interval applies from there.
+        """
+        def apply():
+            self.interval = interval
+            self.button = button
+            if eat_interval is not None:
+                self.eat_interval = eat_interval
+            self.preset_switch_latencies.append(time.perf_counter() - event_time)
+        self.post(apply)
+
+    def request_eat(self, name, duration, source="manual"):
+        """
+        Queues one eat. Returns False (and counts a rejection) if an eat is already
+        in flight or the queue is full, so overlapping eats are never started.
+        """
+        with self._cond:
+            if self._eat_in_flight or len(self._eat_queue) >= EAT_QUEUE_SIZE:
+                self.eat_rejections += 1
+                return False
+            self._eat_queue.append((self.clock.now(), name, duration, source))
+            self._cond.notify()
+            return True
+
+    # --- Scheduler thread ---
+    def _push(self, deadline, kind, generation, payload=None):
+        heapq.heappush(self._timers, (deadline, kind, next(self._seq), generation, payload))
+
+    def _emit(self, kind, **info):
+        if self.on_event is not None:
+            try:
+                self.on_event(kind, info)
+            except Exception as e:
+                print(f"Error in scheduler event handler: {e}")
+
+    def _start_clicking(self):
+        if self.clicking:
+            return
+        self.clicking = True
+        self._click_gen += 1
+        self._push(self.clock.now(), CLICK, self._click_gen)
+        self._planner_time = self.clock.now()
+        self._planner_clicks = self.attacks
+        self._arm_auto_eat()
+
+    def _stop_clicking(self):
+        if self.clicking:
+            self._update_planner()
+        self._planner_time = None
+        self.clicking = False
+        self._click_gen += 1
+        self._auto_eat_gen += 1 # Auto-eat only runs while clicking
+        with self._cond:
+            # An eat posted in the same wakeup as the stop must not start after it
+            self.eats_dropped += len(self._eat_queue)
+            self._eat_queue.clear()
+        self._release_eat(aborted=True) # Never leave the right button held after a stop
+
+    def _set_auto_eat(self, interval):
+        self.eat_interval = interval
+        self._auto_eat_gen += 1
+        self._arm_auto_eat()
+
+    def _arm_auto_eat(self):
+        # Like the old auto_eat_loop: eat right away, then every eat_interval while clicking.
+        # With a planner, the first check happens right away and only eats if hungry.
+        if self.clicking and self.eat_interval and self.food:
+            self._push(self.clock.now(), EAT_START, self._auto_eat_gen)
+
+    def _update_planner(self):
+        """Feeds the clicking time and attacks since the last update into the planner."""
+        if self.planner is None or self._planner_time is None:
+            return
+        now = self.clock.now()
+        self.planner.advance(now - self._planner_time, self.attacks - self._planner_clicks)
+        self._planner_time = now
+        self._planner_clicks = self.attacks
+
+    def attack_rate(self):
+        """Left clicks per second at the current settings."""
+        return 1 / self.interval if self.button == mouse.Button.left else 0.0
+
+    def _run(self):
+        try:
+            self._loop()
+        finally:
+            self._release_eat(aborted=True)
+
+    def _loop(self):
+        while True:
+            spin_until = None
+            with self._cond:
+                while not self._stopped and not self._commands and not self._eat_queue:
+                    timeout = None
+                    if self._timers:
+                        deadline, kind = self._timers[0][0], self._timers[0][1]
+                        timeout = deadline - self.clock.now()
+                        if timeout <= 0:
+                            break
+                        if kind == EAT_END:
+                            if timeout <= SPIN_THRESHOLD:
+                                spin_until = deadline # Finish this wait outside the lock
+                                break
+                            timeout -= SPIN_THRESHOLD # Wake early, then spin to the release
+                    self.clock.wait(self._cond, timeout)
+                if self._stopped:
+                    return
+                commands, self._commands = self._commands, []
+
+            if spin_until is not None:
+                self.clock.sleep_until(spin_until)
+
+            for command, event_time in commands:
+                if event_time is not None:
+                    self.dispatch_latencies.append(time.perf_counter() - event_time)
+                command()
+            self._start_queued_eat()
+
+            now = self.clock.now()
+            while self._timers and self._timers[0][0] <= now:
+                deadline, kind, _, generation, payload = heapq.heappop(self._timers)
+                self.timer_events += 1
+                try:
+                    self._fire(deadline, kind, generation, payload)
+                except Exception as e:
+                    print(f"Error in click scheduler: {e}")
+                now = self.clock.now()
+
+    def _fire(self, deadline, kind, generation, payload):
+        if kind == CLICK:
+            if generation != self._click_gen:
+                return # Stale timer from before a stop/start
+            if self.eating_until is not None and deadline < self.eating_until:
+                # Defer to the first slot on the original phase after the eat window
+                skipped = math.ceil((self.eating_until - deadline) / self.interval)
+                self.clicks_deferred += skipped
+                self._push(deadline + skipped * self.interval, CLICK, generation)
+                return
+            self.mouse.click(self.button, 1)
+            self.clicks += 1
+            if self.button == mouse.Button.left:
+                self.attacks += 1
+            next_deadline = deadline + self.interval
+            now = self.clock.now()
+            if next_deadline < now:
+                # Fell behind (e.g. the system stalled): skip missed slots instead of bursting
+                next_deadline += math.ceil((now - next_deadline) / self.interval) * self.interval
+            self._push(next_deadline, CLICK, generation)
+
+        elif kind == EAT_START:
+            # Auto-eat timer: queue an eat with the current food and schedule the next one
+            if generation != self._auto_eat_gen:
+                return # Auto-eat was turned off or clicking stopped
+            if self.planner is None:
+                self._push(deadline + self.eat_interval, EAT_START, generation)
+                if self.food is not None:
+                    self.request_eat(*self.food, source="auto")
+                    self._start_queued_eat()
+                return
+            self._update_planner()
+            if self.planner.needs_food() and self.food is not None:
+                if self.request_eat(*self.food, source="planner"):
+                    self.planner.on_eat(self.food[1], *self.food_restore)
+                    self._start_queued_eat()
+            next_check = self.clock.now() + max(PLANNER_MIN_CHECK, self.planner.next_check_delay(self.attack_rate()))
+            if self.eating_until is not None:
+                next_check = max(next_check, self.eating_until) # Re-check once the current eat is done
+            self._push(next_check, EAT_START, generation)
+
+        elif kind == EAT_END:
+            if generation == self._eat_gen:
+                self._release_eat()
+
+    def _start_queued_eat(self):
+        with self._cond:
+            if self._eat_in_flight or not self._eat_queue:
+                return
+            request_time, name, duration, source = self._eat_queue.popleft()
+            self._eat_in_flight = True
+        self._eat_gen += 1
+        self._eat_food = name
+        self._eat_duration = duration
+        try:
+            self.mouse.press(mouse.Button.right)
+        finally:
+            # Set even if press() raised, so _release_eat() still releases the button
+            self._eat_press_time = self.clock.now()
+            self.eating_until = self._eat_press_time + duration
+        self.eat_queue_delays.append(self._eat_press_time - request_time)
+        self._push(self.eating_until, EAT_END, self._eat_gen)
+        self._emit("eat_start", food=name, duration=duration, source=source)
+
+    def _release_eat(self, aborted=False):
+        """Releases the right button if an eat is in progress and records the actual hold."""
+        if self.eating_until is None:
+            return
+        try:
+            self.mouse.release(mouse.Button.right)
+        finally:
+            held = self.clock.now() - self._eat_press_time
+            target = self._eat_duration
+            self.eating_until = None
+            with self._cond:
+                self._eat_in_flight = False
+            self.holds.append((self._eat_food, target, held, aborted))
+            if not aborted:
+                self.eats += 1
+                self.hold_errors.append(held - target)
+            self._emit("eat_end", food=self._eat_food, held=held, target=target,
+                       error=held - target, aborted=aborted)
+
+    # --- Reporting ---
+    def stats(self):
+        """Hold accuracy and click-rate loss so far."""
+        total_slots = self.clicks + self.clicks_deferred
+        errors_ms = [e * 1000 for e in self.hold_errors]
+        delays_ms = [d * 1000 for d in self.eat_queue_delays]
+        dispatch_ms = [d * 1000 for d in self.dispatch_latencies]
+        switch_ms = [d * 1000 for d in self.preset_switch_latencies]
+        return {
+            "clicks": self.clicks,
+            "clicks_deferred": self.clicks_deferred,
+            "click_loss_pct": 100 * self.clicks_deferred / total_slots if total_slots else 0.0,
+            "eats": self.eats,
+            "hold_error_mean_ms": sum(errors_ms) / len(errors_ms) if errors_ms else 0.0,
+            "hold_error_max_ms": max(errors_ms, key=abs) if errors_ms else 0.0,
+            "eat_queue_delay_mean_ms": sum(delays_ms) / len(delays_ms) if delays_ms else 0.0,
+            "eat_queue_delay_max_ms": max(delays_ms) if delays_ms else 0.0,
+            "eat_rejections": self.eat_rejections,
+            "eats_dropped": self.eats_dropped,
+            "dispatch_latency_mean_ms": sum(dispatch_ms) / len(dispatch_ms) if dispatch_ms else 0.0,
+            "dispatch_latency_max_ms": max(dispatch_ms) if dispatch_ms else 0.0,
+            "preset_switches": len(switch_ms),
+            "preset_switch_mean_ms": sum(switch_ms) / len(switch_ms) if switch_ms else 0.0,
+            "preset_switch_max_ms": max(switch_ms) if switch_ms else 0.0,
+        }
+
+    def stats_summary(self):
+        s = self.stats()
+        return (f"Clicks: {s['clicks']} ({s['clicks_deferred']} deferred for eating, "
+                f"{s['click_loss_pct']:.1f}% of click slots) | Eats: {s['eats']} "
+                f"(hold error mean {s['hold_error_mean_ms']:+.2f}ms, worst {s['hold_error_max_ms']:+.2f}ms; "
+                f"queue delay mean {s['eat_queue_delay_mean_ms']:.2f}ms, max {s['eat_queue_delay_max_ms']:.2f}ms; "
+                f"{s['eat_rejections']} overlapping requests rejected, {s['eats_dropped']} dropped by a stop) | "
+                f"Hotkey dispatch: "
+                f"mean {s['dispatch_latency_mean_ms']:.3f}ms, max {s['dispatch_latency_max_ms']:.3f}ms | "
+                f"Preset switches: {s['preset_switches']} (mean {s['preset_switch_mean_ms']:.3f}ms, "
+                f"max {s['preset_switch_max_ms']:.3f}ms)")
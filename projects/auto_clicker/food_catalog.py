@@ -0,0 +1,198 @@
+import json
+import os
+import threading
+from dataclasses import dataclass
+from types import MappingProxyType
+
+# --- Food Catalog ---
+# Backs foods.json. Each load produces an immutable CatalogSnapshot that is swapped in
+# with a single reference assignment, so readers (GUI, scheduler) always see either the
+# old or the new catalog, never a half-loaded dict. A background timer checks the file's
+# mtime/size (one os.stat call) and only re-reads it when that changes.
+#
+# foods.json schema (version 2):
+#   {"version": 2, "foods": {"Kelp": {"duration": 0.865, "hunger": 1, "saturation": 0.6}, ...}}
+# Version 1 files (plain {"Kelp": 0.865}) are still accepted.
+
+SCHEMA_VERSION = 2
+WATCH_INTERVAL = 1.0 # Seconds between change checks
+
+
+@dataclass(frozen=True)
+class Food:
+    name: str
+    duration: float # Seconds of right-click hold needed to eat it
+    hunger: float = None # Hunger points restored (optional)
+    saturation: float = None # Saturation restored (optional)
+
+
+DEFAULT_FOODS = {
+    "Most Foods": Food("Most Foods", 1.61),
+    "Kelp": Food("Kelp", 0.865, hunger=1, saturation=0.6),
+}
+
+
+class CatalogSnapshot:
+    """Immutable view of one version of foods.json."""
+
+    def __init__(self, foods, stamp=None):
+        self.foods = MappingProxyType(dict(foods))
+        self.names = tuple(self.foods)
+        self.stamp = stamp # (mtime_ns, size) of the file this was loaded from
+
+    def __contains__(self, name):
+        return name in self.foods
+
+    def __len__(self):
+        return len(self.foods)
+
+    def get(self, name):
+        return self.foods.get(name)
+
+    def duration(self, name):
+        return self.foods[name].duration
+
+
+def _optional_number(entry, key, name):
+    """entry[key] as a float, None if absent. Raises ValueError if it isn't a number."""
+    value = entry.get(key)
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"food '{name}' has a non-numeric {key}: {value!r}")
+    return float(value)
+
+
+def parse_foods(data):
+    """Converts decoded foods.json (version 1 or 2) into {name: Food}. Raises ValueError if invalid."""
+    if not isinstance(data, dict):
+        raise ValueError("foods.json must contain an object")
+    if "version" not in data:
+        entries = {name: {"duration": value} for name, value in data.items()} # Version 1
+    elif data["version"] == SCHEMA_VERSION:
+        entries = data.get("foods", {})
+    else:
+        raise ValueError(f"unsupported foods.json version {data['version']}")
+
+    foods = {}
+    for name, entry in entries.items():
+        if not isinstance(entry, dict):
+            raise ValueError(f"food '{name}' must be an object")
+        try:
+            duration = float(entry["duration"])
+        except (KeyError, TypeError, ValueError):
+            raise ValueError(f"food '{name}' needs a numeric duration")
+        if duration <= 0:
+            raise ValueError(f"food '{name}' must have a positive duration")
+        foods[name] = Food(name, duration, _optional_number(entry, "hunger", name),
+                           _optional_number(entry, "saturation", name))
+    return foods
+
+
+def foods_to_json(foods):
+    """Serializes {name: Food} in the current schema."""
+    entries = {}
+    for food in foods.values():
+        entry = {"duration": food.duration}
+        if food.hunger is not None:
+            entry["hunger"] = food.hunger
+        if food.saturation is not None:
+            entry["saturation"] = food.saturation
+        entries[food.name] = entry
+    return {"version": SCHEMA_VERSION, "foods": entries}
+
+
+class FoodCatalog:
+    def __init__(self, path, on_change=None):
+        self.path = path
+        self.on_change = on_change # Called with the new snapshot from the watcher thread
+        self.snapshot = CatalogSnapshot(DEFAULT_FOODS)
+        self._timer = None
+        self._watching = False
+
+    def _stat(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def load(self):
+        """
+        Initial load. A missing or unparsable file is (re)written with the defaults like the old
+        load_food_data; a file that parses but fails validation is left alone for the user to fix.
+        """
+        stamp = self._stat()
+        if stamp is None:
+            print(f"'{self.path}' not found. Creating with default foods.")
+            self._save_defaults()
+            self.snapshot = CatalogSnapshot(DEFAULT_FOODS, self._stat())
+            return self.snapshot
+        try:
+            with open(self.path, 'r') as f:
+                foods = parse_foods(json.load(f))
+            self.snapshot = CatalogSnapshot(foods, stamp)
+            print(f"Loaded food data from {self.path}")
+        except json.JSONDecodeError as e:
+            print(f"Error decoding {self.path}: {e}. Using default foods.")
+            self._save_defaults() # Attempt to save defaults if file was corrupt
+            self.snapshot = CatalogSnapshot(DEFAULT_FOODS, self._stat())
+        except ValueError as e:
+            # Valid JSON with a bad field: don't overwrite the user's other foods
+            print(f"Invalid {self.path}: {e}. Using default foods until it is fixed.")
+            self.snapshot = CatalogSnapshot(DEFAULT_FOODS, stamp) # The watcher reloads it once edited
+        except Exception as e:
+            print(f"Error loading {self.path}: {e}. Using default foods.")
+            self.snapshot = CatalogSnapshot(DEFAULT_FOODS, stamp)
+        return self.snapshot
+
+    def _save_defaults(self):
+        try:
+            with open(self.path, 'w') as f:
+                json.dump(foods_to_json(DEFAULT_FOODS), f, indent=4)
+            print(f"Saved default food data to {self.path}")
+        except Exception as e:
+            print(f"Error saving default food data to {self.path}: {e}")
+
+    def check_for_changes(self):
+        """Re-reads the file if its mtime/size changed. Keeps the current snapshot if the new file is invalid."""
+        stamp = self._stat()
+        if stamp is None or stamp == self.snapshot.stamp:
+            return False
+        try:
+            with open(self.path, 'r') as f:
+                foods = parse_foods(json.load(f))
+        except (OSError, json.JSONDecodeError, ValueError) as e:
+            print(f"Ignoring invalid {self.path} ({e}); keeping the previous food list.")
+            # Remember the stamp so the same broken file isn't re-parsed every tick
+            self.snapshot = CatalogSnapshot(self.snapshot.foods, stamp)
+            return False
+        self.snapshot = CatalogSnapshot(foods, stamp) # Atomic swap
+        print(f"Reloaded food data from {self.path} ({len(foods)} foods)")
+        if self.on_change is not None:
+            self.on_change(self.snapshot)
+        return True
+
+    # --- Background watcher ---
+    def start_watching(self, interval=WATCH_INTERVAL):
+        self._watching = True
+        self._schedule(interval)
+
+    def stop_watching(self):
+        self._watching = False
+        if self._timer is not None:
+            self._timer.cancel()
+
+    def _schedule(self, interval):
+        if not self._watching:
+            return
+        self._timer = threading.Timer(interval, self._tick, args=(interval,))
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _tick(self, interval):
+        try:
+            self.check_for_changes()
+        except Exception as e:
+            print(f"Error checking {self.path}: {e}")
+        self._schedule(interval)
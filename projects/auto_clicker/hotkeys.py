@@ -0,0 +1,111 @@
+import time
+
+from pynput import keyboard
+
+# --- Global Hotkey Matcher ---
+# The pynput listener calls on_press for every key pressed anywhere on the system, so
+# the common case (a key that isn't bound) must be as cheap as possible. Bindings are
+# compiled into a dict keyed by the canonical trigger key (the non-modifier key of the
+# chord); an unbound key is one dict lookup and a return. Modifier state is tracked
+# from press/release events, so chords like "<ctrl>+<f12>" work.
+#
+# Hotkey strings use pynput's keyboard.HotKey.parse() format: "<f6>", "<ctrl>+<shift>+a".
+# Both the bindings and the pressed keys go through the listener's canonical(), which turns
+# special keys like Esc and the F-keys into KeyCodes built from their vk; comparisons with
+# keyboard.Key members must canonicalize those too.
+
+MODIFIER_KEYS = frozenset({
+    keyboard.Key.ctrl, keyboard.Key.shift, keyboard.Key.alt, keyboard.Key.alt_gr, keyboard.Key.cmd,
+})
+
+# vk -> keyboard.Key name, to write canonical special keys back as "<f9>" rather than "<65478>"
+_KEY_NAMES = {}
+for _member in keyboard.Key:
+    if _member.value.vk is not None:
+        _KEY_NAMES.setdefault(_member.value.vk, _member.name)
+
+
+def format_hotkey(keys):
+    """Builds a HotKey.parse() string from canonical keys (modifiers first)."""
+    parts = []
+    for key in sorted(keys, key=lambda k: k not in MODIFIER_KEYS):
+        if isinstance(key, keyboard.Key):
+            parts.append(f"<{key.name}>")
+        elif getattr(key, "char", None):
+            parts.append(key.char)
+        else:
+            parts.append(f"<{_KEY_NAMES.get(key.vk, key.vk)}>")
+    return "+".join(parts)
+
+
+def hotkey_display_name(hotkey):
+    """User-friendly text for a hotkey string, e.g. "<ctrl>+<f12>" -> "Ctrl+F12"."""
+    names = []
+    for part in hotkey.split("+"):
+        name = part.strip("<>") if part.startswith("<") else part
+        names.append(name.upper() if len(name) <= 3 else name.capitalize())
+    return "+".join(names)
+
+
+class HotkeyMatcher:
+    def __init__(self, on_action):
+        self.on_action = on_action # Called as on_action(action_name, event_time) on the listener thread
+        self.bindings = {} # action name -> hotkey string
+        # Created now (not started) so bindings can be canonicalized before start()
+        self.listener = keyboard.Listener(on_press=self.on_press, on_release=self.on_release)
+        self.listener.daemon = True
+        self._esc = self.listener.canonical(keyboard.Key.esc)
+        self._table = {} # canonical trigger key -> {frozenset(modifiers): action name}
+        self._held_modifiers = set()
+        self._capture_callback = None
+
+    # --- Bindings ---
+    def bind(self, action, hotkey):
+        """Binds a hotkey string to an action name (replacing its old hotkey). Raises ValueError if invalid."""
+        keyboard.HotKey.parse(hotkey) # Validate before changing anything
+        self.bindings[action] = hotkey
+        self._compile()
+
+    def _compile(self):
+        table = {}
+        for action, hotkey in self.bindings.items():
+            keys = [self.listener.canonical(k) for k in keyboard.HotKey.parse(hotkey)]
+            modifiers = frozenset(k for k in keys if k in MODIFIER_KEYS)
+            triggers = [k for k in keys if k not in MODIFIER_KEYS]
+            if len(triggers) != 1:
+                print(f"Ignoring hotkey '{hotkey}' for {action}: needs exactly one non-modifier key.")
+                continue
+            table.setdefault(triggers[0], {})[modifiers] = action
+        self._table = table # Swapped in one assignment; the listener never sees a partial table
+
+    # --- Capturing a new hotkey ("Set Hotkey" button) ---
+    def capture_next(self, callback):
+        """The next chord pressed is passed to callback(hotkey_string) instead of being matched; Esc passes None."""
+        self._capture_callback = callback
+
+    # --- Listener ---
+    def start(self):
+        self.listener.start()
+        return self.listener
+
+    def on_press(self, key):
+        event_time = time.perf_counter()
+        key = self.listener.canonical(key)
+        if key in MODIFIER_KEYS:
+            self._held_modifiers.add(key)
+            return
+
+        if self._capture_callback is not None:
+            callback, self._capture_callback = self._capture_callback, None
+            callback(None if key == self._esc else format_hotkey(self._held_modifiers | {key}))
+            return
+
+        chords = self._table.get(key)
+        if chords is None:
+            return # Unbound key: the common case
+        action = chords.get(frozenset(self._held_modifiers))
+        if action is not None:
+            self.on_action(action, event_time)
+
+    def on_release(self, key):
+        self._held_modifiers.discard(self.listener.canonical(key))
@@ -0,0 +1,105 @@
+# --- Hunger Planner ---
+# Models Minecraft: Java Edition hunger so auto-eat only eats when needed instead of on a
+# blind fixed interval. Every eat costs clicking time (the click stream pauses for the
+# hold), so fewer eats means more clicks.
+#
+# Game rules used (Java Edition):
+#   - Food level is 0-20; saturation is 0..food level and is drained first.
+#   - Actions add exhaustion; every 4.0 exhaustion removes 1 saturation, or 1 food
+#     point once saturation is empty.
+#   - Attacking (a left click on a mob) adds 0.1 exhaustion. Clicks that hit nothing cost
+#     nothing, so only `hit_ratio` of the left clicks count as attacks.
+# Other activity (walking, swimming, regenerating health) is approximated by a constant
+# exhaustion rate per second.
+
+MAX_FOOD = 20
+START_SATURATION = 5.0 # A freshly spawned / full player
+EXHAUSTION_PER_POINT = 4.0
+EXHAUSTION_PER_ATTACK = 0.1
+DEFAULT_HIT_RATIO = 0.1 # Share of left clicks that land on a mob (a farm spawns far slower than 10 CPS)
+DEFAULT_THRESHOLD = 14 # Eat when the food level drops to this (natural regen stops below 18, sprinting at 6)
+DEFAULT_ACTIVITY_RATE = 0.005 # Extra exhaustion per second from everything except attacking
+DEFAULT_RESTORE = (6, 7.2) # Hunger/saturation assumed for foods without metadata in foods.json
+MAX_CHECK_INTERVAL = 30.0 # Re-plan at least this often (the click rate can change)
+
+
+class HungerPlanner:
+    def __init__(self, threshold=DEFAULT_THRESHOLD, activity_rate=DEFAULT_ACTIVITY_RATE, hit_ratio=DEFAULT_HIT_RATIO):
+        self.threshold = threshold
+        self.activity_rate = activity_rate
+        self.hit_ratio = hit_ratio
+        self.reset()
+
+    def reset(self):
+        """Assumes a full player (e.g. when planning is switched on)."""
+        self.food_level = float(MAX_FOOD)
+        self.saturation = START_SATURATION
+        self.exhaustion = 0.0
+        self.eats = 0
+        self.eat_time = 0.0 # Seconds of clicking spent holding food
+        self.clicking_time = 0.0 # Seconds the clicker has been running while planning
+
+    def advance(self, elapsed, attacks):
+        """Applies `elapsed` seconds of clicking that included `attacks` left clicks."""
+        self.clicking_time += elapsed
+        self.exhaustion += attacks * self.hit_ratio * EXHAUSTION_PER_ATTACK + elapsed * self.activity_rate
+        while self.exhaustion >= EXHAUSTION_PER_POINT:
+            self.exhaustion -= EXHAUSTION_PER_POINT
+            if self.saturation > 0:
+                self.saturation = max(0.0, self.saturation - 1)
+            else:
+                self.food_level = max(0.0, self.food_level - 1)
+
+    def needs_food(self):
+        return self.food_level <= self.threshold
+
+    def on_eat(self, duration, hunger=None, saturation=None):
+        """Applies one eaten food; unknown restore values fall back to DEFAULT_RESTORE."""
+        if hunger is None or saturation is None:
+            hunger, saturation = DEFAULT_RESTORE
+        self.food_level = min(MAX_FOOD, self.food_level + hunger)
+        self.saturation = min(self.food_level, self.saturation + saturation)
+        self.eats += 1
+        self.eat_time += duration
+
+    def seconds_until_needed(self, attack_rate):
+        """
+        Predicted seconds until the food level reaches the threshold at `attack_rate`
+        left clicks per second, or None if nothing drains hunger.
+        """
+        drain_rate = attack_rate * self.hit_ratio * EXHAUSTION_PER_ATTACK + self.activity_rate # Exhaustion/sec
+        if drain_rate <= 0:
+            return None
+        points_left = self.saturation + max(0.0, self.food_level - self.threshold)
+        exhaustion_left = points_left * EXHAUSTION_PER_POINT - self.exhaustion
+        return max(0.0, exhaustion_left / drain_rate)
+
+    def next_check_delay(self, attack_rate):
+        """How long the scheduler should wait before asking again."""
+        remaining = self.seconds_until_needed(attack_rate)
+        if remaining is None:
+            return MAX_CHECK_INTERVAL
+        return min(MAX_CHECK_INTERVAL, remaining)
+
+    def savings(self, fixed_interval, eat_duration):
+        """
+        Compares with fixed-interval eating over the same clicking time. The old
+        auto_eat_loop ate right away and then every `fixed_interval` seconds.
+        Returns (fixed_eats, planned_eats, clicking_seconds_recovered); the last is negative
+        when the model needed more eats than the fixed interval gave.
+        """
+        if not fixed_interval or self.clicking_time <= 0:
+            return 0, self.eats, 0.0
+        fixed_eats = int(self.clicking_time // fixed_interval) + 1
+        recovered = fixed_eats * eat_duration - self.eat_time
+        return fixed_eats, self.eats, recovered
+
+    def summary(self, fixed_interval, eat_duration):
+        fixed_eats, planned_eats, recovered = self.savings(fixed_interval, eat_duration)
+        if recovered >= 0:
+            outcome = f"{recovered:.2f}s of clicking recovered"
+        else:
+            outcome = f"{-recovered:.2f}s of extra eating time (the model needs more food than the fixed interval gives)"
+        return (f"Hunger planner: {planned_eats} eats vs {fixed_eats} on a fixed interval over "
+                f"{self.clicking_time / 60:.1f} min of clicking at a {self.hit_ratio:.0%} hit ratio; {outcome} "
+                f"(food {self.food_level:.0f}/20, saturation {self.saturation:.1f})")
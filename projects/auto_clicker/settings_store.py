@@ -0,0 +1,128 @@
+import copy
+import json
+import os
+import tempfile
+import threading
+
+# --- Settings Store ---
+# Persists the full engine config (interval, mouse button, hotkeys, eating options) so
+# the app starts where it left off. Loading is one small read before the window is
+# built; saving is debounced (many quick edits -> one write) and atomic (write a temp
+# file in the same directory, then os.replace), so a crash never leaves a torn file.
+
+SETTINGS_VERSION = 1
+SAVE_DEBOUNCE = 0.5 # Seconds to wait for more changes before writing
+
+DEFAULT_SETTINGS = {
+    "version": SETTINGS_VERSION,
+    "interval": {"hours": "0", "mins": "0", "secs": "0", "ms": "100"},
+    "mouse_button": "Left",
+    "hotkeys": {
+        "toggle_click": "<f6>",
+        "toggle_eat": "<f7>",
+        "panic_stop": "<ctrl>+<f12>",
+        "cycle_preset": "<f8>",
+    },
+    "food": None, # Selected food name (None = first in foods.json)
+    "eat_interval": "10", # Minutes, as typed
+    "auto_eat": False,
+    "smart_eat": False,
+    "hit_percent": "10", # Percent of left clicks that hit a mob (hunger planner), as typed
+    "presets": {}, # name -> {"interval", "mouse_button", "food", "eat_interval", "auto_eat", "smart_eat", "hit_percent"}
+    "active_preset": None,
+}
+
+
+def merge_defaults(defaults, loaded):
+    """
+    Returns defaults overlaid with loaded values, recursing into dicts. A value whose type
+    doesn't match its default's falls back to the default (per key, with a message); keys
+    without a default (e.g. preset names) are kept as loaded.
+    """
+    merged = copy.deepcopy(defaults)
+    for key, value in loaded.items():
+        if key not in merged:
+            merged[key] = value
+            continue
+        default = merged[key]
+        if isinstance(default, dict) and isinstance(value, dict):
+            merged[key] = merge_defaults(default, value)
+        elif default is None and isinstance(value, (str, type(None))):
+            merged[key] = value # None defaults stand for "no name selected"
+        elif default is not None and isinstance(value, type(default)):
+            merged[key] = value
+        else:
+            print(f"Ignoring invalid setting {key!r}: {value!r}. Using the default.")
+    return merged
+
+
+class SettingsStore:
+    def __init__(self, path, defaults=DEFAULT_SETTINGS):
+        self.path = path
+        self.defaults = defaults
+        self.data = copy.deepcopy(defaults)
+        self._lock = threading.Lock()
+        self._timer = None
+
+    def load(self):
+        """Reads the settings file once; missing, corrupt or newer-version files fall back to defaults."""
+        try:
+            with open(self.path, 'r') as f:
+                loaded = json.load(f)
+        except FileNotFoundError:
+            return self.data
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Error reading {self.path}: {e}. Using default settings.")
+            return self.data
+        version = loaded.get("version", 0) if isinstance(loaded, dict) else None
+        if not isinstance(version, int) or version > SETTINGS_VERSION:
+            print(f"Ignoring {self.path}: unsupported settings version.")
+            return self.data
+        self.data = merge_defaults(self.defaults, loaded)
+        self.data["version"] = SETTINGS_VERSION
+        return self.data
+
+    def get(self, key):
+        return self.data[key]
+
+    def update(self, key, value):
+        """Changes one top-level setting and schedules a debounced save (any thread)."""
+        with self._lock:
+            if self.data.get(key) == value:
+                return
+            self.data[key] = copy.deepcopy(value)
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(SAVE_DEBOUNCE, self.save)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def save(self):
+        """Writes the settings atomically (temp file + rename)."""
+        with self._lock:
+            self._timer = None
+            payload = json.dumps(self.data, indent=4)
+        directory = os.path.dirname(self.path) or "."
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(prefix=".settings-", suffix=".tmp", dir=directory)
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    f.write(payload)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            print(f"Error saving settings to {self.path}: {e}")
+
+    def flush(self):
+        """Writes any pending change now (e.g. on exit)."""
+        with self._lock:
+            pending = self._timer is not None
+            if pending:
+                self._timer.cancel()
+        if pending:
+            self.save()
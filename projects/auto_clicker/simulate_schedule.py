@@ -0,0 +1,88 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) # projects/, for automation_core
+from automation_core.clock import VirtualClock
+from click_scheduler import ClickScheduler
+from hunger_planner import DEFAULT_HIT_RATIO, HungerPlanner
+
+# --- Schedule Simulation ---
+# Runs the real ClickScheduler on a VirtualClock with a mouse that only counts calls, so
+# hours of clicking and auto-eating finish in seconds. The wall time it takes is the
+# scheduling overhead alone (no sleeping), reported per timer event.
+#
+# Usage:
+#   python simulate_schedule.py --hours 4 --interval 0.1 --eat-every 10
+#   python simulate_schedule.py --hours 4 --smart     # hunger planner instead of a fixed interval
+#   python simulate_schedule.py --hours 4 --smart --hit-ratio 0.25
+
+
+class CountingMouse:
+    """
+    Mouse controller stand-in: records calls instead of moving the real mouse, and calls
+    on_end() (from the scheduler thread) once the clock passes end_time.
+    """
+
+    def __init__(self, clock, end_time, on_end):
+        self.clock = clock
+        self.end_time = end_time
+        self.on_end = on_end
+        self.clicks = 0
+        self.presses = 0
+        self.releases = 0
+
+    def _check_end(self):
+        if self.clock.now() >= self.end_time:
+            self.on_end()
+
+    def click(self, button, count=1):
+        self.clicks += count
+        self._check_end()
+
+    def press(self, button):
+        self.presses += 1
+
+    def release(self, button):
+        self.releases += 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate a clicking/auto-eat session on virtual time.")
+    parser.add_argument("--hours", type=float, default=1.0, help="Simulated session length")
+    parser.add_argument("--interval", type=float, default=0.1, help="Click interval in seconds")
+    parser.add_argument("--eat-every", type=float, default=10.0, help="Auto-eat interval in minutes")
+    parser.add_argument("--food-duration", type=float, default=1.61, help="Eat hold in seconds")
+    parser.add_argument("--smart", action="store_true", help="Eat only when the hunger planner says so")
+    parser.add_argument("--hit-ratio", type=float, default=DEFAULT_HIT_RATIO,
+                        help="Share of left clicks that hit a mob (hunger planner)")
+    args = parser.parse_args()
+
+    clock = VirtualClock()
+    fake_mouse = CountingMouse(clock, args.hours * 3600, on_end=lambda: scheduler.shutdown())
+    scheduler = ClickScheduler(fake_mouse, clock=clock)
+    scheduler.set_interval(args.interval)
+    scheduler.set_food("Simulated Food", args.food_duration)
+    if args.smart:
+        scheduler.set_planner(HungerPlanner(hit_ratio=args.hit_ratio))
+    scheduler.set_auto_eat(args.eat_every * 60)
+    scheduler.start_clicking()
+
+    wall_start = time.perf_counter()
+    scheduler.start()
+    scheduler.join() # Returns once the first click past the end has shut it down
+    wall = time.perf_counter() - wall_start
+
+    s = scheduler.stats()
+    print(f"Simulated {clock.now() / 3600:.2f}h in {wall:.3f}s wall ({clock.now() / wall:,.0f}x real time)")
+    print(f"Clicks: {s['clicks']} | Eats: {s['eats']} | Click slots lost to eating: {s['clicks_deferred']} "
+          f"({s['click_loss_pct']:.2f}%) | Right button presses/releases: {fake_mouse.presses}/{fake_mouse.releases}")
+    print(f"Timer events: {scheduler.timer_events} | Clock jumps: {clock.advances} | "
+          f"Scheduling overhead: {wall / max(1, scheduler.timer_events) * 1e6:.2f}us per event")
+    if args.smart:
+        print(scheduler.planner.summary(args.eat_every * 60, args.food_duration))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import unittest
+
+# Run from projects/auto_clicker: python -m unittest test_hotkeys
+# pynput needs a working backend (an X display on Linux); without one these tests skip.
+try:
+    from pynput import keyboard
+    import hotkeys
+except ImportError as e:
+    keyboard = None
+    SKIP_REASON = f"pynput unavailable: {e}"
+else:
+    SKIP_REASON = "pynput backend without real key codes"
+
+
+def usable_backend():
+    # The dummy backend gives every special key vk 0, so Esc and F9 would be the same key
+    return keyboard is not None and keyboard.Key.esc.value.vk != keyboard.Key.f9.value.vk
+
+
+@unittest.skipUnless(usable_backend(), SKIP_REASON)
+class HotkeyMatcherTest(unittest.TestCase):
+    def setUp(self):
+        self.actions = []
+        self.matcher = hotkeys.HotkeyMatcher(lambda action, event_time: self.actions.append(action))
+
+    def capture(self, *keys):
+        """Presses keys after "Set Hotkey" and returns what the capture callback got."""
+        captured = []
+        self.matcher.capture_next(captured.append)
+        for key in keys:
+            self.matcher.on_press(key)
+        return captured
+
+    def test_esc_cancels_capture(self):
+        self.assertEqual(self.capture(keyboard.Key.esc), [None])
+        self.assertEqual(self.matcher.bindings, {})
+
+    def test_f_key_is_captured_by_name(self):
+        self.assertEqual(self.capture(keyboard.Key.f9), ["<f9>"])
+        self.assertEqual(hotkeys.hotkey_display_name("<f9>"), "F9")
+
+    def test_canonical_f_keys_format_by_name(self):
+        for key in (keyboard.Key.f1, keyboard.Key.f6, keyboard.Key.f12):
+            canonical = self.matcher.listener.canonical(key)
+            self.assertEqual(hotkeys.format_hotkey({canonical}), f"<{key.name}>")
+            keyboard.HotKey.parse(hotkeys.format_hotkey({canonical})) # Parses back
+
+    def test_chord_is_captured_with_modifiers_first(self):
+        self.assertEqual(self.capture(keyboard.Key.ctrl_l, keyboard.Key.f12), ["<ctrl>+<f12>"])
+
+    def test_bound_f_key_fires(self):
+        self.matcher.bind("toggle_click", "<f6>")
+        self.matcher.on_press(keyboard.Key.f6)
+        self.assertEqual(self.actions, ["toggle_click"])
+
+    def test_chord_needs_its_modifiers(self):
+        self.matcher.bind("panic_stop", "<ctrl>+<f12>")
+        self.matcher.on_press(keyboard.Key.f12)
+        self.assertEqual(self.actions, [])
+        self.matcher.on_press(keyboard.Key.ctrl_r)
+        self.matcher.on_press(keyboard.Key.f12)
+        self.assertEqual(self.actions, ["panic_stop"])
+
+    def test_esc_can_still_be_bound_outside_capture(self):
+        self.matcher.bind("panic_stop", "<esc>")
+        self.matcher.on_press(keyboard.Key.esc)
+        self.assertEqual(self.actions, ["panic_stop"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,3 @@
+# Shared building blocks for the automation tools in projects/ (auto_clicker,
+# minecraft_fishing_automation). The tools are run as scripts from their own folders,
+# so each entry script puts projects/ on sys.path before importing from here.
@@ -0,0 +1,160 @@
+import argparse
+import ctypes
+import json
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) # projects/
+from automation_core import x11
+from automation_core.capture import DamageCapture, MssCapture
+from automation_core.detection import calculate_monitor_region
+
+# --- Capture Benchmarks ---
+# Compares polling mss grabs with change-driven DamageCapture (XDamage + MIT-SHM) on the
+# fisher's region, on a static screen and with the region repainted --change-hz times a
+# second by a helper process. For each: grab() calls, frames actually read, and this
+# process's CPU time (the X server's own work isn't included). --check verifies that
+# DamageCapture returns the same pixels as mss and skips reads when nothing changed.
+#
+# Needs an X server; a virtual one is enough:
+#   xvfb-run -s "-screen 0 1920x1080x24" python bench_capture.py --check
+#   xvfb-run -s "-screen 0 1920x1080x24" python bench_capture.py --fps 30 --seconds 5 --json capture.json
+
+
+def _painter_lib():
+    x11_lib, = x11.libs("X11")
+    dpy, ulong, int_ = ctypes.c_void_p, ctypes.c_ulong, ctypes.c_int
+    x11._signatures(x11_lib, [
+        ("XDefaultGC", ctypes.c_void_p, [dpy, int_]),
+        ("XSetForeground", int_, [dpy, ctypes.c_void_p, ulong]),
+        ("XFillRectangle", int_, [dpy, ulong, ctypes.c_void_p, int_, int_, ctypes.c_uint, ctypes.c_uint]),
+    ])
+    return x11_lib
+
+
+def fill(display, region, color):
+    """Paints the region on the root window (visible when no window covers it)."""
+    lib = _painter_lib()
+    gc = lib.XDefaultGC(display.ptr, display.screen)
+    lib.XSetForeground(display.ptr, gc, color)
+    lib.XFillRectangle(display.ptr, display.root, gc, region['left'], region['top'], region['width'], region['height'])
+    display.sync()
+
+
+def paint_loop(region, hz):
+    """Helper process: repaints the region `hz` times a second until killed."""
+    display = x11.Display()
+    color = 0
+    next_paint = time.monotonic()
+    while True:
+        color = (color + 0x010101) & 0xFFFFFF
+        fill(display, region, color)
+        next_paint += 1 / hz
+        time.sleep(max(0.0, next_paint - time.monotonic()))
+
+
+def run(capture, region, fps, seconds):
+    """Calls grab() `fps` times a second (0 = as fast as possible) for `seconds`."""
+    calls = frames = 0
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    next_call = wall_start
+    while time.perf_counter() - wall_start < seconds:
+        frame = capture.grab(region)
+        calls += 1
+        frames += frame is not None
+        if fps:
+            next_call += 1 / fps
+            delay = next_call - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    return {"calls": calls, "frames_read": frames, "calls_per_s": round(calls / wall, 1),
+            "frames_per_s": round(frames / wall, 1), "cpu_ms_per_s": round(cpu / wall * 1000, 2),
+            "cpu_us_per_call": round(cpu / calls * 1e6, 1)}
+
+
+def check(region):
+    display = x11.Display()
+    damage = DamageCapture()
+    mss_capture = MssCapture()
+    try:
+        fill(display, region, 0xB52423) # X pixel 0xRRGGBB: (181, 36, 35), BGRA (35, 36, 181) in memory
+        time.sleep(0.05)
+        first = damage.grab(region)
+        reference = mss_capture.grab(region)
+        assert first is not None, "first grab must read pixels"
+        assert np.array_equal(first[:, :, :3], reference[:, :, :3]), "DamageCapture and mss disagree"
+        assert tuple(first[0, 0, :3]) == (35, 36, 181), f"unexpected pixel {first[0, 0]}"
+        assert damage.grab(region) is None, "unchanged region was read again"
+        fill(display, region, 0x00FF00)
+        assert damage.wait(region, 1.0), "no damage report after repainting the region"
+        second = damage.grab(region)
+        assert second is not None and tuple(second[0, 0, :3]) == (0, 255, 0), "repaint not picked up"
+        outside = {'left': 0, 'top': 0, 'width': 8, 'height': 8}
+        if region['left'] > 8 and region['top'] > 8:
+            fill(display, outside, 0x0000FF)
+            time.sleep(0.05)
+            assert damage.grab(region) is None, "damage outside the region triggered a read"
+        print("check passed: identical pixels to mss, no reads without damage, repaints picked up")
+    finally:
+        damage.close()
+        mss_capture.close()
+        display.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark polling (mss) vs change-driven (XDamage/XShm) capture.")
+    parser.add_argument("--fps", type=float, default=30.0, help="grab() calls per second (0 = unthrottled)")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--change-hz", type=float, default=10.0, help="Region repaints per second in the 'changing' run")
+    parser.add_argument("--screen", default="1920x1080", help="Screen size the fisher's 15%% region is taken from")
+    parser.add_argument("--check", action="store_true", help="Verify DamageCapture against mss and exit")
+    parser.add_argument("--json", metavar="PATH")
+    parser.add_argument("--paint", type=float, help=argparse.SUPPRESS) # Helper process mode
+    args = parser.parse_args()
+    width, height = map(int, args.screen.split("x"))
+    region = calculate_monitor_region(width, height)
+
+    if args.paint:
+        paint_loop(region, args.paint)
+        return
+    if args.check:
+        check(region)
+        return
+
+    results = {}
+    for scenario in ("static", "changing"):
+        painter = None
+        if scenario == "changing":
+            painter = subprocess.Popen([sys.executable, os.path.abspath(__file__), "--screen", args.screen,
+                                        "--paint", str(args.change_hz)])
+            time.sleep(0.3)
+        try:
+            for backend in (MssCapture, DamageCapture):
+                capture = backend()
+                try:
+                    results[f"{backend.name}/{scenario}"] = run(capture, region, args.fps, args.seconds)
+                finally:
+                    capture.close()
+        finally:
+            if painter is not None:
+                painter.kill()
+                painter.wait()
+
+    print(f"Region {region['width']}x{region['height']}, {args.fps:g} grab() calls/s, {args.seconds:g}s each, "
+          f"'changing' repaints at {args.change_hz:g}Hz")
+    print(f"{'backend/screen':<18} {'calls/s':>8} {'frames/s':>9} {'CPU ms/s':>9} {'CPU us/call':>12}")
+    for name, r in results.items():
+        print(f"{name:<18} {r['calls_per_s']:>8} {r['frames_per_s']:>9} {r['cpu_ms_per_s']:>9} {r['cpu_us_per_call']:>12}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"region": region, "fps": args.fps, "change_hz": args.change_hz, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
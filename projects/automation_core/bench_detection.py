@@ -0,0 +1,85 @@
+import argparse
+import itertools
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) # projects/
+from automation_core.detection import find_target_pixel, monitor_region
+
+# --- Detection Benchmarks ---
+# Times the shared detection kernels against the find_target_pixel the fishing bot used
+# before (kept below as the reference) on synthetic BGRA frames, after checking that both
+# return the same rows. Run from anywhere:  python bench_detection.py [--repeat 7]
+
+TARGET_COLOR = (181, 36, 35)
+TOLERANCE = 20
+SIZES = {"fisher region (288x162)": (162, 288), "full HD (1920x1080)": (1080, 1920)}
+
+
+def reference_find_target_pixel(image_np, target_color, tolerance=20):
+    """The previous implementation: six full-frame compares, then np.where() of every match."""
+    target_rgb = np.array(target_color, dtype=np.uint8)
+    lower_bound = np.clip(target_rgb - tolerance, 0, 255)
+    upper_bound = np.clip(target_rgb + tolerance, 0, 255)
+    in_range = np.logical_and.reduce((
+        image_np[:, :, 0] >= lower_bound[2], image_np[:, :, 0] <= upper_bound[2],
+        image_np[:, :, 1] >= lower_bound[1], image_np[:, :, 1] <= upper_bound[1],
+        image_np[:, :, 2] >= lower_bound[0], image_np[:, :, 2] <= upper_bound[0],
+    ))
+    matches = np.where(in_range)
+    return matches[0][0] if matches[0].size > 0 else None
+
+
+def make_frames(height, width, rng):
+    """Synthetic frames: dark water, a bobber, and a frame with lots of red that doesn't match."""
+    water = rng.integers(0, 64, (height, width, 4), dtype=np.uint8)
+    water[:, :, 3] = 255
+    bobber = water.copy()
+    bobber[height // 2, width // 2] = (35, 36, 181, 255) # BGRA
+    reddish = water.copy()
+    reddish[: height // 4, :, 2] = 190 # Red enough, but green/blue are random
+    reddish[height // 3, 5] = (40, 30, 170, 255)
+    return {"no target": water, "bobber": bobber, "many red candidates": reddish}
+
+
+def best_of(func, repeat):
+    number = 200
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1e6 # us per call
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark automation_core.detection.")
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+    rng = np.random.default_rng(0)
+
+    print(f"{'frame':<26} {'case':<21} {'reference us':>13} {'shared us':>10} {'speedup':>8}")
+    for size_name, (height, width) in SIZES.items():
+        for case, frame in make_frames(height, width, rng).items():
+            expected = reference_find_target_pixel(frame, TARGET_COLOR, TOLERANCE)
+            actual = find_target_pixel(frame, TARGET_COLOR, TOLERANCE)
+            assert actual == expected, f"{size_name}/{case}: {actual} != {expected}"
+            ref = best_of(lambda: reference_find_target_pixel(frame, TARGET_COLOR, TOLERANCE), args.repeat)
+            new = best_of(lambda: find_target_pixel(frame, TARGET_COLOR, TOLERANCE), args.repeat)
+            print(f"{size_name:<26} {case:<21} {ref:>13.1f} {new:>10.1f} {ref / new:>7.1f}x")
+
+    # Streaming loop overhead: in-memory frames with the bobber bouncing, no sleeping
+    height, width = SIZES["fisher region (288x162)"]
+    frames = []
+    for y in (40, 40, 48, 40):
+        frame = np.zeros((height, width, 4), dtype=np.uint8)
+        frame[y, width // 2] = (35, 36, 181, 255)
+        frames.append(frame)
+    source = itertools.cycle(frames)
+    events = monitor_region(None, TARGET_COLOR, TOLERANCE, interval=0, grab=lambda region: next(source))
+    count = 10000
+    seconds = timeit.timeit(lambda: next(events), number=count)
+    events.close()
+    print(f"monitor_region: {seconds / count * 1e6:.1f}us per movement event (2 events per 4 frames)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+import sys
+
+import numpy as np
+
+# --- Screen Capture Backends ---
+# Both backends have grab(region) -> BGRA NumPy array (height, width, 4), and close().
+#   - MssCapture: mss, every platform; grabs the region on every call (polling).
+#   - DamageCapture: X11 only. It subscribes to DAMAGE reports for the screen and reads
+#     pixels through a persistent MIT-SHM segment, and only when a report touched the
+#     region since the last read. Otherwise grab() returns None ("unchanged") after
+#     checking the event queue, which costs no round trip to the X server.
+# open_capture("auto") uses DamageCapture where it works (a local X server with both
+# extensions) and mss everywhere else; the reason for a fallback is returned with it.
+# A backend belongs to the thread that created it (both mss and Xlib handles are per-thread).
+
+
+class MssCapture:
+    name = "mss"
+
+    def __init__(self):
+        import mss
+        self._sct = mss.mss()
+        self.grabs = 0
+
+    def grab(self, region):
+        self.grabs += 1
+        return np.array(self._sct.grab(region))
+
+    def close(self):
+        self._sct.close()
+
+
+class DamageCapture:
+    name = "damage"
+
+    def __init__(self, display=None):
+        from automation_core import x11
+        self._x11 = x11
+        self.display = x11.Display(display)
+        try:
+            self.watcher = x11.DamageWatcher(self.display, self.display.root)
+        except OSError:
+            self.display.close()
+            raise
+        self.image = None # ShmImage, (re)created for the region's size
+        self.region = None
+        self.dirty = True # Nothing read yet
+        self.grabs = 0 # Frames actually read from the server
+        self.unchanged = 0 # grab() calls answered without reading pixels
+        self.damage_events = 0
+
+    def _process_events(self, region):
+        seen = False
+        for event in self.display.events():
+            if event.type != self.watcher.event_type:
+                continue
+            seen = True
+            self.damage_events += 1
+            if self.watcher.touches(event, region['left'], region['top'], region['width'], region['height']):
+                self.dirty = True
+        if seen:
+            # Repair before reading, so a change during the read sends a new report
+            self.watcher.subtract()
+            self.display.x11.XFlush(self.display.ptr)
+
+    def wait(self, region, timeout):
+        """Blocks until the region is damaged or `timeout` passes; returns whether it's dirty."""
+        self._process_events(region)
+        if not self.dirty and self.display.wait(timeout):
+            self._process_events(region)
+        return self.dirty
+
+    def grab(self, region):
+        """BGRA copy of the region, or None if it hasn't changed since the last grab."""
+        if region != self.region:
+            size = (region['width'], region['height'])
+            if self.image is None or (self.image.width, self.image.height) != size:
+                if self.image is not None:
+                    self.image.close()
+                self.image = self._x11.ShmImage(self.display, *size)
+            self.region = dict(region)
+            self.dirty = True
+        self._process_events(region)
+        if not self.dirty:
+            self.unchanged += 1
+            return None
+        self.dirty = False
+        self.grabs += 1
+        return self.image.get(self.display.root, region['left'], region['top']).copy()
+
+    def close(self):
+        if self.image is not None:
+            self.image.close()
+            self.image = None
+        self.watcher.close()
+        self.display.close()
+
+
+def open_capture(backend="auto"):
+    """
+    Returns (capture, note). backend is "auto", "damage" or "mss"; with "auto", note says
+    why DamageCapture wasn't used (None if it was). "damage" raises OSError if unavailable.
+    """
+    if backend == "mss":
+        return MssCapture(), None
+    if backend not in ("auto", "damage"):
+        raise ValueError(f"unknown capture backend {backend!r}")
+    if not sys.platform.startswith("linux"):
+        reason = "change-driven capture needs X11 (Linux)"
+    else:
+        try:
+            return DamageCapture(), None
+        except OSError as e:
+            reason = str(e)
+    if backend == "damage":
+        raise OSError(reason)
+    return MssCapture(), f"using mss: {reason}"
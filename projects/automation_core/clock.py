@@ -0,0 +1,121 @@
+import asyncio
+import math
+import selectors
+import time
+from concurrent.futures import Executor, Future
+
+# --- Clocks ---
+# The schedulers never call time.perf_counter()/time.sleep() directly; they ask a clock.
+#   - RealClock: perf_counter time, real (hybrid sleep/spin) waits. The default.
+#   - VirtualClock: time only moves when a wait asks it to, and then jumps straight to
+#     the deadline. An hour of clicks and eats runs in however long the scheduling work
+#     itself takes, which is what the simulations measure.
+#
+# Thread-based schedulers use now() / wait(cond, timeout) / sleep_until(deadline).
+# asyncio code uses loop.time() and asyncio.sleep(), so it gets virtual time by running
+# on VirtualClock.new_event_loop() instead.
+
+SPIN_THRESHOLD = 0.002 # RealClock busy-waits the last 2ms before a precise deadline
+
+
+class RealClock:
+    def now(self):
+        return time.perf_counter()
+
+    def wait(self, cond, timeout):
+        """Waits on a held threading.Condition until notified or `timeout` seconds (None = forever)."""
+        cond.wait(timeout)
+
+    def sleep_until(self, deadline):
+        """
+        Hybrid sleep/spin until now() reaches deadline: sleeps while the deadline is
+        further than SPIN_THRESHOLD away (sleep can overshoot by a scheduler tick),
+        then spins for the rest to land within a fraction of a millisecond.
+        """
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return
+            if remaining > SPIN_THRESHOLD:
+                time.sleep(remaining - SPIN_THRESHOLD)
+
+
+class VirtualClock:
+    """
+    Simulated time, starting at `start`. Only the thread that runs the scheduler should
+    advance it (through wait/sleep_until or the virtual event loop).
+    """
+
+    def __init__(self, start=0.0):
+        self._now = start
+        self.advances = 0 # Number of time jumps (one per timed wait)
+
+    def now(self):
+        return self._now
+
+    def advance(self, seconds):
+        if seconds > 0:
+            # Always move by at least one float step: after hours of simulated time a tiny
+            # remaining timeout can round away, and the waiter would never reach its deadline
+            self._now = max(self._now + seconds, math.nextafter(self._now, math.inf))
+            self.advances += 1
+
+    def wait(self, cond, timeout):
+        if timeout is None:
+            cond.wait() # Nothing is scheduled: only another thread can wake us
+            return
+        self.advance(timeout) # Jump to the deadline instead of waiting for it
+
+    def sleep_until(self, deadline):
+        self.advance(deadline - self._now)
+
+    def new_event_loop(self):
+        """An asyncio event loop whose loop.time() (and so asyncio.sleep) runs on this clock."""
+        return VirtualTimeEventLoop(self)
+
+
+class _VirtualSelector:
+    """
+    Wraps a real selector: I/O that is already ready (e.g. call_soon_threadsafe wakeups)
+    is still delivered, but a wait for the next timer becomes a jump of the clock.
+    """
+
+    def __init__(self, selector, clock):
+        self._selector = selector
+        self._clock = clock
+
+    def select(self, timeout=None):
+        events = self._selector.select(0)
+        if events:
+            return events
+        if timeout is None:
+            return self._selector.select(None) # No timers: block for real I/O
+        self._clock.advance(timeout)
+        return []
+
+    def __getattr__(self, name):
+        return getattr(self._selector, name) # register(), unregister(), close(), ...
+
+
+class VirtualTimeEventLoop(asyncio.SelectorEventLoop):
+    def __init__(self, clock):
+        self._virtual_clock = clock
+        super().__init__(_VirtualSelector(selectors.DefaultSelector(), clock))
+
+    def time(self):
+        return self._virtual_clock.now()
+
+
+class InlineExecutor(Executor):
+    """
+    Stand-in for a ThreadPoolExecutor under virtual time: runs the job immediately on the
+    calling thread, so loop.run_in_executor() can't race the clock.
+    """
+
+    def submit(self, func, *args):
+        future = Future()
+        try:
+            future.set_result(func(*args))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
@@ -0,0 +1,259 @@
+import argparse
+import asyncio
+import functools
+import inspect
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+
+# --- Control Socket ---
+# A local Unix-domain socket for scripting the tools instead of faking hotkeys.
+# Protocol: line-delimited JSON over a persistent connection.
+#   request:  {"cmd": "start"}                      -> one response line
+#             [{"cmd": "set_interval", "seconds": 0.05}, {"cmd": "start"}]
+#                                                   -> one line with a list of responses
+#   response: {"ok": true, "result": ...} or {"ok": false, "error": "..."}
+# A batch is handled in order in one round trip. An "id" in a request is echoed back.
+# Every server also answers "ping" and "commands".
+#
+# Commands are plain functions taking the request's other fields as keyword arguments
+# and returning something JSON-serializable. Arguments that don't fit the function's
+# signature are answered with "bad arguments" without calling it; a ValueError raised by
+# the command is a rejected request (its message is the error), and any other exception
+# is reported as an internal error. ControlServer runs them on its own
+# threads (the clicker); serve_asyncio() runs them on the event loop (the fisher).
+#
+# Client:  python -m automation_core.control SOCKET CMD [JSON_PARAMS]   (from projects/)
+#          python -m automation_core.control SOCKET --bench 10000
+
+MAX_LINE = 64 * 1024 # Longest accepted request line
+AVAILABLE = hasattr(socket, "AF_UNIX") # Not on Windows builds of Python without AF_UNIX support
+
+
+def default_socket_path(name):
+    """Per-user socket path, e.g. $XDG_RUNTIME_DIR/auto_clicker.sock."""
+    base = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return os.path.join(base, f"{name}.sock")
+
+
+@functools.lru_cache(maxsize=None)
+def _signature(handler):
+    return inspect.signature(handler)
+
+
+def _run_command(request, commands):
+    if not isinstance(request, dict) or not isinstance(request.get("cmd"), str):
+        return {"ok": False, "error": "request must be an object with a 'cmd' string"}
+    params = dict(request)
+    name = params.pop("cmd")
+    request_id = params.pop("id", None)
+    if name == "ping":
+        response = {"ok": True, "result": "pong"}
+    elif name == "commands":
+        response = {"ok": True, "result": sorted(commands) + ["commands", "ping"]}
+    elif name not in commands:
+        response = {"ok": False, "error": f"unknown command '{name}'"}
+    else:
+        handler = commands[name]
+        try:
+            _signature(handler).bind(**params)
+        except TypeError as e:
+            response = {"ok": False, "error": f"bad arguments for '{name}': {e}"}
+        else:
+            try:
+                response = {"ok": True, "result": handler(**params)}
+            except ValueError as e:
+                response = {"ok": False, "error": str(e)}
+            except Exception as e:
+                response = {"ok": False, "error": f"internal error in '{name}': {type(e).__name__}: {e}"}
+    if request_id is not None:
+        response["id"] = request_id
+    return response
+
+
+def dispatch(line, commands):
+    """Handles one request line (a command or a batch) and returns the response line (bytes)."""
+    try:
+        request = json.loads(line)
+    except ValueError as e:
+        response = {"ok": False, "error": f"invalid JSON: {e}"}
+    else:
+        if isinstance(request, list):
+            response = [_run_command(r, commands) for r in request]
+        else:
+            response = _run_command(request, commands)
+    return json.dumps(response, separators=(",", ":"), default=str).encode() + b"\n"
+
+
+def _prepare_path(path):
+    """Removes a stale socket file. Raises OSError if another instance is listening on it."""
+    if not os.path.exists(path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:
+        os.unlink(path) # Left over from a crash
+    else:
+        raise OSError(f"{path} is in use by another instance")
+    finally:
+        probe.close()
+
+
+# --- Threaded server (the clicker: commands run on the connection's thread) ---
+class ControlServer:
+    def __init__(self, path, commands):
+        self.path = path
+        self.commands = commands # name -> function(**params)
+        self._sock = None
+        self._thread = None
+
+    def start(self):
+        _prepare_path(self.path)
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.bind(self.path)
+        os.chmod(self.path, 0o600) # Only this user may control the tool
+        self._sock.listen()
+        self._thread = threading.Thread(target=self._accept_loop, daemon=True)
+        self._thread.start()
+
+    def close(self):
+        if self._sock is None:
+            return
+        self._sock.close()
+        self._sock = None
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+
+    def _accept_loop(self):
+        while True:
+            try:
+                conn, _ = self._sock.accept()
+            except OSError:
+                return # Closed
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn):
+        buffer = b""
+        with conn:
+            while True:
+                try:
+                    data = conn.recv(65536)
+                except OSError:
+                    return
+                if not data:
+                    return
+                buffer += data
+                if b"\n" not in buffer:
+                    if len(buffer) > MAX_LINE:
+                        return
+                    continue
+                *lines, buffer = buffer.split(b"\n")
+                # Pipelined requests are answered with a single send
+                replies = b"".join(dispatch(line, self.commands) for line in lines if line.strip())
+                try:
+                    conn.sendall(replies)
+                except OSError:
+                    return
+
+
+# --- asyncio server (the fisher: commands run on the event loop) ---
+async def serve_asyncio(path, commands):
+    """Starts serving on `path`; returns the asyncio Server (close() it on exit)."""
+    async def handle(reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if line.strip():
+                    writer.write(dispatch(line, commands))
+                    await writer.drain()
+        except (OSError, ValueError): # ValueError: line longer than MAX_LINE
+            pass
+        finally:
+            writer.close()
+
+    _prepare_path(path)
+    server = await asyncio.start_unix_server(handle, path, limit=MAX_LINE)
+    os.chmod(path, 0o600)
+    return server
+
+
+# --- Client ---
+class ControlClient:
+    def __init__(self, path, timeout=2.0):
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.settimeout(timeout)
+        self._sock.connect(path)
+        self._buffer = b""
+
+    def close(self):
+        self._sock.close()
+
+    def _request(self, payload):
+        self._sock.sendall(json.dumps(payload, separators=(",", ":")).encode() + b"\n")
+        while b"\n" not in self._buffer:
+            data = self._sock.recv(65536)
+            if not data:
+                raise ConnectionError("control socket closed")
+            self._buffer += data
+        line, self._buffer = self._buffer.split(b"\n", 1)
+        return json.loads(line)
+
+    def call(self, cmd, **params):
+        """Runs one command; returns its result or raises RuntimeError with the server's error."""
+        response = self._request(dict(params, cmd=cmd))
+        if not response["ok"]:
+            raise RuntimeError(response["error"])
+        return response["result"]
+
+    def batch(self, requests):
+        """Sends several {"cmd": ...} requests in one round trip; returns the raw responses."""
+        return self._request(list(requests))
+
+
+def _bench(client, count, batch_size):
+    latencies = []
+    requests = [{"cmd": "ping"}] * batch_size
+    for _ in range(count):
+        start = time.perf_counter()
+        if batch_size == 1:
+            client.call("ping")
+        else:
+            client.batch(requests)
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    pct = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1e6
+    print(f"{count} round trips of {batch_size} command(s): p50 {pct(0.5):.1f}us, "
+          f"p99 {pct(0.99):.1f}us, max {latencies[-1] * 1e6:.1f}us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Send commands to an automation tool's control socket.")
+    parser.add_argument("socket", help="Socket path, e.g. $XDG_RUNTIME_DIR/auto_clicker.sock")
+    parser.add_argument("cmd", nargs="?", default="commands")
+    parser.add_argument("params", nargs="?", default="{}", help="JSON object of arguments")
+    parser.add_argument("--bench", type=int, metavar="N", help="Measure N ping round trips")
+    parser.add_argument("--batch", type=int, default=1, help="Commands per round trip with --bench")
+    args = parser.parse_args()
+
+    client = ControlClient(args.socket)
+    try:
+        if args.bench:
+            _bench(client, args.bench, args.batch)
+        else:
+            print(json.dumps(client._request(dict(json.loads(args.params), cmd=args.cmd)), indent=2))
+    finally:
+        client.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
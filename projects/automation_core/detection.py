@@ -0,0 +1,357 @@
+import math
+import time
+from collections import namedtuple
+from functools import lru_cache, partial
+
+import numpy as np
+
+# --- Pixel Detection ---
+# The screen-region pieces first sketched in notes/notes.py (sections 22 and 26), in one
+# importable place: region math, the target-pixel search used by the fishing bot, movement
+# detection and a streaming monitor loop. Importing this module has no side effects;
+# mss is only imported when monitor_region() starts capturing.
+#
+# Images are mss frames as NumPy arrays: BGRA (or BGR), uint8, shape (height, width, channels).
+#
+# A detector is any callable detector(image_np) -> row (int) or None. color_matcher()
+# wraps find_target_pixel as one; TemplateMatcher is the shape-based alternative for
+# when the bobber's color isn't reliable (resource packs, night, weather tints), and
+# SubtitleMatcher reads the "Fishing Bobber splashes" subtitle instead of the bobber.
+
+MovementEvent = namedtuple("MovementEvent", "time y last_y delta_y")
+
+
+def calculate_monitor_region(screen_width, screen_height, percentage=0.15):
+    """Returns a centered mss region covering `percentage` of the screen in each direction."""
+    region_width = int(screen_width * percentage)
+    region_height = int(screen_height * percentage)
+    return {
+        'top': int(screen_height / 2 - region_height / 2),
+        'left': int(screen_width / 2 - region_width / 2),
+        'width': region_width,
+        'height': region_height,
+    }
+
+
+@lru_cache(maxsize=32)
+def _channel_ranges(target_color, tolerance):
+    """(channel index, low, span) for R, G, B in BGRA order, clipped to 0-255 in Python ints."""
+    ranges = []
+    for channel, value in zip((2, 1, 0), target_color):
+        low = max(0, value - tolerance)
+        high = min(255, value + tolerance)
+        ranges.append((channel, np.uint8(low), np.uint8(high - low)))
+    return tuple(ranges)
+
+
+def find_target_pixel(image_np, target_color, tolerance=20):
+    """
+    Returns the y (row, relative to the image) of the first pixel within `tolerance` of
+    `target_color` (R, G, B) on every channel, or None if there is none.
+
+    Each range check is one wrapping uint8 subtraction and one compare
+    ((value - low) <= span is false for values below `low` because they wrap around).
+    Red is checked over the whole frame first; green and blue only for the red
+    candidates, which are few in a typical frame.
+    """
+    height, width, channels = image_np.shape
+    pixels = image_np.reshape(-1, channels)
+    (red, red_low, red_span), (green, green_low, green_span), (blue, blue_low, blue_span) = \
+        _channel_ranges(tuple(target_color), tolerance)
+
+    candidates = (pixels[:, red] - red_low) <= red_span
+    if not candidates.any():
+        return None # Common case: nothing red enough in view
+    index = np.flatnonzero(candidates)
+    candidate_pixels = pixels[index]
+    matches = (((candidate_pixels[:, green] - green_low) <= green_span)
+               & ((candidate_pixels[:, blue] - blue_low) <= blue_span))
+    first = int(matches.argmax())
+    if not matches[first]:
+        return None
+    return int(index[first]) // width
+
+
+def color_matcher(target_color, tolerance=20):
+    """Detector for find_target_pixel: detector(image_np) -> row or None."""
+    return partial(find_target_pixel, target_color=tuple(target_color), tolerance=tolerance)
+
+
+def _fast_length(n):
+    """Smallest 2^a * 3^b * 5^c >= n; numpy.fft is quickest on these sizes."""
+    best = 1 << max(0, n - 1).bit_length()
+    power5 = 1
+    while power5 < best:
+        power35 = power5
+        while power35 < best:
+            size = power35
+            while size < n:
+                size *= 2
+            best = min(best, size)
+            power35 *= 3
+        power5 *= 5
+    return best
+
+
+def _window_sums(values, h, w):
+    """Sum of every h x w window over the last two axes, from an integral image."""
+    height, width = values.shape[-2:]
+    integral = np.zeros(values.shape[:-2] + (height + 1, width + 1))
+    integral[..., 1:, 1:] = values.cumsum(axis=-2).cumsum(axis=-1)
+    return (integral[..., h:, w:] - integral[..., :-h, w:]
+            - integral[..., h:, :-w] + integral[..., :-h, :-w])
+
+
+class TemplateMatcher:
+    """
+    Detector that finds a small template (e.g. a crop of the bobber) by zero-mean
+    normalized cross-correlation over the B, G and R channels, so a uniform change in
+    brightness or contrast (night, rain) doesn't change the score. The correlation is
+    done with real FFTs; the template's spectrum is computed once per frame size and
+    cached, so each frame costs one forward and one inverse FFT plus a few
+    integral-image sums, whatever the template size.
+
+    Calling it returns the row of the template's center for the best match scoring at
+    least `threshold` (score range -1..1), or None. find() also returns x and the score.
+    """
+
+    def __init__(self, template, threshold=0.6):
+        # Channel-first (B, G, R planes): FFTs and sums then run over contiguous planes
+        template = np.asarray(template)[:, :, :3].transpose(2, 0, 1).astype(np.float64)
+        self.height, self.width = template.shape[1:]
+        self.threshold = threshold
+        self._template = template - template.mean(axis=(1, 2), keepdims=True) # Zero mean per channel
+        self._template_norm = math.sqrt(float((self._template ** 2).sum()))
+        self._spectra = {} # (frame height, frame width) -> (FFT shape, conjugate template spectrum)
+        self.last_score = None # Best score of the last frame, matched or not (for tuning)
+
+    def _spectrum(self, frame_height, frame_width):
+        key = (frame_height, frame_width)
+        if key not in self._spectra:
+            # Padding to at least the frame size keeps every valid offset free of wrap-around
+            shape = (_fast_length(frame_height), _fast_length(frame_width))
+            spectrum = np.fft.rfft2(self._template, s=shape)
+            self._spectra[key] = (shape, np.conj(spectrum))
+        return self._spectra[key]
+
+    def scores(self, image_np):
+        """NCC score for every offset where the template fits, shape (H - h + 1, W - w + 1)."""
+        frame = image_np[:, :, :3].transpose(2, 0, 1).astype(np.float64)
+        frame_height, frame_width = frame.shape[1:]
+        h, w = self.height, self.width
+        if frame_height < h or frame_width < w or self._template_norm == 0:
+            return np.zeros((max(0, frame_height - h + 1), max(0, frame_width - w + 1)))
+        shape, template_spectrum = self._spectrum(frame_height, frame_width)
+
+        # Numerator: sum over the window of frame * (template - mean), all channels at once.
+        # The channel sum is taken in the frequency domain, so only one inverse FFT is needed.
+        spectrum = np.fft.rfft2(frame, s=shape)
+        correlation = np.fft.irfft2((spectrum * template_spectrum).sum(axis=0), s=shape)
+        numerator = correlation[:frame_height - h + 1, :frame_width - w + 1]
+
+        # Denominator: each window's deviation from its own mean, from integral images
+        # (per-channel sums, and squares already summed over the channels)
+        sums = _window_sums(frame, h, w)
+        variance = _window_sums((frame * frame).sum(axis=0), h, w) - (sums * sums).sum(axis=0) / (h * w)
+        denominator = np.sqrt(np.maximum(variance, 0.0)) * self._template_norm
+        # Flat windows (no texture) can't match a textured template: score them 0
+        return np.divide(numerator, denominator, out=np.zeros_like(numerator), where=denominator > 1e-6)
+
+    def find(self, image_np):
+        """(y, x, score) of the best match's top-left corner, or None below the threshold."""
+        scores = self.scores(image_np)
+        if scores.size == 0:
+            self.last_score = None
+            return None
+        index = int(scores.argmax())
+        y, x = divmod(index, scores.shape[1])
+        score = float(scores[y, x])
+        self.last_score = score
+        if score < self.threshold:
+            return None
+        return y, x, score
+
+    def __call__(self, image_np):
+        match = self.find(image_np)
+        return None if match is None else match[0] + self.height // 2
+
+
+# --- Subtitle Detection ---
+# With Accessibility > Show Subtitles on, Minecraft writes "Fishing Bobber splashes" in
+# the bottom-right corner the moment a fish bites: white text on a dark box, newest line
+# at the bottom, fading to grey over about 3 seconds. Reading that is cheaper and more
+# reliable than following the bobber, and needs no OCR: the phrase is drawn once from the
+# default font's glyph bitmaps below (8 rows, baseline at row 7, one blank column between
+# glyphs), scaled up by the GUI scale and matched against the thresholded capture.
+
+GLYPHS = {
+    "F": ("#####", "#....", "#....", "####.", "#....", "#....", "#....", "....."),
+    "B": ("####.", "#...#", "#...#", "####.", "#...#", "#...#", "####.", "....."),
+    "a": (".....", ".....", ".###.", "....#", ".####", "#...#", ".####", "....."),
+    "b": ("#....", "#....", "#.##.", "##..#", "#...#", "#...#", "####.", "....."),
+    "d": ("....#", "....#", ".##.#", "#..##", "#...#", "#...#", ".####", "....."),
+    "e": (".....", ".....", ".###.", "#...#", "#####", "#....", ".####", "....."),
+    "g": (".....", ".....", ".####", "#...#", "#...#", ".####", "....#", "####."),
+    "h": ("#....", "#....", "#.##.", "##..#", "#...#", "#...#", "#...#", "....."),
+    "i": ("#", ".", "#", "#", "#", "#", "#", "."),
+    "l": ("#.", "#.", "#.", "#.", "#.", "#.", ".#", ".."),
+    "n": (".....", ".....", "####.", "#...#", "#...#", "#...#", "#...#", "....."),
+    "o": (".....", ".....", ".###.", "#...#", "#...#", "#...#", ".###.", "....."),
+    "p": (".....", ".....", "#.##.", "##..#", "#...#", "####.", "#....", "#...."),
+    "r": (".....", ".....", "#.##.", "##..#", "#....", "#....", "#....", "....."),
+    "s": (".....", ".....", ".####", "#....", ".###.", "....#", "####.", "....."),
+    "t": (".#.", ".#.", "###", ".#.", ".#.", ".#.", "..#", "..."),
+    "v": (".....", ".....", "#...#", "#...#", "#...#", ".#.#.", "..#..", "....."),
+    "w": (".....", ".....", "#...#", "#...#", "#.#.#", "#.#.#", ".####", "....."),
+    " ": ("...",) * 8,
+}
+SUBTITLE_TEXT = "Fishing Bobber splashes"
+
+
+@lru_cache(maxsize=None)
+def phrase_bitmap(text, scale=1):
+    """Boolean bitmap of `text` in the glyphs above at `scale` pixels per font pixel (read-only)."""
+    missing = sorted(set(text) - set(GLYPHS))
+    if missing:
+        raise ValueError(f"no glyphs for {''.join(missing)!r}")
+    columns = []
+    for char in text:
+        columns.append(np.array([[c == "#" for c in row] for row in GLYPHS[char]]))
+        columns.append(np.zeros((8, 1), dtype=bool)) # Spacing
+    bitmap = np.hstack(columns[:-1]).repeat(scale, axis=0).repeat(scale, axis=1)
+    bitmap.flags.writeable = False # Shared by every caller through the cache
+    return bitmap
+
+
+def calculate_subtitle_region(screen_width, screen_height, gui_scale=2, width=160, height=60, bottom=20):
+    """
+    The bottom-right corner where subtitles are drawn: `width` x `height` GUI pixels whose
+    bottom edge is `bottom` GUI pixels above the screen's (room for about 5 lines).
+    """
+    region_width = min(screen_width, width * gui_scale)
+    region_height = min(screen_height - bottom * gui_scale, height * gui_scale)
+    return {
+        'top': max(0, screen_height - (bottom + height) * gui_scale),
+        'left': screen_width - region_width,
+        'width': region_width,
+        'height': region_height,
+    }
+
+
+def binarize(image_np, threshold=160):
+    """True where B, G and R are all at least `threshold`: white or light-grey text."""
+    return (image_np[:, :, 0] >= threshold) & (image_np[:, :, 1] >= threshold) & (image_np[:, :, 2] >= threshold)
+
+
+class SubtitleMatcher:
+    """
+    Detector for a subtitle phrase. The frame is thresholded to a text mask, then the
+    phrase bitmap is correlated with it at every offset (real FFTs, the bitmap's spectrum
+    cached per frame size, as in TemplateMatcher). A window scores the fraction of the
+    phrase's lit pixels that are lit in the mask minus the fraction of its blank pixels
+    that are lit too, so 1.0 is an exact match, a blank box scores 0 and a different
+    phrase on the same line loses on both counts. Frames without enough lit pixels for
+    the phrase (no subtitles shown: the usual case) return before any FFT.
+
+    Calling it returns the row of the phrase's center, or None; find() also returns x
+    and the score.
+    """
+
+    def __init__(self, text=SUBTITLE_TEXT, gui_scale=2, threshold=0.8, pixel_threshold=160):
+        self.text = text
+        self.template = phrase_bitmap(text, gui_scale)
+        self.height, self.width = self.template.shape
+        self.threshold = threshold
+        self.pixel_threshold = pixel_threshold
+        self.lit = int(self.template.sum())
+        self.blank = self.template.size - self.lit
+        self._spectra = {} # (frame height, frame width) -> (FFT shape, conjugate bitmap spectrum)
+        self.last_score = None
+
+    def _spectrum(self, frame_height, frame_width):
+        key = (frame_height, frame_width)
+        if key not in self._spectra:
+            shape = (_fast_length(frame_height), _fast_length(frame_width))
+            self._spectra[key] = (shape, np.conj(np.fft.rfft2(self.template.astype(np.float64), s=shape)))
+        return self._spectra[key]
+
+    def scores(self, mask):
+        """Score for every offset where the phrase fits in the boolean mask."""
+        frame_height, frame_width = mask.shape
+        h, w = self.height, self.width
+        if frame_height < h or frame_width < w:
+            return np.zeros((max(0, frame_height - h + 1), max(0, frame_width - w + 1)))
+        shape, template_spectrum = self._spectrum(frame_height, frame_width)
+        values = mask.astype(np.float64)
+        correlation = np.fft.irfft2(np.fft.rfft2(values, s=shape) * template_spectrum, s=shape)
+        hits = correlation[:frame_height - h + 1, :frame_width - w + 1] # Lit in both
+        stray = _window_sums(values, h, w) - hits # Lit in the mask where the phrase is blank
+        return hits / self.lit - stray / self.blank
+
+    def find(self, image_np):
+        """(y, x, score) of the best match's top-left corner, or None below the threshold."""
+        mask = binarize(image_np, self.pixel_threshold)
+        if np.count_nonzero(mask) < self.lit * self.threshold:
+            self.last_score = 0.0 # Can't reach the threshold: too little text on screen
+            return None
+        scores = self.scores(mask)
+        if scores.size == 0:
+            self.last_score = None
+            return None
+        index = int(scores.argmax())
+        y, x = divmod(index, scores.shape[1])
+        score = float(scores[y, x])
+        self.last_score = score
+        if score < self.threshold:
+            return None
+        return y, x, score
+
+    def __call__(self, image_np):
+        match = self.find(image_np)
+        return None if match is None else match[0] + self.height // 2
+
+
+def detect_movement(current_y, last_y, threshold=3):
+    """Returns (moved, delta_y): moved is True when |delta_y| exceeds threshold."""
+    if current_y is None or last_y is None:
+        return False, None
+    delta_y = current_y - last_y
+    return abs(delta_y) > threshold, delta_y
+
+
+def monitor_region(region, target_color, tolerance=20, threshold=3, interval=1/30, grab=None, detector=None):
+    """
+    Generator: captures `region` every `interval` seconds and yields a MovementEvent
+    whenever the target pixel moves by more than `threshold` rows between frames.
+    `grab(region)` returns a frame as a NumPy array; by default an mss handle owned by
+    the generator is used (closed when the generator is closed).
+    `detector` replaces the color match (e.g. a TemplateMatcher).
+    Stop it with generator.close() or by breaking out of the for loop.
+    """
+    if detector is None:
+        detector = color_matcher(target_color, tolerance)
+    sct = None
+    if grab is None:
+        import mss
+        sct = mss.mss()
+        grab = lambda r: np.asarray(sct.grab(r))
+    try:
+        last_y = None
+        next_frame = time.monotonic()
+        while True:
+            current_y = detector(grab(region))
+            moved, delta_y = detect_movement(current_y, last_y, threshold)
+            if moved:
+                yield MovementEvent(time.monotonic(), current_y, last_y, delta_y)
+            last_y = current_y
+
+            # Fixed-rate schedule (no drift from the capture time); skip missed frames
+            next_frame += interval
+            delay = next_frame - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_frame = time.monotonic()
+    finally:
+        if sct is not None:
+            sct.close()
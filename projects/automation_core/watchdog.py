@@ -0,0 +1,131 @@
+import time
+import zlib
+
+# --- Stall Watchdog ---
+# Notices when the game stops rendering (paused, hung, frozen on a loading screen) from
+# the captured frames alone, so the tools can stop working on a picture that never changes:
+#   - frame_fingerprint() hashes every `stride`-th row and column of a frame (1/64 of the
+#     pixels at stride 8, about 10us for the fisher's 288x162 region) in the capture stage.
+#   - StallWatchdog.observe() is fed each fingerprint, or None when the capture backend
+#     already knows the region is unchanged. Once nothing has changed for `freeze_after`
+#     seconds it calls on_stall(); the first changed frame after that calls on_resume().
+#     While stalled the caller is expected to stop detection/clicking and only probe
+#     every now and then.
+#   - CpuSavings accounts process CPU time per wall second in the active and paused states;
+#     the saving is what the paused time would have cost at the active rate minus what it
+#     did cost. Both tools keep one (the clicker for its watchdog pauses).
+# Nothing here blocks or spawns threads; `now` is whatever clock the caller schedules with.
+
+
+def frame_fingerprint(image_np, stride=8):
+    """CRC32 of a strided sample of the frame (any array; equal frames give equal values)."""
+    return zlib.crc32(image_np[::stride, ::stride].tobytes())
+
+
+class CpuSavings:
+    STATES = ("active", "paused")
+
+    def __init__(self, cpu_clock=time.process_time):
+        self.cpu_clock = cpu_clock
+        self.usage = {state: [0.0, 0.0] for state in self.STATES} # [CPU s, wall s]
+        self.state = None # None: not accounted (e.g. the tool is stopped)
+        self._mark = None # (CPU, now) at the last switch
+
+    def switch(self, state, now):
+        """Charges the time since the last switch to the current state, then enters `state`."""
+        cpu = self.cpu_clock()
+        if self.state is not None:
+            usage = self.usage[self.state]
+            usage[0] += cpu - self._mark[0]
+            usage[1] += now - self._mark[1]
+        self.state = state
+        self._mark = (cpu, now)
+
+    def rate(self, state):
+        """CPU seconds per wall second in `state`, or None if it hasn't been seen yet."""
+        cpu, wall = self.usage[state]
+        return cpu / wall if wall > 0 else None
+
+    def saved(self):
+        """Estimated CPU seconds saved by the paused time (0 until both states were seen)."""
+        active_rate = self.rate("active")
+        cpu, wall = self.usage["paused"]
+        if active_rate is None or wall <= 0:
+            return 0.0
+        return max(0.0, wall * active_rate - cpu)
+
+    def summary(self, now=None):
+        """Dict for metrics/logs; pass `now` to include the current state's time so far."""
+        if now is not None and self.state is not None:
+            self.switch(self.state, now)
+        return {
+            "active_s": round(self.usage["active"][1], 1),
+            "paused_s": round(self.usage["paused"][1], 1),
+            "active_cpu_ms_per_s": None if self.rate("active") is None else round(self.rate("active") * 1000, 2),
+            "paused_cpu_ms_per_s": None if self.rate("paused") is None else round(self.rate("paused") * 1000, 2),
+            "cpu_saved_s": round(self.saved(), 3),
+        }
+
+    def describe(self, now=None):
+        s = self.summary(now)
+        if s["paused_s"] == 0:
+            return f"No paused time ({s['active_s']}s active)."
+        return (f"Paused {s['paused_s']}s of {s['active_s'] + s['paused_s']:.1f}s: "
+                f"{s['active_cpu_ms_per_s']}ms CPU/s active vs {s['paused_cpu_ms_per_s']}ms CPU/s paused, "
+                f"about {s['cpu_saved_s']:.2f}s CPU saved")
+
+
+class StallWatchdog:
+    def __init__(self, freeze_after, on_stall=None, on_resume=None, cpu_clock=time.process_time):
+        self.freeze_after = freeze_after # Seconds without a changed frame before stalling
+        self.on_stall = on_stall # Called with the seconds since the last change
+        self.on_resume = on_resume # Called with the seconds spent stalled
+        self.fingerprint = None
+        self.last_change = None # None until the first observe() (and after suspend())
+        self.stalled = False
+        self.stalled_since = None
+        self.stalls = 0
+        self.savings = CpuSavings(cpu_clock)
+
+    def observe(self, fingerprint, now):
+        """
+        Feeds one capture: the frame's fingerprint, or None if the backend reported the
+        region unchanged. Returns True while stalled.
+        """
+        if self.last_change is None:
+            self.last_change = now
+            self.savings.switch("active", now)
+        if fingerprint is not None and fingerprint != self.fingerprint:
+            self.fingerprint = fingerprint
+            self.last_change = now
+            if self.stalled:
+                self._resume(now)
+        elif not self.stalled and now - self.last_change >= self.freeze_after:
+            self._stall(now)
+        return self.stalled
+
+    def suspend(self, now):
+        """Stops watching (the tool stopped or can't capture): ends any stall, stops accounting."""
+        if self.stalled:
+            self._resume(now)
+        if self.last_change is not None:
+            self.savings.switch(None, now)
+        self.last_change = None
+
+    def _stall(self, now):
+        self.stalled = True
+        self.stalled_since = now
+        self.stalls += 1
+        self.savings.switch("paused", now)
+        if self.on_stall is not None:
+            self.on_stall(now - self.last_change)
+
+    def _resume(self, now):
+        self.stalled = False
+        self.savings.switch("active", now)
+        if self.on_resume is not None:
+            self.on_resume(now - self.stalled_since)
+        self.stalled_since = None
+
+    def summary(self, now=None):
+        return dict(self.savings.summary(now), stalls=self.stalls, stalled=self.stalled)
@@ -0,0 +1,147 @@
+from automation_core import x11
+from automation_core.detection import calculate_monitor_region
+
+# --- Window Tracking (X11) ---
+# Follows one application window so the capture region can be relative to the window
+# instead of the screen: found by title (case-insensitive substring of _NET_WM_NAME /
+# WM_NAME) and/or by _NET_WM_PID, then kept up to date from the server's events:
+#   ConfigureNotify  moved or resized  -> region recomputed
+#   Map/UnmapNotify  shown / minimized -> capturable on / off
+#   VisibilityNotify fully covered     -> capturable off (only reported without a compositor)
+#   DestroyNotify    closed            -> lost; find() again to pick up a new instance
+# Events are selected on the client window and on its top-level ancestor (the window
+# manager's frame), since moving a reparented window only reconfigures the frame.
+#
+# The tracker does no waiting of its own: call process_events() when `fd` is readable
+# (asyncio's loop.add_reader) or periodically. Use it from one thread.
+
+
+class WindowTracker:
+    def __init__(self, title=None, pid=None, percentage=0.15, display=None, region_fn=None):
+        if title is None and pid is None:
+            raise ValueError("give a window title, a PID or both")
+        self.display = x11.Display(display)
+        self.title = title.lower() if title else None
+        self.pid = pid
+        self.percentage = percentage # Share of the window's width/height to capture, centered
+        # region_fn(width, height) -> region relative to the window; replaces the centered one
+        self.region_fn = region_fn or (lambda width, height: calculate_monitor_region(width, height, self.percentage))
+        root = self.display.window_attributes(self.display.root)
+        self.screen_size = (root.width, root.height)
+        self.window = None # Client window ID
+        self.frame = None # Its top-level ancestor (a child of the root window)
+        self.name = None
+        self.geometry = None # (left, top, width, height) of the window on the screen
+        self.mapped = False
+        self.obscured = False
+        self.region = None # mss-style region dict, or None when nothing of it is on screen
+        self.configure_events = 0
+
+    @property
+    def fd(self):
+        return self.display.fd
+
+    @property
+    def capturable(self):
+        """True while the window exists, is mapped, isn't fully covered and has a region on screen."""
+        return self.window is not None and self.mapped and not self.obscured and self.region is not None
+
+    def _matches(self, window):
+        if self.pid is not None and self.display.window_pid(window) != self.pid:
+            return False
+        if self.title is not None:
+            name = self.display.window_name(window)
+            if name is None or self.title not in name.lower():
+                return False
+        return True
+
+    def find(self):
+        """Searches all windows for the target and starts tracking it; returns True if found."""
+        matches = []
+        for top_level in self.display.children(self.display.root):
+            stack = [top_level]
+            while stack:
+                window = stack.pop()
+                if self._matches(window):
+                    matches.append((window, top_level))
+                stack.extend(self.display.children(window))
+        try:
+            self.display.sync()
+        except OSError:
+            pass # Windows that disappeared during the walk
+        if not matches:
+            return False
+        # Prefer a window that's on screen now, then the one highest in the stacking order
+        viewable = [m for m in matches if self._viewable(m[0])]
+        self.window, self.frame = (viewable or matches)[-1]
+        self.name = self.display.window_name(self.window)
+        self.obscured = False
+        mask = x11.StructureNotifyMask | x11.VisibilityChangeMask
+        self.display.select_input(self.window, mask)
+        if self.frame != self.window:
+            self.display.select_input(self.frame, mask)
+        self._refresh()
+        return self.window is not None
+
+    def _viewable(self, window):
+        attributes = self.display.window_attributes(window)
+        return attributes is not None and attributes.map_state == x11.IsViewable
+
+    def _lose(self):
+        self.window = self.frame = self.name = self.geometry = self.region = None
+        self.mapped = False
+
+    def _refresh(self):
+        """Re-reads the window's state and position and recomputes the region."""
+        attributes = self.display.window_attributes(self.window)
+        try:
+            self.display.sync()
+        except OSError:
+            attributes = None # BadWindow: destroyed in the meantime
+        if attributes is None:
+            self._lose()
+            return
+        self.mapped = attributes.map_state == x11.IsViewable
+        left, top = self.display.root_position(self.window)
+        self.geometry = (left, top, attributes.width, attributes.height)
+        region = dict(self.region_fn(attributes.width, attributes.height))
+        region['left'] += left
+        region['top'] += top
+        self.region = self._clip(region)
+
+    def _clip(self, region):
+        """The part of the region on the screen (XShm/mss reads fail outside it), or None."""
+        screen_width, screen_height = self.screen_size
+        left, top = max(0, region['left']), max(0, region['top'])
+        right = min(screen_width, region['left'] + region['width'])
+        bottom = min(screen_height, region['top'] + region['height'])
+        if right <= left or bottom <= top:
+            return None
+        return {'top': top, 'left': left, 'width': right - left, 'height': bottom - top}
+
+    def state(self):
+        return (self.window, self.region and tuple(self.region.values()), self.capturable)
+
+    def process_events(self):
+        """Handles queued events without blocking; returns True if the region or capturable changed."""
+        before = self.state()
+        refresh = False
+        for event in self.display.events():
+            if self.window is None:
+                continue
+            ours = (self.window, self.frame)
+            if event.type == x11.DestroyNotify and event.xstructure.window in ours:
+                self._lose()
+            elif event.type == x11.ConfigureNotify and event.xstructure.window in ours:
+                self.configure_events += 1
+                refresh = True
+            elif event.type in (x11.MapNotify, x11.UnmapNotify) and event.xstructure.window in ours:
+                refresh = True
+            elif event.type == x11.VisibilityNotify and event.xvisibility.window == self.window:
+                self.obscured = event.xvisibility.state == x11.VisibilityFullyObscured
+        if refresh and self.window is not None:
+            self._refresh() # Once per batch: a drag sends many ConfigureNotify events
+        return self.state() != before
+
+    def close(self):
+        self.display.close()
@@ -0,0 +1,426 @@
+import ctypes
+import ctypes.util
+import os
+import select
+
+import numpy as np
+
+# --- X11 via ctypes ---
+# Just enough Xlib, MIT-SHM and DAMAGE to read screen pixels only after they change:
+#   - Display: one connection, its file descriptor (for select()) and its event queue.
+#     X protocol errors are recorded on the Display instead of Xlib's default handler,
+#     which would exit the process.
+#   - ShmImage: a persistent MIT-SHM segment the server copies pixels into, exposed as a
+#     BGRA NumPy view without any per-frame allocation.
+#   - DamageWatcher: a DAMAGE object on a drawable; reports which damage events touch a
+#     rectangle of interest.
+#   - Window helpers on Display (tree walk, names, PIDs, geometry, event selection) for
+#     window_tracker.py.
+# Nothing here is loaded until a Display is opened; every failure to find a library, an
+# X server or an extension is an OSError, so callers can fall back to mss.
+#
+# Display objects are not thread-safe (no XInitThreads): use each from one thread.
+
+ZPixmap = 2
+ALL_PLANES = ctypes.c_ulong(-1).value
+XDamageReportBoundingBox = 2 # One event when the damaged area's bounding box grows
+XDamageNotify = 0 # Offset from the extension's event base
+IPC_PRIVATE, IPC_CREAT, IPC_RMID = 0, 0o1000, 0
+
+# Core event types, input masks and states used by the window tracker
+VisibilityNotify, DestroyNotify, UnmapNotify, MapNotify, ConfigureNotify = 15, 17, 18, 19, 22
+VisibilityChangeMask, StructureNotifyMask = 1 << 16, 1 << 17
+VisibilityFullyObscured = 2
+IsViewable = 2 # XWindowAttributes.map_state
+
+
+class XRectangle(ctypes.Structure):
+    _fields_ = [("x", ctypes.c_short), ("y", ctypes.c_short),
+                ("width", ctypes.c_ushort), ("height", ctypes.c_ushort)]
+
+
+class XDamageNotifyEvent(ctypes.Structure):
+    _fields_ = [
+        ("type", ctypes.c_int), ("serial", ctypes.c_ulong), ("send_event", ctypes.c_int),
+        ("display", ctypes.c_void_p), ("drawable", ctypes.c_ulong), ("damage", ctypes.c_ulong),
+        ("level", ctypes.c_int), ("more", ctypes.c_int), ("timestamp", ctypes.c_ulong),
+        ("area", XRectangle), ("geometry", XRectangle),
+    ]
+
+
+# Map, Unmap and DestroyNotify start with these fields (`event`: the window selected on)
+class XStructureEvent(ctypes.Structure):
+    _fields_ = [
+        ("type", ctypes.c_int), ("serial", ctypes.c_ulong), ("send_event", ctypes.c_int),
+        ("display", ctypes.c_void_p), ("event", ctypes.c_ulong), ("window", ctypes.c_ulong),
+    ]
+
+
+class XConfigureEvent(ctypes.Structure):
+    _fields_ = XStructureEvent._fields_ + [
+        ("x", ctypes.c_int), ("y", ctypes.c_int), ("width", ctypes.c_int), ("height", ctypes.c_int),
+        ("border_width", ctypes.c_int), ("above", ctypes.c_ulong), ("override_redirect", ctypes.c_int),
+    ]
+
+
+class XVisibilityEvent(ctypes.Structure):
+    _fields_ = [
+        ("type", ctypes.c_int), ("serial", ctypes.c_ulong), ("send_event", ctypes.c_int),
+        ("display", ctypes.c_void_p), ("window", ctypes.c_ulong), ("state", ctypes.c_int),
+    ]
+
+
+class XEvent(ctypes.Union):
+    _fields_ = [
+        ("type", ctypes.c_int), ("xdamage", XDamageNotifyEvent), ("xstructure", XStructureEvent),
+        ("xconfigure", XConfigureEvent), ("xvisibility", XVisibilityEvent), ("pad", ctypes.c_long * 24),
+    ]
+
+
+class XWindowAttributes(ctypes.Structure):
+    _fields_ = [
+        ("x", ctypes.c_int), ("y", ctypes.c_int), ("width", ctypes.c_int), ("height", ctypes.c_int),
+        ("border_width", ctypes.c_int), ("depth", ctypes.c_int), ("visual", ctypes.c_void_p),
+        ("root", ctypes.c_ulong), ("class_", ctypes.c_int), ("bit_gravity", ctypes.c_int),
+        ("win_gravity", ctypes.c_int), ("backing_store", ctypes.c_int), ("backing_planes", ctypes.c_ulong),
+        ("backing_pixel", ctypes.c_ulong), ("save_under", ctypes.c_int), ("colormap", ctypes.c_ulong),
+        ("map_installed", ctypes.c_int), ("map_state", ctypes.c_int), ("all_event_masks", ctypes.c_long),
+        ("your_event_mask", ctypes.c_long), ("do_not_propagate_mask", ctypes.c_long),
+        ("override_redirect", ctypes.c_int), ("screen", ctypes.c_void_p),
+    ]
+
+
+class XErrorEvent(ctypes.Structure):
+    _fields_ = [
+        ("type", ctypes.c_int), ("display", ctypes.c_void_p), ("resourceid", ctypes.c_ulong),
+        ("serial", ctypes.c_ulong), ("error_code", ctypes.c_ubyte),
+        ("request_code", ctypes.c_ubyte), ("minor_code", ctypes.c_ubyte),
+    ]
+
+
+class XImage(ctypes.Structure):
+    _fields_ = [
+        ("width", ctypes.c_int), ("height", ctypes.c_int), ("xoffset", ctypes.c_int),
+        ("format", ctypes.c_int), ("data", ctypes.c_void_p), ("byte_order", ctypes.c_int),
+        ("bitmap_unit", ctypes.c_int), ("bitmap_bit_order", ctypes.c_int), ("bitmap_pad", ctypes.c_int),
+        ("depth", ctypes.c_int), ("bytes_per_line", ctypes.c_int), ("bits_per_pixel", ctypes.c_int),
+        ("red_mask", ctypes.c_ulong), ("green_mask", ctypes.c_ulong), ("blue_mask", ctypes.c_ulong),
+        ("obdata", ctypes.c_void_p),
+        # struct funcs: create_image, destroy_image, get_pixel, put_pixel, sub_image, add_pixel
+        ("f_create_image", ctypes.c_void_p), ("f_destroy_image", ctypes.c_void_p),
+        ("f_get_pixel", ctypes.c_void_p), ("f_put_pixel", ctypes.c_void_p),
+        ("f_sub_image", ctypes.c_void_p), ("f_add_pixel", ctypes.c_void_p),
+    ]
+
+
+class XShmSegmentInfo(ctypes.Structure):
+    _fields_ = [("shmseg", ctypes.c_ulong), ("shmid", ctypes.c_int),
+                ("shmaddr", ctypes.c_void_p), ("readOnly", ctypes.c_int)]
+
+
+ERROR_HANDLER = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_void_p, ctypes.POINTER(XErrorEvent))
+DESTROY_IMAGE = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.POINTER(XImage))
+
+_libs = {} # Loaded libraries by name, signatures set
+
+
+def _signatures(lib, table):
+    for name, restype, argtypes in table:
+        func = getattr(lib, name)
+        func.restype = restype
+        func.argtypes = argtypes
+
+
+def _load(name):
+    path = ctypes.util.find_library(name)
+    if path is None:
+        raise OSError(f"lib{name} not found")
+    return ctypes.CDLL(path)
+
+
+def libs(*names):
+    """
+    The requested libraries ("X11", "Xext", "Xdamage", "c") with signatures set, each
+    loaded on first use; OSError if one is missing. Window tracking only needs libX11.
+    """
+    for name in names:
+        if name not in _libs:
+            lib = ctypes.CDLL(None, use_errno=True) if name == "c" else _load(name)
+            _signatures(lib, _SIGNATURES[name])
+            _libs[name] = lib
+    return tuple(_libs[name] for name in names)
+
+
+_dpy, _ulong, _int, _uint = ctypes.c_void_p, ctypes.c_ulong, ctypes.c_int, ctypes.c_uint
+_SIGNATURES = {
+    "X11": [
+        ("XOpenDisplay", _dpy, [ctypes.c_char_p]),
+        ("XCloseDisplay", _int, [_dpy]),
+        ("XDefaultScreen", _int, [_dpy]),
+        ("XRootWindow", _ulong, [_dpy, _int]),
+        ("XDefaultVisual", ctypes.c_void_p, [_dpy, _int]),
+        ("XDefaultDepth", _int, [_dpy, _int]),
+        ("XConnectionNumber", _int, [_dpy]),
+        ("XPending", _int, [_dpy]),
+        ("XNextEvent", _int, [_dpy, ctypes.POINTER(XEvent)]),
+        ("XSync", _int, [_dpy, _int]),
+        ("XFlush", _int, [_dpy]),
+        ("XSetErrorHandler", ctypes.c_void_p, [ERROR_HANDLER]),
+        ("XFree", _int, [ctypes.c_void_p]),
+        ("XInternAtom", _ulong, [_dpy, ctypes.c_char_p, _int]),
+        ("XQueryTree", _int, [_dpy, _ulong, ctypes.POINTER(_ulong), ctypes.POINTER(_ulong),
+                              ctypes.POINTER(ctypes.POINTER(_ulong)), ctypes.POINTER(_uint)]),
+        ("XGetWindowProperty", _int, [_dpy, _ulong, _ulong, ctypes.c_long, ctypes.c_long, _int, _ulong,
+                                      ctypes.POINTER(_ulong), ctypes.POINTER(_int), ctypes.POINTER(_ulong),
+                                      ctypes.POINTER(_ulong), ctypes.POINTER(ctypes.POINTER(ctypes.c_ubyte))]),
+        ("XGetWindowAttributes", _int, [_dpy, _ulong, ctypes.POINTER(XWindowAttributes)]),
+        ("XTranslateCoordinates", _int, [_dpy, _ulong, _ulong, _int, _int, ctypes.POINTER(_int),
+                                         ctypes.POINTER(_int), ctypes.POINTER(_ulong)]),
+        ("XSelectInput", _int, [_dpy, _ulong, ctypes.c_long]),
+    ],
+    "Xext": [
+        ("XShmQueryExtension", _int, [_dpy]),
+        ("XShmCreateImage", ctypes.POINTER(XImage),
+         [_dpy, ctypes.c_void_p, _uint, _int, ctypes.c_void_p, ctypes.POINTER(XShmSegmentInfo), _uint, _uint]),
+        ("XShmAttach", _int, [_dpy, ctypes.POINTER(XShmSegmentInfo)]),
+        ("XShmDetach", _int, [_dpy, ctypes.POINTER(XShmSegmentInfo)]),
+        ("XShmGetImage", _int, [_dpy, _ulong, ctypes.POINTER(XImage), _int, _int, _ulong]),
+    ],
+    "Xdamage": [
+        ("XDamageQueryExtension", _int, [_dpy, ctypes.POINTER(_int), ctypes.POINTER(_int)]),
+        ("XDamageCreate", _ulong, [_dpy, _ulong, _int]),
+        ("XDamageDestroy", None, [_dpy, _ulong]),
+        ("XDamageSubtract", None, [_dpy, _ulong, _ulong, _ulong]),
+    ],
+    "c": [
+        ("shmget", _int, [_int, ctypes.c_size_t, _int]),
+        ("shmat", ctypes.c_void_p, [_int, ctypes.c_void_p, _int]),
+        ("shmdt", _int, [ctypes.c_void_p]),
+        ("shmctl", _int, [_int, _int, ctypes.c_void_p]),
+    ],
+}
+
+
+# X errors for every open Display, keyed by the Display pointer
+_errors = {}
+
+
+@ERROR_HANDLER
+def _record_error(display, event):
+    e = event.contents
+    _errors.setdefault(display, []).append((e.error_code, e.request_code, e.minor_code))
+    return 0
+
+
+class Display:
+    def __init__(self, name=None):
+        x11, = libs("X11")
+        name = name or os.environ.get("DISPLAY")
+        if not name:
+            raise OSError("no X display ($DISPLAY is not set)")
+        self.ptr = x11.XOpenDisplay(name.encode())
+        if not self.ptr:
+            raise OSError(f"cannot open X display {name!r}")
+        x11.XSetErrorHandler(_record_error)
+        self.x11 = x11
+        self.screen = x11.XDefaultScreen(self.ptr)
+        self.root = x11.XRootWindow(self.ptr, self.screen)
+        self.fd = x11.XConnectionNumber(self.ptr)
+        self._event = XEvent()
+
+    def close(self):
+        if self.ptr:
+            _errors.pop(self.ptr, None)
+            self.x11.XCloseDisplay(self.ptr)
+            self.ptr = None
+
+    def sync(self):
+        """Round trip to the server; raises OSError for any X error since the last check."""
+        self.x11.XSync(self.ptr, 0)
+        errors = _errors.pop(self.ptr, None)
+        if errors:
+            raise OSError(f"X error(s) (code, request, minor): {errors}")
+
+    def events(self):
+        """Yields the queued events (reusing one XEvent) without blocking."""
+        while self.x11.XPending(self.ptr):
+            self.x11.XNextEvent(self.ptr, ctypes.byref(self._event))
+            yield self._event
+
+    # --- Windows ---
+    def children(self, window):
+        """Child window IDs of `window`, bottom to top."""
+        root, parent = ctypes.c_ulong(), ctypes.c_ulong()
+        children, count = ctypes.POINTER(ctypes.c_ulong)(), ctypes.c_uint()
+        if not self.x11.XQueryTree(self.ptr, window, ctypes.byref(root), ctypes.byref(parent),
+                                   ctypes.byref(children), ctypes.byref(count)):
+            return []
+        try:
+            return children[:count.value]
+        finally:
+            if children:
+                self.x11.XFree(children)
+
+    def atom(self, name):
+        return self.x11.XInternAtom(self.ptr, name.encode(), 0)
+
+    def property(self, window, name, max_items=1024):
+        """(format, raw bytes) of a window property, or None if it isn't set."""
+        actual_type, actual_format = ctypes.c_ulong(), ctypes.c_int()
+        items, remaining = ctypes.c_ulong(), ctypes.c_ulong()
+        data = ctypes.POINTER(ctypes.c_ubyte)()
+        status = self.x11.XGetWindowProperty(
+            self.ptr, window, self.atom(name), 0, max_items, 0, 0, # AnyPropertyType
+            ctypes.byref(actual_type), ctypes.byref(actual_format), ctypes.byref(items),
+            ctypes.byref(remaining), ctypes.byref(data),
+        )
+        if status != 0 or not data:
+            return None
+        try:
+            if actual_type.value == 0:
+                return None
+            # Format-32 items are C longs in the client, whatever their protocol size
+            item_size = {8: 1, 16: ctypes.sizeof(ctypes.c_short), 32: ctypes.sizeof(ctypes.c_long)}[actual_format.value]
+            return actual_format.value, ctypes.string_at(data, items.value * item_size)
+        finally:
+            self.x11.XFree(data)
+
+    def window_name(self, window):
+        """_NET_WM_NAME (UTF-8) or WM_NAME, or None."""
+        for name in ("_NET_WM_NAME", "WM_NAME"):
+            value = self.property(window, name)
+            if value is not None and value[0] == 8:
+                return value[1].decode("utf-8", "replace")
+        return None
+
+    def window_pid(self, window):
+        """_NET_WM_PID, or None if the client didn't set it."""
+        value = self.property(window, "_NET_WM_PID")
+        if value is None or value[0] != 32:
+            return None
+        return ctypes.c_long.from_buffer_copy(value[1][:ctypes.sizeof(ctypes.c_long)]).value
+
+    def window_attributes(self, window):
+        """XWindowAttributes, or None if the window is gone."""
+        attributes = XWindowAttributes()
+        if not self.x11.XGetWindowAttributes(self.ptr, window, ctypes.byref(attributes)):
+            return None
+        return attributes
+
+    def root_position(self, window):
+        """(x, y) of the window's top-left corner on the screen."""
+        x, y, child = ctypes.c_int(), ctypes.c_int(), ctypes.c_ulong()
+        self.x11.XTranslateCoordinates(self.ptr, window, self.root, 0, 0,
+                                       ctypes.byref(x), ctypes.byref(y), ctypes.byref(child))
+        return x.value, y.value
+
+    def select_input(self, window, mask):
+        self.x11.XSelectInput(self.ptr, window, mask)
+
+    def wait(self, timeout):
+        """Blocks until the server sends something or `timeout` seconds pass."""
+        self.x11.XFlush(self.ptr)
+        if self.x11.XPending(self.ptr):
+            return True
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        return bool(readable)
+
+
+class ShmImage:
+    """A width x height MIT-SHM image; get() fills it from a drawable and returns a BGRA view."""
+
+    def __init__(self, display, width, height):
+        xext, libc = libs("Xext", "c")
+        if not xext.XShmQueryExtension(display.ptr):
+            raise OSError("the X server has no MIT-SHM extension")
+        self.display, self.xext, self.libc = display, xext, libc
+        self.width, self.height = width, height
+        self.info = XShmSegmentInfo()
+        self.image = xext.XShmCreateImage(
+            display.ptr, display.x11.XDefaultVisual(display.ptr, display.screen),
+            display.x11.XDefaultDepth(display.ptr, display.screen), ZPixmap, None,
+            ctypes.byref(self.info), width, height,
+        )
+        if not self.image:
+            raise OSError("XShmCreateImage failed")
+        image = self.image.contents
+        if image.bits_per_pixel != 32:
+            self._destroy_image()
+            raise OSError(f"unsupported {image.bits_per_pixel} bits per pixel (need 32)")
+        size = image.bytes_per_line * height
+        self.info.shmid = libc.shmget(IPC_PRIVATE, size, IPC_CREAT | 0o600)
+        if self.info.shmid < 0:
+            self._destroy_image()
+            raise OSError(ctypes.get_errno(), "shmget failed")
+        address = libc.shmat(self.info.shmid, None, 0)
+        if address in (None, ctypes.c_void_p(-1).value):
+            libc.shmctl(self.info.shmid, IPC_RMID, None)
+            self._destroy_image()
+            raise OSError(ctypes.get_errno(), "shmat failed")
+        self.info.shmaddr = image.data = address
+        self.info.readOnly = 0
+        attached = xext.XShmAttach(display.ptr, ctypes.byref(self.info))
+        try:
+            display.sync() # The server attaches during this round trip (fails for remote displays)
+        except OSError:
+            attached = False
+        # Marked for removal now: the segment goes away once both sides have detached
+        libc.shmctl(self.info.shmid, IPC_RMID, None)
+        if not attached:
+            libc.shmdt(address)
+            self._destroy_image()
+            raise OSError("XShmAttach failed (not a local X server?)")
+        buffer = (ctypes.c_ubyte * size).from_address(address)
+        self.pixels = np.frombuffer(buffer, dtype=np.uint8).reshape(
+            height, image.bytes_per_line // 4, 4)[:, :width]
+
+    def get(self, drawable, x, y):
+        """Copies the rectangle at (x, y) into the segment; returns the (shared) BGRA view."""
+        if not self.xext.XShmGetImage(self.display.ptr, drawable, self.image, x, y, ALL_PLANES):
+            raise OSError("XShmGetImage failed (region outside the screen?)")
+        return self.pixels
+
+    def _destroy_image(self):
+        self.image.contents.data = None # The pixel memory is the shm segment, not malloc'd
+        DESTROY_IMAGE(self.image.contents.f_destroy_image)(self.image)
+        self.image = None
+
+    def close(self):
+        if self.image is None:
+            return
+        self.xext.XShmDetach(self.display.ptr, ctypes.byref(self.info))
+        self.display.x11.XSync(self.display.ptr, 0)
+        self.pixels = None
+        self.libc.shmdt(self.info.shmaddr)
+        self._destroy_image()
+
+
+class DamageWatcher:
+    """DAMAGE on `drawable` (the root window: the whole screen), bounding-box reports."""
+
+    def __init__(self, display, drawable):
+        xdamage, = libs("Xdamage")
+        event_base, error_base = ctypes.c_int(), ctypes.c_int()
+        if not xdamage.XDamageQueryExtension(display.ptr, ctypes.byref(event_base), ctypes.byref(error_base)):
+            raise OSError("the X server has no DAMAGE extension")
+        self.display, self.xdamage = display, xdamage
+        self.event_type = event_base.value + XDamageNotify
+        self.damage = xdamage.XDamageCreate(display.ptr, drawable, XDamageReportBoundingBox)
+        display.sync()
+
+    def touches(self, event, x, y, width, height):
+        """True if `event` is a damage report overlapping the rectangle."""
+        if event.type != self.event_type:
+            return False
+        area = event.xdamage.area
+        return (area.x < x + width and x < area.x + area.width
+                and area.y < y + height and y < area.y + area.height)
+
+    def subtract(self):
+        """Marks everything repaired, so the next change sends a new report."""
+        self.xdamage.XDamageSubtract(self.display.ptr, self.damage, 0, 0)
+
+    def close(self):
+        if self.damage:
+            self.xdamage.XDamageDestroy(self.display.ptr, self.damage)
+            self.damage = 0
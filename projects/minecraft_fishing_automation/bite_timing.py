@@ -0,0 +1,130 @@
+import json
+import os
+import time
+
+# --- Bite Timing Model ---
+# In Minecraft a fish bites after a random wait (100-600 game ticks, i.e. 5-30s, less with Lure)
+# from the cast. This model records cast -> bite latencies per session, persists them,
+# and predicts when to "arm" high-rate capture so the quiet part of each cast can be
+# sampled slowly.
+
+DEFAULT_MODEL_FILE = "bite_timing.json"
+MODEL_VERSION = 1
+MAX_SESSIONS = 20 # Only keep the most recent sessions in the file
+MAX_SAMPLES_PER_SESSION = 500
+MIN_SAMPLES = 5 # Below this, fall back to the game's known minimum wait
+DEFAULT_MIN_LATENCY = 5.0 # 100 ticks, the shortest vanilla wait without Lure
+ARM_QUANTILE = 0.05 # Arm at the 5th percentile of observed latencies...
+ARM_MARGIN = 1.0 # ...minus this safety margin (seconds)
+
+
+def _latencies(values):
+    """A session's latencies as floats; raises TypeError on anything that isn't a list of numbers."""
+    if not isinstance(values, list) or not all(isinstance(x, (int, float)) and not isinstance(x, bool) for x in values):
+        raise TypeError("latencies must be a list of numbers")
+    return [float(x) for x in values]
+
+
+class BiteTimingModel:
+    def __init__(self, path=DEFAULT_MODEL_FILE):
+        self.path = path
+        self.sessions = [] # Previous sessions: lists of latencies (seconds)
+        self.current = [] # Latencies recorded in this session
+        self.cast_time = None
+        self.armed = False
+        self._history = [] # Sorted latencies from previous sessions plus this one
+        self.load()
+
+    # --- Persistence ---
+    def load(self):
+        """Reads previous sessions; any unreadable or malformed file leaves the model empty."""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            if not isinstance(data, dict):
+                raise TypeError("expected a JSON object")
+            if data.get("version") != MODEL_VERSION:
+                print(f"Ignoring {self.path}: unsupported version {data.get('version')}")
+                return
+            sessions = [_latencies(s["latencies"]) for s in data.get("sessions", [])][-MAX_SESSIONS:]
+            history = sorted(x for session in sessions for x in session)
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e: # ValueError covers bad JSON
+            print(f"Error reading {self.path}: {e}. Starting with an empty bite model.")
+            return
+        self.sessions = sessions
+        self._history = history
+
+    def save(self):
+        sessions = self.sessions + ([self.current] if self.current else [])
+        data = {
+            "version": MODEL_VERSION,
+            "saved": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "sessions": [{"latencies": [round(x, 3) for x in s]} for s in sessions[-MAX_SESSIONS:]],
+        }
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Error saving bite model to {self.path}: {e}")
+
+    # --- Events from the fishing loop ---
+    def on_cast(self, now):
+        """Called when the line is (re)cast."""
+        self.cast_time = now
+        self.armed = False
+
+    def on_bite(self, now):
+        """Called when a drop is detected. Returns the cast -> bite latency, or None if unknown."""
+        if self.cast_time is None:
+            return None
+        latency = now - self.cast_time
+        self.cast_time = None
+        if len(self.current) < MAX_SAMPLES_PER_SESSION:
+            self.current.append(latency)
+            # Keep the pooled history sorted for cheap quantiles
+            self._history.append(latency)
+            self._history.sort()
+        return latency
+
+    def reset_cast(self):
+        """Forget the current cast (e.g. the script was stopped)."""
+        self.cast_time = None
+        self.armed = False
+
+    # --- Prediction ---
+    def arm_delay(self):
+        """Seconds after a cast at which high-rate capture should start."""
+        if len(self._history) < MIN_SAMPLES:
+            return max(0.0, DEFAULT_MIN_LATENCY - ARM_MARGIN)
+        index = int(ARM_QUANTILE * (len(self._history) - 1))
+        return max(0.0, self._history[index] - ARM_MARGIN)
+
+    def arm_time(self):
+        """Absolute time to arm, or None if no cast is being timed."""
+        if self.cast_time is None:
+            return None
+        return self.cast_time + self.arm_delay()
+
+    def arm(self):
+        """Switches the current cast to high-rate capture; True the first time (for logging)."""
+        if self.cast_time is None or self.armed:
+            return False
+        self.armed = True
+        return True
+
+    def is_quiet(self, now):
+        """True while a bite is unlikely (between the cast and the predicted arm time)."""
+        arm_at = self.arm_time()
+        return arm_at is not None and now < arm_at
+
+    def summary(self):
+        if not self.current:
+            return "No bites timed this session."
+        avg = sum(self.current) / len(self.current)
+        return (f"Bite latency over {len(self.current)} casts: avg={avg:.2f}s "
+                f"min={min(self.current):.2f}s max={max(self.current):.2f}s; "
+                f"arming {self.arm_delay():.2f}s after each cast")
@@ -0,0 +1,128 @@
+import json
+import logging
+import logging.handlers
+import queue
+import time
+
+# --- Structured Event Logging ---
+# The fishing loop only ever puts records on a queue (QueueHandler); a QueueListener
+# thread does the slow console/file I/O. Per-frame results are aggregated into one
+# "frames" record per second, while bite/action events are logged in full.
+
+LOGGER_NAME = "fisher"
+LOG_FILE = "fisher_events.log"
+LOG_MAX_BYTES = 1_000_000 # Rotate the event log at ~1 MB
+LOG_BACKUP_COUNT = 3
+
+# Attributes every LogRecord has; anything else was passed through extra={...}
+_STANDARD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+def _event_fields(record):
+    return {k: v for k, v in vars(record).items() if k not in _STANDARD_ATTRS}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, message and all extra fields."""
+
+    def format(self, record):
+        entry = {
+            "time": round(record.created, 3),
+            "level": record.levelname,
+            "message": record.getMessage(),
+        }
+        entry.update(_event_fields(record))
+        return json.dumps(entry, default=str)
+
+
+class ConsoleFormatter(logging.Formatter):
+    """Human-readable line with the extra fields appended as key=value."""
+
+    def format(self, record):
+        line = super().format(record)
+        fields = _event_fields(record)
+        fields.pop("event", None)
+        if fields:
+            line += " " + " ".join(f"{k}={v}" for k, v in fields.items())
+        return line
+
+
+class EventOnlyFilter(logging.Filter):
+    """Lets through only structured records (those logged with an 'event' field)."""
+
+    def filter(self, record):
+        return hasattr(record, "event")
+
+
+def setup_logging(level=logging.INFO, log_file=LOG_FILE):
+    """
+    Configures the 'fisher' logger with a QueueHandler and starts the QueueListener.
+    Returns (logger, listener); call listener.stop() on exit to flush the queue.
+    """
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(ConsoleFormatter("%(asctime)s %(levelname)s %(message)s", "%H:%M:%S"))
+
+    file_handler = logging.handlers.RotatingFileHandler(
+        log_file, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding="utf-8"
+    )
+    file_handler.setFormatter(JsonFormatter())
+    file_handler.addFilter(EventOnlyFilter())
+
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(
+        log_queue, console_handler, file_handler, respect_handler_level=True
+    )
+
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.setLevel(level)
+    logger.handlers[:] = [logging.handlers.QueueHandler(log_queue)]
+    logger.propagate = False
+    listener.start()
+    return logger, listener
+
+
+class FrameAggregator:
+    """
+    Collects per-frame detection results and emits one 'frames' record per interval
+    instead of one line per frame.
+    """
+
+    def __init__(self, logger, interval=1.0):
+        self.logger = logger
+        self.interval = interval
+        self.window_start = time.monotonic()
+        self._reset()
+
+    def _reset(self):
+        self.frames = 0
+        self.found = 0
+        self.min_y = None
+        self.max_y = None
+        self.last_y = None
+
+    def add(self, current_y, now):
+        self.frames += 1
+        if current_y is not None:
+            self.found += 1
+            y = int(current_y)
+            self.last_y = y
+            self.min_y = y if self.min_y is None else min(self.min_y, y)
+            self.max_y = y if self.max_y is None else max(self.max_y, y)
+        if now - self.window_start >= self.interval:
+            self.flush(now)
+
+    def flush(self, now):
+        if self.frames:
+            self.logger.info(
+                "frames",
+                extra={
+                    "event": "frames",
+                    "frames": self.frames,
+                    "found": self.found,
+                    "min_y": self.min_y,
+                    "max_y": self.max_y,
+                    "last_y": self.last_y,
+                },
+            )
+        self.window_start = now
+        self._reset()
@@ -1,8 +1,19 @@
+import os
+import sys
 import time
-import mss
+import asyncio
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import pyautogui
 import numpy as np
 import keyboard  # Using 'keyboard' library for listening to key presses
+from stage_profiler import StageProfiler
+from fisher_logging import LOGGER_NAME, FrameAggregator, setup_logging
+from bite_timing import BiteTimingModel
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) # projects/, for automation_core
+from automation_core import capture, control, detection, watchdog
+from automation_core.window_tracker import WindowTracker
 
 # --- Configuration ---
 # BOX_SIZE = 400 # Size of the square region around the center to monitor
@@ -21,10 +32,9 @@ except Exception as e:
     monitor_height = 600
 else:
     # Calculate the region centered on the screen based on percentage
-    monitor_width = int(screenWidth * REGION_PERCENTAGE)
-    monitor_height = int(screenHeight * REGION_PERCENTAGE)
-    monitor_left = int(screenWidth / 2 - monitor_width / 2)
-    monitor_top = int(screenHeight / 2 - monitor_height / 2)
+    centered = detection.calculate_monitor_region(screenWidth, screenHeight, REGION_PERCENTAGE)
+    monitor_width, monitor_height = centered['width'], centered['height']
+    monitor_left, monitor_top = centered['left'], centered['top']
     # monitor_width = BOX_SIZE
     # monitor_height = BOX_SIZE
 
@@ -37,151 +47,613 @@ MONITOR_REGION = {
     'width': monitor_width,
     'height': monitor_height
 }
-print(f"Monitoring region set to: {MONITOR_REGION}")
+
+# Game window tracking (X11, automation_core.window_tracker): with a title and/or PID the
+# region is REGION_PERCENTAGE of the game window instead of the screen, follows the window
+# when it's moved or resized, and capture pauses while it's minimized, covered or closed.
+WINDOW_TITLE = None # e.g. "Minecraft" (case-insensitive, part of the title is enough)
+WINDOW_PID = None # e.g. the Java process ID, when several windows match the title
+WINDOW_RETRY_INTERVAL = 2.0 # Seconds between searches while the window isn't found
 
 # TODO: Define the target pixel color (R, G, B) or feature to track
 # TARGET_COLOR = (255, 0, 0) # Example: Bright Red
 TARGET_COLOR = (181, 36, 35)
 COLOR_TOLERANCE = 20 # Allowable difference +/- for each R,G,B channel
 
+# Bobber detector: "color" matches TARGET_COLOR; "template" matches the bobber's shape
+# (TEMPLATE_FILE, a BGRA crop saved with np.save) and keeps working at night, in rain
+# and with resource packs. Make a template with replay_detectors.py --make-template.
+# "subtitle" ignores the bobber: it captures only the bottom-right subtitle corner and
+# hooks when "Fishing Bobber splashes" appears (turn on Options > Accessibility > Show
+# Subtitles, and set SUBTITLE_GUI_SCALE to the game's GUI scale).
+DETECTOR = "color"
+TEMPLATE_FILE = "bobber_template.npy"
+TEMPLATE_THRESHOLD = 0.6 # Minimum normalized cross-correlation score (-1..1) for a match
+SUBTITLE_GUI_SCALE = 2 # Screen pixels per font pixel (Options > Video Settings > GUI Scale)
+SUBTITLE_THRESHOLD = 0.8 # Minimum phrase score (-1..1): lit pixels matched minus stray ones
+
 # TODO: Define the vertical movement threshold (in pixels)
 MOVEMENT_THRESHOLD = 3
 
 # TODO: Define the action cooldown (in seconds)
 # COOLDOWN = 1.0
 
+# Action sequence timing (in seconds)
+RECAST_DELAY = 2.0 # Pause between hooking the fish and recasting
+RECAST_SETTLE_DELAY = 1.5 # Ignore drops while the new bobber lands and settles
+FRAME_INTERVAL = 1/3 # Check roughly 3 times per second (armed / no cast being timed)
+QUIET_FRAME_INTERVAL = 1.0 # Slow sampling between a cast and the predicted bite window
+BITE_MODEL_FILE = "bite_timing.json" # Learned cast -> bite latencies, persisted across sessions
+
+# Screen capture backend (automation_core.capture): "auto" reads pixels only after X11
+# damage reports touch MONITOR_REGION (XDamage + MIT-SHM) where available, else polls
+# with mss; "mss" always polls; "damage" requires the X11 backend.
+CAPTURE_BACKEND = "auto"
+
+# Stall watchdog (automation_core.watchdog): each captured frame is fingerprinted (a CRC of
+# every STALL_FINGERPRINT_STRIDE-th pixel row/column). When the region hasn't changed for
+# STALL_FREEZE_AFTER seconds (game paused, hung or not rendering) detection stops, any
+# hook/recast is cancelled and capture drops to one probe every STALL_PROBE_INTERVAL.
+# The auto clicker is paused through its control socket (STALL_CLICKER_SOCKET, None to
+# leave it alone). Both resume on the first changed frame. None disables the watchdog.
+STALL_FREEZE_AFTER = 30.0
+STALL_PROBE_INTERVAL = 5.0
+STALL_FINGERPRINT_STRIDE = 8
+STALL_CLICKER_SOCKET = control.default_socket_path("auto_clicker") if control.AVAILABLE else None
+
+# Recording: keeps the last RECORD_CAPACITY captured frames and saves them on exit, for
+# replaying through the detectors (replay_detectors.py --frames ...)
+RECORD_FILE = None # e.g. 'fisher_frames.npz'
+RECORD_CAPACITY = 600 # About 3 minutes at the armed frame rate
+
+# Profiling
+TRACE_FILE = None # e.g. 'fisher_trace.json' to export per-frame spans (Chrome trace format) on exit
+TRACE_CAPACITY = 20000 # Max spans kept in memory for the trace export
+
+# Control socket for scripts (automation_core.control); None disables it
+CONTROL_SOCKET = control.default_socket_path("minecraft_fisher") if control.AVAILABLE else None
+
 # Control flag and key
 running = False
 toggle_key = 'ctrl+alt+s' # Key to start/stop the script
 exit_key = 'ctrl+alt+q' # Key to exit completely
+profile_key = 'ctrl+alt+p' # Key to log the per-stage timing summary
 
 # --- State Variables ---
+log = logging.getLogger(LOGGER_NAME) # Configured by setup_logging() when the script runs
 last_y = None
+last_found = False # Whether the last analyzed frame had the bobber (reused for unchanged frames)
+subtitle_shown = None # Subtitle detector: phrase on screen in the last frame (None: not known yet)
 # last_action_time = 0 # No longer needed, timing handled in perform_action
 
 # --- Helper Functions ---
 
+def make_detector():
+    """The configured detector (see DETECTOR); falls back to color if there's no template."""
+    if DETECTOR == "template":
+        try:
+            return detection.TemplateMatcher(np.load(TEMPLATE_FILE), TEMPLATE_THRESHOLD)
+        except OSError as e:
+            print(f"Template detector unavailable ({e}); using the color detector.")
+    if DETECTOR == "subtitle":
+        return detection.SubtitleMatcher(detection.SUBTITLE_TEXT, SUBTITLE_GUI_SCALE, SUBTITLE_THRESHOLD)
+    return detection.color_matcher(TARGET_COLOR, COLOR_TOLERANCE)
+
+def detector_region(width, height):
+    """Region to capture for the DETECTOR in use, relative to a width x height screen or window."""
+    if DETECTOR == "subtitle":
+        return detection.calculate_subtitle_region(width, height, SUBTITLE_GUI_SCALE)
+    return detection.calculate_monitor_region(width, height, REGION_PERCENTAGE)
+
+detector = make_detector()
+if DETECTOR == "subtitle":
+    MONITOR_REGION = detector_region(screenWidth, screenHeight) # Only the subtitle corner is captured
+
 def find_target_pixel(image_np):
     """
-    Placeholder function to find the y-coordinate of the target pixel/feature.
-    Needs implementation based on color or feature matching.
-    Returns the y-coordinate (relative to the region) or None if not found.
+    Returns the y-coordinate (relative to the region) of the bobber, or None if not found.
+    With the color detector that's the first pixel matching TARGET_COLOR within
+    COLOR_TOLERANCE; the search itself is the shared kernel in automation_core.detection.
     """
-    # Convert target color (RGB) to NumPy array
-    target_rgb = np.array(TARGET_COLOR, dtype=np.uint8)
-
-    # Calculate lower and upper bounds based on tolerance
-    # Clip values to ensure they stay within the valid 0-255 range
-    lower_bound = np.clip(target_rgb - COLOR_TOLERANCE, 0, 255)
-    upper_bound = np.clip(target_rgb + COLOR_TOLERANCE, 0, 255)
-
-    # image_np is BGRA from mss. We need to compare channels correctly:
-    # image B (idx 0) vs target B (idx 2)
-    # image G (idx 1) vs target G (idx 1)
-    # image R (idx 2) vs target R (idx 0)
-    in_range = np.logical_and.reduce((
-        image_np[:, :, 0] >= lower_bound[2], image_np[:, :, 0] <= upper_bound[2], # Blue check
-        image_np[:, :, 1] >= lower_bound[1], image_np[:, :, 1] <= upper_bound[1], # Green check
-        image_np[:, :, 2] >= lower_bound[0], image_np[:, :, 2] <= upper_bound[0]  # Red check
-    ))
-
-    # Find the coordinates of pixels within the tolerance range
-    matches = np.where(in_range)
-
-    # Example: Find first pixel matching TARGET_COLOR (within tolerance)
-    # This is a basic example and likely needs refinement
-    # target_rgb = np.array(TARGET_COLOR, dtype=np.uint8)
-    # image_np is BGRA, so compare RGB channels
-    # matches = np.where(np.all(image_np[:, :, :3] == target_rgb, axis=2))
-
-    if matches[0].size > 0:
-        # Consider returning the average y or the highest/lowest y if multiple matches are common
-        return matches[0][0] # Return the y-coordinate of the first match found
-    return None
-
-def perform_action():
-    """Performs the fishing action sequence: Hook, Pause, Recast."""
-    print("\nAction Triggered! Hooking fish...")
-    # pyautogui.rightClick()
-    print("- Right Click 1 (Hook)")
-
-    print(f"- Pausing for 2 seconds...")
-    time.sleep(2.0)
-
-    print("- Right Click 2 (Recast)")
-    # pyautogui.rightClick()
-    print("Action sequence complete.")
-    # Consider adding small random delays before/after clicks if needed
-
-# --- Main Loop ---
-
-print(f"Script inactive. Press '{toggle_key}' to start/stop. Press '{exit_key}' to quit.")
-
-def toggle_running():
-    global running, last_y
-    running = not running
-    last_y = None # Reset last position on toggle
-    status = "Running" if running else "Stopped"
-    print(f"\n--- Script {status} ---")
+    return detector(image_np)
 
-keyboard.add_hotkey(toggle_key, toggle_running)
-
-with mss.mss() as sct:
+class ActionSequence:
+    """
+    Timed state machine for the fishing action: Hook -> Wait -> Recast -> Settle.
+    Instead of blocking in time.sleep(), each step has a deadline and tick() advances
+    the sequence from the main loop, so hotkeys and frame analysis keep running.
+    cancel() aborts the sequence at any point.
+    """
+    IDLE = "idle"
+    WAITING = "waiting" # Fish hooked, waiting to recast
+    SETTLING = "settling" # Recast done, waiting for the bobber to settle
+
+    def __init__(self, recast_delay, settle_delay, on_recast=None):
+        self.recast_delay = recast_delay
+        self.settle_delay = settle_delay
+        self.on_recast = on_recast # Called with the recast time (the start of a new cast)
+        self.state = self.IDLE
+        self.deadline = None
+        self.recast_time = None
+        self.settle_times = [] # Measured recast -> target re-acquired times
+
+    @property
+    def busy(self):
+        return self.state != self.IDLE
+
+    def start(self, now):
+        """Hooks the fish and schedules the recast."""
+        if self.busy:
+            return
+        # pyautogui.rightClick()
+        log.info("Right Click 1 (Hook)", extra={"event": "hook", "recast_in": self.recast_delay})
+        self.state = self.WAITING
+        self.deadline = now + self.recast_delay
+
+    def cancel(self):
+        """Aborts the sequence wherever it is."""
+        if self.busy:
+            log.info("Action sequence cancelled", extra={"event": "cancel", "state": self.state})
+        self.state = self.IDLE
+        self.deadline = None
+        self.recast_time = None
+
+    def time_until_deadline(self, now):
+        """Seconds until the next step is due, or None when idle."""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - now)
+
+    def tick(self, now, target_found=False):
+        """Advances the sequence if its deadline has passed."""
+        if self.state == self.WAITING and now >= self.deadline:
+            log.info("Right Click 2 (Recast)", extra={"event": "recast"})
+            # pyautogui.rightClick()
+            # Consider adding small random delays before/after clicks if needed
+            self.state = self.SETTLING
+            self.recast_time = now
+            self.deadline = now + self.settle_delay
+            if self.on_recast is not None:
+                self.on_recast(now)
+        elif self.state == self.SETTLING and now >= self.deadline:
+            self.state = self.IDLE
+            self.deadline = None
+            log.info("Action sequence complete", extra={"event": "complete"})
+
+        # Measure how long the new bobber actually takes to show up after the recast
+        if self.recast_time is not None and target_found:
+            settle_time = now - self.recast_time
+            self.settle_times.append(settle_time)
+            self.recast_time = None
+            log.info(
+                "Bobber found after recast",
+                extra={"event": "settle", "settle_time": round(settle_time, 3), "settle_delay": self.settle_delay},
+            )
+
+    def settle_summary(self):
+        """Returns a one-line summary of the measured settle times."""
+        if not self.settle_times:
+            return "No settle times measured."
+        avg = sum(self.settle_times) / len(self.settle_times)
+        return (f"Settle times over {len(self.settle_times)} recasts: "
+                f"avg={avg:.2f}s min={min(self.settle_times):.2f}s max={max(self.settle_times):.2f}s "
+                f"(configured {self.settle_delay}s)")
+
+bite_model = BiteTimingModel(BITE_MODEL_FILE)
+action = ActionSequence(RECAST_DELAY, RECAST_SETTLE_DELAY, on_recast=bite_model.on_cast)
+
+# --- Async Runtime ---
+# Everything runs on one asyncio event loop:
+#   - Screen capture runs in a single-thread executor that owns one reusable capture
+#     backend (mss and Xlib handles are tied to the thread that created them).
+#   - Detection, bite decisions and the action sequence are coroutines on the loop.
+#   - The 'keyboard' hotkey callbacks run on keyboard's own thread and post into the
+#     loop with call_soon_threadsafe(), so no state is touched from two threads.
+#   - All scheduling uses loop.time() and asyncio.sleep(), never time.time()/time.sleep(),
+#     so simulate_fishing.py can run the same loop on a virtual clock (automation_core.clock).
+
+capture_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="capture")
+_capture = None # Capture backend, only ever touched from the capture thread
+
+loop = None # Set in main()
+running_event = None # Set while the script is running (replaces 0.1s polling while stopped)
+exit_event = None # Set by exit_key
+action_task = None # Drives the ActionSequence deadlines while an action is in progress
+window_tracker = None # WindowTracker when WINDOW_TITLE/WINDOW_PID is set (used on the loop thread only)
+window_visible = None # Set while the tracked window can be captured (always set without tracking)
+wakeups = {"capture": 0, "action": 0, "unchanged": 0, "stalled": 0} # Loop wakeup counts, logged on exit
+frame_log = FrameAggregator(log) # Per-frame results, logged once per second
+profiler = StageProfiler(
+    ("grab", "fingerprint", "detect", "decide", "act", "sleep"),
+    trace_capacity=TRACE_CAPACITY if TRACE_FILE else 0,
+)
+recorded_frames = deque(maxlen=RECORD_CAPACITY) if RECORD_FILE else None # Saved on exit
+
+def grab_frame():
+    """
+    Runs in the capture thread: grabs MONITOR_REGION as a BGRA array (None if the backend
+    knows the region hasn't changed since the last frame) and fingerprints it for the stall
+    watchdog. Returns both plus perf_counter_ns timestamps so the loop thread can record them.
+    """
+    global _capture
+    if _capture is None:
+        _capture, note = capture.open_capture(CAPTURE_BACKEND)
+        log.info(f"Capture backend: {_capture.name}" + (f" ({note})" if note else ""))
+    t0 = time.perf_counter_ns()
+    img_np = _capture.grab(MONITOR_REGION) # Backends return BGRA arrays
+    t1 = time.perf_counter_ns()
+    fingerprint = None if img_np is None else watchdog.frame_fingerprint(img_np, STALL_FINGERPRINT_STRIDE)
+    return img_np, fingerprint, t0, t1, time.perf_counter_ns()
+
+def close_capture():
+    """Runs in the capture thread: releases the capture backend."""
+    global _capture
+    if _capture is not None:
+        _capture.close()
+        _capture = None
+
+async def drive_action():
+    """Sleeps until each ActionSequence deadline and advances it. Cancelled on toggle/exit."""
+    while action.busy:
+        await asyncio.sleep(action.time_until_deadline(loop.time()))
+        wakeups["action"] += 1
+        action.tick(loop.time())
+
+def start_action(now):
+    global action_task
+    action.start(now)
+    action_task = loop.create_task(drive_action())
+
+def cancel_action():
+    action.cancel()
+    if action_task is not None and not action_task.done():
+        action_task.cancel()
+
+def handle_subtitle_frame(img_np, now):
+    """Subtitle detector: hooks when "Fishing Bobber splashes" appears (not while it stays up)."""
+    global subtitle_shown
+    t0 = time.perf_counter_ns()
+    row = detector(img_np)
+    t1 = time.perf_counter_ns()
+    profiler.record("detect", t0, t1)
+    action.tick(now) # The corner shows no bobber, so there's no settle time to measure
+    frame_log.add(row, now)
+    appeared = row is not None and subtitle_shown is False
+    subtitle_shown = row is not None
+    if appeared and not action.busy:
+        latency = bite_model.on_bite(now)
+        log.info(
+            "Bite subtitle",
+            extra={
+                "event": "bite",
+                "y": int(row),
+                "score": round(detector.last_score, 3),
+                "latency": None if latency is None else round(latency, 3),
+            },
+        )
+        t2 = time.perf_counter_ns()
+        profiler.record("decide", t1, t2)
+        start_action(now)
+        profiler.record("act", t2, time.perf_counter_ns())
+        return
+    profiler.record("decide", t1, time.perf_counter_ns())
+
+def handle_frame(img_np, now):
+    """Detection and bite decision for one captured frame."""
+    global last_y, last_found
+    if DETECTOR == "subtitle":
+        return handle_subtitle_frame(img_np, now)
+
+    # 2. Pixel Monitoring
+    t0 = time.perf_counter_ns()
+    current_y = find_target_pixel(img_np)
+    t1 = time.perf_counter_ns()
+    profiler.record("detect", t0, t1)
+    last_found = current_y is not None
+    action.tick(now, target_found=current_y is not None)
+    frame_log.add(current_y, now)
+
+    if current_y is not None:
+        if last_y is not None and not action.busy:
+            # 3. Movement Detection
+            delta_y = current_y - last_y
+
+            # 4. Threshold Trigger
+            # Ensure movement is downwards (positive delta_y); upward movement is ignored
+            if delta_y > MOVEMENT_THRESHOLD:
+                latency = bite_model.on_bite(now)
+                log.info(
+                    "Drop detected",
+                    extra={
+                        "event": "bite",
+                        "y": int(current_y),
+                        "delta_y": int(delta_y),
+                        "latency": None if latency is None else round(latency, 3),
+                    },
+                )
+                t2 = time.perf_counter_ns()
+                profiler.record("decide", t1, t2)
+                # 5. Action Execution (Hook, then Recast/Settle on the action task)
+                start_action(now)
+                profiler.record("act", t2, time.perf_counter_ns())
+                last_y = None # Reset last_y after action to look for new position
+                return
+
+        # Keep tracking while an action is in progress so the baseline is ready after settling
+        last_y = current_y
+    else:
+        last_y = None # Reset if target is lost
+    profiler.record("decide", t1, time.perf_counter_ns())
+
+# --- Stall Watchdog (runs on the event loop) ---
+def notify_clicker(cmd):
+    """Runs in the default executor: sends pause/resume to the auto clicker, if it's running."""
+    try:
+        client = control.ControlClient(STALL_CLICKER_SOCKET)
+        try:
+            result = client.call(cmd)
+        finally:
+            client.close()
+    except (OSError, RuntimeError) as e:
+        log.debug(f"Auto clicker not told to {cmd}: {e}")
+        return
+    log.info(f"Auto clicker {cmd}: {result}", extra={"event": "clicker_" + cmd, "result": result})
+
+def on_stall(frozen_for):
+    global last_y
+    cancel_action() # Clicks into a frozen game would go astray
+    bite_model.reset_cast() # The pause would be counted as bite latency
+    last_y = None
+    log.warning(f"No frame change for {frozen_for:.1f}s: game not rendering, pausing "
+                f"(probing every {STALL_PROBE_INTERVAL}s)", extra={"event": "stall", "frozen_for": round(frozen_for, 1)})
+    if STALL_CLICKER_SOCKET:
+        loop.run_in_executor(None, notify_clicker, "pause")
+
+def on_resume(stalled_for):
+    log.info(f"Frames changing again after {stalled_for:.1f}s, resuming",
+             extra={"event": "stall_end", "stalled_for": round(stalled_for, 1)})
+    if STALL_CLICKER_SOCKET:
+        loop.run_in_executor(None, notify_clicker, "resume")
+
+# Not with the subtitle detector: its corner of the screen can legitimately stay unchanged
+# for minutes, and a probe every STALL_PROBE_INTERVAL would miss the 3-second splash subtitle
+stall_watchdog = watchdog.StallWatchdog(
+    STALL_FREEZE_AFTER if STALL_FREEZE_AFTER and DETECTOR != "subtitle" else float("inf"),
+    on_stall=on_stall, on_resume=on_resume,
+)
+
+async def capture_loop():
+    """Captures and analyzes one frame every FRAME_INTERVAL while running."""
     while True:
-        if keyboard.is_pressed(exit_key):
-            print("Exit key pressed. Exiting...")
-            break
-
         if not running:
-            time.sleep(0.1) # Sleep briefly when not running
+            stall_watchdog.suspend(loop.time())
+            await running_event.wait() # No wakeups at all while stopped
+        if not window_visible.is_set():
+            stall_watchdog.suspend(loop.time())
+            await window_visible.wait() # Game window hidden, covered or closed: no captures either
+            continue # Re-check running
+        frame_start = loop.time()
+
+        # 1. Screen Capture (off the loop thread)
+        img_np, fingerprint, grab_start, grab_end, fingerprint_end = await loop.run_in_executor(capture_executor, grab_frame)
+        wakeups["capture"] += 1
+        profiler.next_frame()
+        profiler.record("grab", grab_start, grab_end)
+        profiler.record("fingerprint", grab_end, fingerprint_end)
+        if stall_watchdog.observe(fingerprint, loop.time()):
+            # Game not rendering: nothing to detect, just probe for it to come back
+            wakeups["stalled"] += 1
+            sleep_start = time.perf_counter_ns()
+            await asyncio.sleep(max(0.0, frame_start + STALL_PROBE_INTERVAL - loop.time()))
+            profiler.record("sleep", sleep_start, time.perf_counter_ns())
             continue
-
-        current_time = time.time()
-
-        # 1. Screen Capture
-        img = sct.grab(MONITOR_REGION)
-        img_np = np.array(img) # Convert to numpy array (BGRA format)
-
-        # 2. Pixel Monitoring
-        current_y = find_target_pixel(img_np)
-
-        if current_y is not None:
-            print(f"Target found at y={current_y}", end='\r') # Use carriage return to overwrite line
-            if last_y is not None:
-                # 3. Movement Detection
-                delta_y = current_y - last_y
-
-                # 4. Threshold Trigger
-                if abs(delta_y) > MOVEMENT_THRESHOLD:
-                    # Ensure movement is downwards (positive delta_y)
-                    if delta_y > MOVEMENT_THRESHOLD:
-                        print(f"\nDrop detected! Delta Y: {delta_y}")
-                        # 5. Action Execution (Hook, Pause, Recast)
-                        # Cooldown check removed, handled by sleep within perform_action
-                        # if current_time - last_action_time > COOLDOWN:
-                        perform_action()
-                        # last_action_time = current_time
-                        last_y = None # Reset last_y after action to look for new position
-                        # print(f"Action performed. Cooling down for {COOLDOWN}s...")
-                        # time.sleep(COOLDOWN) # Cooldown removed, handled by sleep within perform_action
-                        # else:
-                        #     print("Cooldown active...")
-                    else:
-                        # Optional: Log upward movement if needed for debugging
-                        # print(f"\nUpward movement detected (ignored): {delta_y}")
-                        pass # Ignore upward movement exceeding threshold
-
-            # Update last known position if it was valid
-            # Only update if no action was taken in this cycle
-            if current_y is not None: # Re-check current_y validity before assigning
-                last_y = current_y
+        if img_np is None:
+            # Region unchanged: same detection result as the last frame, nothing to analyze
+            wakeups["unchanged"] += 1
+            action.tick(loop.time(), target_found=last_found)
+        else:
+            if recorded_frames is not None:
+                recorded_frames.append(img_np)
+            if running: # Skip frames that finished after a stop
+                handle_frame(img_np, loop.time())
+
+        # Sleep until the next frame is due: slowly while the bite model says a bite is
+        # unlikely, at full rate once armed (or when no cast is being timed)
+        now = loop.time()
+        if bite_model.is_quiet(now):
+            next_frame = min(frame_start + QUIET_FRAME_INTERVAL, bite_model.arm_time())
         else:
-            print("Target not found in region...", end='\r')
-            last_y = None # Reset if target is lost
+            if bite_model.arm():
+                log.info("Armed high-rate capture", extra={"event": "armed", "since_cast": round(now - bite_model.cast_time, 3)})
+            next_frame = frame_start + FRAME_INTERVAL
+        sleep_start = time.perf_counter_ns()
+        await asyncio.sleep(max(0.0, next_frame - loop.time()))
+        profiler.record("sleep", sleep_start, time.perf_counter_ns())
 
-        # Small delay to prevent high CPU usage
-        # time.sleep(0.05)
-        # Check roughly 3 times per second
-        time.sleep(1/3)
+def toggle_running():
+    """Runs on the event loop (posted from the hotkey thread)."""
+    global running, last_y, subtitle_shown
+    running = not running
+    last_y = None # Reset last position on toggle
+    subtitle_shown = None # A subtitle already up when starting is not a new bite
+    cancel_action() # Abort any hook/recast in progress
+    bite_model.reset_cast() # The current cast can no longer be timed reliably
+    if running:
+        running_event.set()
+    else:
+        running_event.clear()
+    status = "Running" if running else "Stopped"
+    log.info(f"Script {status}", extra={"event": "toggle", "running": running})
+
+# --- Window Tracking (runs on the event loop) ---
+def apply_window_state():
+    """Moves MONITOR_REGION with the game window and pauses capture while it can't be seen."""
+    global MONITOR_REGION, last_y, subtitle_shown
+    region = window_tracker.region
+    if region is not None and region != MONITOR_REGION:
+        MONITOR_REGION = region # Replaced, not mutated: the capture thread may be reading the old one
+        last_y = None # Rows in the old region aren't comparable with the new one
+        subtitle_shown = None
+        log.info(f"Monitoring region set to: {MONITOR_REGION}", extra={"event": "region", **MONITOR_REGION})
+    if window_tracker.capturable and not window_visible.is_set():
+        window_visible.set()
+        log.info("Game window visible, capturing", extra={"event": "window", "visible": True})
+    elif not window_tracker.capturable and window_visible.is_set():
+        window_visible.clear()
+        cancel_action() # A hook/recast into a hidden window would go astray
+        log.info("Game window not visible, capture paused", extra={"event": "window", "visible": False})
+
+def on_window_events():
+    """fd readable: handle the tracker's X events."""
+    if window_tracker.process_events():
+        apply_window_state()
+
+async def track_window():
+    """Finds the window (again, after it's closed) and handles events Xlib has already queued."""
+    while True:
+        if window_tracker.window is None and window_tracker.find():
+            log.info(f"Tracking window '{window_tracker.name}' at {window_tracker.geometry}",
+                     extra={"event": "window_found", "window": window_tracker.window})
+            apply_window_state()
+        on_window_events() # Events read from the socket during find() don't make the fd readable
+        await asyncio.sleep(WINDOW_RETRY_INTERVAL)
+
+def start_window_tracking():
+    """Returns the track_window() task, or None when tracking is off or unavailable."""
+    global window_tracker
+    if WINDOW_TITLE is None and WINDOW_PID is None:
+        return None
+    try:
+        window_tracker = WindowTracker(WINDOW_TITLE, WINDOW_PID, REGION_PERCENTAGE, region_fn=detector_region)
+    except OSError as e:
+        log.warning(f"Window tracking unavailable ({e}); monitoring the screen center")
+        return None
+    window_visible.clear() # Nothing to capture until the window is found
+    loop.add_reader(window_tracker.fd, on_window_events)
+    return asyncio.create_task(track_window())
+
+def stop_window_tracking(task):
+    if task is not None:
+        task.cancel()
+    if window_tracker is not None:
+        loop.remove_reader(window_tracker.fd)
+        window_tracker.close()
+
+def log_profile():
+    log.info("Stage timings (ms):\n" + profiler.summary())
+
+# --- Control Socket Commands (run on the event loop) ---
+def control_set_running(value):
+    if value != running:
+        toggle_running()
+    return {"running": running}
+
+def control_set_interval(seconds):
+    """Changes the armed frame interval from the next frame on."""
+    global FRAME_INTERVAL
+    try:
+        seconds = float(seconds)
+    except (TypeError, ValueError):
+        raise ValueError(f"interval must be a number of seconds, got {seconds!r}")
+    if seconds <= 0:
+        raise ValueError("interval must be positive")
+    FRAME_INTERVAL = seconds
+    return {"interval": FRAME_INTERVAL}
+
+def control_metrics():
+    return {
+        "running": running,
+        "action_state": action.state,
+        "wakeups": dict(wakeups),
+        "bites": len(bite_model.current),
+        "arm_delay": bite_model.arm_delay(),
+        "recasts_timed": len(action.settle_times),
+        "frame_interval": FRAME_INTERVAL,
+        "monitor_region": MONITOR_REGION,
+        "watchdog": stall_watchdog.summary(loop.time()),
+        "window": None if window_tracker is None else {
+            "name": window_tracker.name, "geometry": window_tracker.geometry,
+            "capturable": window_tracker.capturable, "configure_events": window_tracker.configure_events,
+        },
+        "stage_timings": profiler.summary(),
+    }
+
+CONTROL_COMMANDS = {
+    "start": lambda: control_set_running(True),
+    "stop": lambda: control_set_running(False),
+    "toggle": lambda: control_set_running(not running),
+    "set_interval": control_set_interval,
+    "metrics": control_metrics,
+    "exit": lambda: exit_event.set(),
+}
 
-print("\nScript finished.") 
\ No newline at end of file
+async def main():
+    global loop, running_event, exit_event, window_visible
+    loop = asyncio.get_running_loop()
+    running_event = asyncio.Event()
+    exit_event = asyncio.Event()
+    window_visible = asyncio.Event()
+    window_visible.set()
+
+    # Hotkeys fire on keyboard's listener thread; hand them to the loop
+    keyboard.add_hotkey(toggle_key, lambda: loop.call_soon_threadsafe(toggle_running))
+    keyboard.add_hotkey(exit_key, lambda: loop.call_soon_threadsafe(exit_event.set))
+    keyboard.add_hotkey(profile_key, lambda: loop.call_soon_threadsafe(log_profile))
+
+    log.info(f"Monitoring region set to: {MONITOR_REGION}")
+    log.info(f"Script inactive. Press '{toggle_key}' to start/stop. Press '{exit_key}' to quit.")
+
+    control_server = None
+    if CONTROL_SOCKET:
+        try:
+            control_server = await control.serve_asyncio(CONTROL_SOCKET, CONTROL_COMMANDS)
+            log.info(f"Control socket listening on {CONTROL_SOCKET}")
+        except OSError as e:
+            log.warning(f"Control socket disabled: {e}")
+
+    window_task = start_window_tracking()
+    capture_task = asyncio.create_task(capture_loop())
+    try:
+        await exit_event.wait()
+        log.info("Exit key pressed. Exiting...")
+    finally:
+        cancel_action()
+        stall_watchdog.suspend(loop.time()) # Hands a paused clicker back
+        capture_task.cancel()
+        try:
+            await capture_task
+        except asyncio.CancelledError:
+            pass
+        stop_window_tracking(window_task)
+        keyboard.unhook_all_hotkeys()
+        if control_server is not None:
+            control_server.close() # Not wait_closed(): that would wait for connected clients to hang up
+            try:
+                os.unlink(CONTROL_SOCKET)
+            except OSError:
+                pass
+        await loop.run_in_executor(capture_executor, close_capture)
+        capture_executor.shutdown(wait=True)
+
+# --- Main ---
+
+if __name__ == "__main__":
+    log_listener = setup_logging()[1]
+    try:
+        asyncio.run(main())
+        frame_log.flush(time.monotonic())
+        log.info(action.settle_summary())
+        log.info(bite_model.summary())
+        bite_model.save()
+        log_profile()
+        if TRACE_FILE:
+            profiler.export_chrome_trace(TRACE_FILE)
+        if recorded_frames:
+            np.savez_compressed(RECORD_FILE, frames=np.stack(recorded_frames))
+            log.info(f"Saved {len(recorded_frames)} frames to {RECORD_FILE}")
+        log.info(f"Loop wakeups: {wakeups['capture']} capture ({wakeups['unchanged']} unchanged, "
+                 f"{wakeups['stalled']} stalled), {wakeups['action']} action")
+        log.info(f"Stall watchdog: {stall_watchdog.stalls} stalls. {stall_watchdog.savings.describe()}")
+        log.info("Script finished.")
+    finally:
+        log_listener.stop() # Drains the queue before exiting
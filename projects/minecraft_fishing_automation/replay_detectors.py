@@ -0,0 +1,262 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) # projects/, for automation_core
+from automation_core.detection import (SubtitleMatcher, TemplateMatcher, calculate_subtitle_region, color_matcher,
+                                       detect_movement, phrase_bitmap)
+
+# --- Detector Replay ---
+# Runs the color matcher and the FFT template matcher over the same frames and compares
+# time per frame and what they find. Without --frames it builds synthetic sessions with
+# known bobber positions (day, night, rain tint, a resource pack's recolored bobber) and
+# scores both detectors against that ground truth; with frames recorded by the fisher
+# (RECORD_FILE) it reports timing and how often the two agree.
+#
+# --subtitles does the same for the subtitle detector on the bottom-right corner: synthetic
+# casts where "Fishing Bobber thrown", "... splashes" and "... retrieved" appear, stack up
+# and fade, scored on whether each splash triggers exactly one hook (or, with --frames
+# recorded in DETECTOR = "subtitle" mode, how many hooks it would have triggered).
+#
+# Usage:
+#   python replay_detectors.py                                  # synthetic scenarios
+#   python replay_detectors.py --frames fisher_frames.npz --template bobber_template.npy
+#   python replay_detectors.py --frames fisher_frames.npz --make-template bobber_template.npy
+#   python replay_detectors.py --subtitles [--frames fisher_frames.npz]
+
+# Same defaults as minecraft_auto_fisher.py
+TARGET_COLOR = (181, 36, 35)
+COLOR_TOLERANCE = 20
+MOVEMENT_THRESHOLD = 3
+TEMPLATE_THRESHOLD = 0.6
+SUBTITLE_GUI_SCALE = 2
+SUBTITLE_THRESHOLD = 0.8
+
+REGION = (162, 288) # 15% of a 1080p screen
+BOBBER_Y, BOBBER_X = 60, 140
+DIP_PIXELS = MOVEMENT_THRESHOLD + 3
+
+
+def bobber_sprite(red=(181, 36, 35), white=(230, 230, 230)):
+    """7x7 BGRA bobber: red cap over a white body, dark line through the middle."""
+    sprite = np.zeros((7, 7, 4), dtype=np.uint8)
+    sprite[:, :, 3] = 255
+    sprite[:, :, :3] = (90, 60, 30) # Water behind the sprite's corners
+    sprite[0:3, 2:5, :3] = red[::-1]
+    sprite[3, 1:6, :3] = (25, 25, 25)
+    sprite[4:7, 2:5, :3] = white[::-1]
+    return sprite
+
+
+def synthetic_session(rng, frames, sprite, tint=(1.0, 1.0, 1.0), brightness=1.0):
+    """Frames of textured water with the sprite bobbing and dipping now and then; returns (frames, truth rows)."""
+    height, width = REGION
+    images, truth = [], []
+    for i in range(frames):
+        water = np.empty((height, width, 4), dtype=np.float64)
+        water[:, :, 0] = rng.normal(140, 12, (height, width)) # B
+        water[:, :, 1] = rng.normal(75, 10, (height, width))  # G
+        water[:, :, 2] = rng.normal(35, 8, (height, width))   # R
+        water[:, :, 3] = 255
+        if i % 25 in (20, 21, 22, 23, 24):
+            y = None # Reeled in / recasting
+        else:
+            y = BOBBER_Y + (DIP_PIXELS if i % 25 == 12 else 0) + int(rng.integers(-1, 2))
+            water[y:y + 7, BOBBER_X:BOBBER_X + 7] = sprite
+        water[:, :, :3] *= np.array(tint[::-1]) * brightness # tint is (R, G, B)
+        images.append(np.clip(water, 0, 255).astype(np.uint8))
+        truth.append(None if y is None else (y, y + 6)) # Sprite's first and last rows
+    return images, truth
+
+
+def evaluate(detector, frames, truth=None):
+    """Runs `detector` over the frames: timing, detections, bites, and hits/false hits if the truth is known."""
+    times, rows = [], []
+    for frame in frames:
+        start = time.perf_counter()
+        rows.append(detector(frame))
+        times.append(time.perf_counter() - start)
+    times.sort()
+    result = {
+        "mean_us": sum(times) / len(times) * 1e6,
+        "p99_us": times[min(len(times) - 1, int(0.99 * len(times)))] * 1e6,
+        "found": sum(row is not None for row in rows),
+        "rows": rows,
+    }
+    # Bites: downward moves past the threshold, as the fisher's handle_frame sees them
+    bites, last_y = 0, None
+    for row in rows:
+        moved, delta_y = detect_movement(row, last_y, MOVEMENT_THRESHOLD)
+        bites += moved and delta_y > 0
+        last_y = row
+    result["bites"] = bites
+    if truth is not None:
+        # A hit is any row on the sprite: the color match reports its top, the template its center
+        on_bobber = [r is not None and t is not None and t[0] <= r <= t[1] for r, t in zip(rows, truth)]
+        result["hits"] = sum(on_bobber)
+        result["false"] = sum(r is not None and not hit for r, hit in zip(rows, on_bobber))
+    return result
+
+
+def locate_color(frame):
+    """(y, x) of the first TARGET_COLOR pixel (for cutting a template), or None."""
+    row = color_matcher(TARGET_COLOR, COLOR_TOLERANCE)(frame)
+    if row is None:
+        return None
+    r, g, b = TARGET_COLOR
+    line = frame[row, :, :3].astype(int)
+    distance = np.abs(line - (b, g, r)).max(axis=1)
+    return row, int(distance.argmin())
+
+
+def make_template(frames, path, size):
+    for frame in frames:
+        hit = locate_color(frame)
+        if hit is not None:
+            y, x = hit
+            # The color match is the bobber's top red pixel: start the crop just above it
+            top, left = max(0, y - 1), max(0, x - size // 2)
+            np.save(path, frame[top:top + size, left:left + size])
+            print(f"Saved a {size}x{size} template cut at y={top}, x={left} to {path}")
+            return
+    print("The color matcher found no bobber in these frames; no template saved")
+
+
+# --- Subtitle Scenarios ---
+SUBTITLE_EVENTS = ((0, "Fishing Bobber thrown"), (12, "Fishing Bobber splashes"), (14, "Fishing Bobber retrieved"))
+SUBTITLE_FRAMES = 9 # About 3 seconds at the fisher's armed frame rate
+
+
+def subtitle_session(rng, frames, brightness=1.0):
+    """Subtitle-corner frames for casts of 25 frames; returns (frames, indices where a splash appears)."""
+    region = calculate_subtitle_region(1920, 1080, SUBTITLE_GUI_SCALE)
+    height, width = region['height'], region['width']
+    scale = SUBTITLE_GUI_SCALE
+    images, splashes = [], []
+    for i in range(frames):
+        scene = np.empty((height, width, 4), dtype=np.float64)
+        scene[:, :, :3] = rng.normal(110, 30, (height, width, 3)) * brightness # Terrain/sky behind the box
+        scene[:, :, 3] = 255
+        # Subtitles shown now, oldest first; the newest is drawn on the bottom line
+        lines = []
+        for start, text in SUBTITLE_EVENTS:
+            age = (i - start) % 25
+            if age < SUBTITLE_FRAMES and i >= start:
+                lines.append((age, text))
+                if age == 0 and "splashes" in text:
+                    splashes.append(i)
+        lines.sort(reverse=True)
+        if lines:
+            box_width = max(phrase_bitmap(text, scale).shape[1] for _, text in lines) + 4 * scale
+            box_top = (41 - 10 * (len(lines) - 1)) * scale - scale
+            scene[box_top:(41 + 8) * scale + scale, width - box_width:, :3] *= 0.2 # Translucent black box
+            for line, (age, text) in enumerate(reversed(lines)):
+                bitmap = phrase_bitmap(text, scale)
+                top = (41 - 10 * line) * scale
+                left = width - box_width + (box_width - bitmap.shape[1]) // 2
+                scene[top:top + bitmap.shape[0], left:left + bitmap.shape[1], :3][bitmap] = 255 - age * 18 # Fading
+        images.append(np.clip(scene, 0, 255).astype(np.uint8))
+    return images, splashes
+
+
+def subtitle_triggers(rows):
+    """Frame indices where the phrase appears, as the fisher's handle_subtitle_frame hooks on them."""
+    triggers, shown = [], None
+    for i, row in enumerate(rows):
+        if row is not None and shown is False:
+            triggers.append(i)
+        shown = row is not None
+    return triggers
+
+
+def replay_subtitles(args):
+    matcher = SubtitleMatcher(gui_scale=SUBTITLE_GUI_SCALE, threshold=SUBTITLE_THRESHOLD)
+    print(f"  {'scenario':<10} {'mean us':>9} {'p99 us':>9} {'found':>6} {'hooks':>6} {'hits':>6} {'false':>6}")
+    if args.frames:
+        frames = list(np.load(args.frames)["frames"])
+        result = evaluate(matcher, frames)
+        print(f"  {'recorded':<10} {result['mean_us']:>9.1f} {result['p99_us']:>9.1f} "
+              f"{result['found']:>6} {len(subtitle_triggers(result['rows'])):>6}")
+        return
+    rng = np.random.default_rng(args.seed)
+    for scenario, brightness in (("day", 1.0), ("night", 0.35)):
+        frames, splashes = subtitle_session(rng, args.count, brightness)
+        result = evaluate(matcher, frames)
+        triggers = subtitle_triggers(result["rows"])
+        hits = len(set(triggers) & set(splashes))
+        print(f"  {scenario:<10} {result['mean_us']:>9.1f} {result['p99_us']:>9.1f} {result['found']:>6} "
+              f"{len(triggers):>6} {hits:>6} {len(triggers) - hits:>6}   ({len(splashes)} splashes)")
+
+
+def print_row(name, result, truth_known):
+    line = (f"  {name:<10} {result['mean_us']:>9.1f} {result['p99_us']:>9.1f} "
+            f"{result['found']:>6} {result['bites']:>6}")
+    if truth_known:
+        line += f" {result['hits']:>6} {result['false']:>6}"
+    print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the color and template bobber detectors on replayed frames.")
+    parser.add_argument("--frames", help="Frames recorded by the fisher (.npz with a 'frames' array)")
+    parser.add_argument("--template", help="Template for the template matcher (.npy, BGRA crop)")
+    parser.add_argument("--make-template", metavar="PATH", help="Cut a template from --frames and save it")
+    parser.add_argument("--template-size", type=int, default=9)
+    parser.add_argument("--count", type=int, default=200, help="Frames per synthetic scenario")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--subtitles", action="store_true", help="Replay the subtitle detector instead")
+    args = parser.parse_args()
+
+    if args.subtitles:
+        replay_subtitles(args)
+        return
+
+    header = f"  {'detector':<10} {'mean us':>9} {'p99 us':>9} {'found':>6} {'bites':>6}"
+    if args.frames:
+        frames = list(np.load(args.frames)["frames"])
+        if args.make_template:
+            make_template(frames, args.make_template, args.template_size)
+            return
+        if not args.template:
+            parser.error("--template (or --make-template) is needed with --frames")
+        detectors = {
+            "color": color_matcher(TARGET_COLOR, COLOR_TOLERANCE),
+            "template": TemplateMatcher(np.load(args.template), TEMPLATE_THRESHOLD),
+        }
+        print(f"{len(frames)} recorded frames, {frames[0].shape[1]}x{frames[0].shape[0]}")
+        print(header)
+        results = {name: evaluate(detector, frames) for name, detector in detectors.items()}
+        for name, result in results.items():
+            print_row(name, result, truth_known=False)
+        agree = sum((a is None) == (b is None) for a, b in zip(results["color"]["rows"], results["template"]["rows"]))
+        print(f"  Agree on bobber present/absent in {agree}/{len(frames)} frames")
+        return
+
+    rng = np.random.default_rng(args.seed)
+    template = bobber_sprite()
+    scenarios = {
+        "day": dict(sprite=template),
+        "night": dict(sprite=template, brightness=0.35),
+        "rain tint": dict(sprite=template, tint=(0.75, 0.85, 1.1), brightness=0.8),
+        "recolored": dict(sprite=bobber_sprite(red=(220, 110, 40))), # Resource pack bobber
+    }
+    detectors = {
+        "color": color_matcher(TARGET_COLOR, COLOR_TOLERANCE),
+        "template": TemplateMatcher(template, TEMPLATE_THRESHOLD),
+    }
+    print(f"Synthetic sessions: {args.count} frames of {REGION[1]}x{REGION[0]} each; "
+          f"bobber in view in 80% of frames, one dip per 25 frames")
+    for scenario, options in scenarios.items():
+        frames, truth = synthetic_session(rng, args.count, **options)
+        expected_bites = sum(1 for i in range(args.count) if i % 25 == 12)
+        print(f"\n[{scenario}] in view: {sum(t is not None for t in truth)}, dips: {expected_bites}")
+        print(header + f" {'hits':>6} {'false':>6}")
+        for name, detector in detectors.items():
+            print_row(name, evaluate(detector, frames, truth), truth_known=True)
+
+
+if __name__ == "__main__":
+    main()
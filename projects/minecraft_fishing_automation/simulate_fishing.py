@@ -0,0 +1,145 @@
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) # projects/, for automation_core
+from automation_core.clock import InlineExecutor, VirtualClock
+import minecraft_auto_fisher as fisher
+from bite_timing import BiteTimingModel
+
+# --- Fishing Simulation ---
+# Runs the fisher's real capture loop, detection and action sequence on a virtual-time
+# event loop, with synthetic frames instead of screen captures. A multi-hour session
+# finishes in seconds; the wall time is the per-frame work plus scheduling overhead,
+# with no sleeping. Nothing is clicked and bite_timing.json is not touched.
+#
+# Usage:
+#   python simulate_fishing.py --hours 2
+#
+# The simulated world: after each cast the bobber shows up RECAST_SETTLE_DELAY later,
+# a fish bites after a random 5-30s wait (vanilla, no Lure) and the bobber dips for
+# DIP_DURATION seconds. A hooked fish removes the bobber until the next recast. The water
+# is animated (one pixel changes every frame), except during --freeze, when the game
+# stops rendering and every frame repeats the last one, which trips the stall watchdog.
+
+BOBBER_Y = 20 # Bobber row in the synthetic frame
+DIP_PIXELS = fisher.MOVEMENT_THRESHOLD + 3
+DIP_DURATION = 0.8
+BITE_WAIT = (5.0, 30.0)
+
+
+class SimulatedWater:
+    def __init__(self, rng):
+        self.rng = rng
+        self.cast_time = None
+        self.bite_time = None
+        self.casts = 0
+        self.freeze = None # (start, end) of a simulated game freeze
+        self.last_frame = None
+        height, width = fisher.MONITOR_REGION['height'], fisher.MONITOR_REGION['width']
+        self.empty = np.zeros((height, width, 4), dtype=np.uint8)
+        self.bobber_x = width // 2
+        r, g, b = fisher.TARGET_COLOR
+        self.color = (b, g, r, 255) # mss frames are BGRA
+
+    def cast(self, now):
+        self.cast_time = now
+        self.bite_time = now + self.rng.uniform(*BITE_WAIT)
+        self.casts += 1
+
+    def frame(self, now):
+        """BGRA frame at `now` with the bobber drawn where it would be."""
+        if self.freeze is not None and self.freeze[0] <= now < self.freeze[1] and self.last_frame is not None:
+            return self.last_frame # Game frozen: nothing is redrawn
+        img = self.empty.copy()
+        img[0, 0, 0] = int(now * 20) % 256 # Water animation
+        self.last_frame = img
+        if self.cast_time is None or fisher.action.state == fisher.ActionSequence.WAITING:
+            return img # Line reeled in (fish hooked), waiting for the recast
+        if now < self.cast_time + fisher.RECAST_SETTLE_DELAY:
+            return img # Bobber still flying/landing
+        y = BOBBER_Y
+        if self.bite_time <= now < self.bite_time + DIP_DURATION:
+            y += DIP_PIXELS
+        elif now >= self.bite_time + DIP_DURATION:
+            self.bite_time = now + self.rng.uniform(*BITE_WAIT) # Missed it: another fish later
+        img[y, self.bobber_x] = self.color
+        return img
+
+
+async def run_session(seconds, water):
+    loop = asyncio.get_running_loop()
+    fisher.loop = loop
+    fisher.running = True
+    fisher.running_event = asyncio.Event()
+    fisher.running_event.set()
+    fisher.window_visible = asyncio.Event()
+    fisher.window_visible.set() # No window tracking in the simulation
+
+    def grab_frame():
+        t0 = time.perf_counter_ns()
+        img_np = water.frame(loop.time())
+        t1 = time.perf_counter_ns()
+        return img_np, fisher.watchdog.frame_fingerprint(img_np, fisher.STALL_FINGERPRINT_STRIDE), t0, t1, time.perf_counter_ns()
+    fisher.grab_frame = grab_frame
+    fisher.capture_executor = InlineExecutor()
+
+    # The first cast is done by hand in the real game
+    water.cast(loop.time())
+    fisher.bite_model.on_cast(loop.time())
+    capture_task = asyncio.create_task(fisher.capture_loop())
+    await asyncio.sleep(seconds)
+    fisher.cancel_action()
+    capture_task.cancel()
+    try:
+        await capture_task
+    except asyncio.CancelledError:
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate a fishing session on virtual time.")
+    parser.add_argument("--hours", type=float, default=1.0, help="Simulated session length")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--freeze", type=float, default=0.0, metavar="MINUTES",
+                        help="Freeze the game for this long halfway through the session")
+    args = parser.parse_args()
+
+    water = SimulatedWater(random.Random(args.seed))
+    if args.freeze:
+        start = args.hours * 3600 / 2
+        water.freeze = (start, start + args.freeze * 60)
+    fisher.STALL_CLICKER_SOCKET = None # Never pause a real clicker from a simulation
+    # Fresh bite model in a scratch file, so the real bite_timing.json is neither used nor changed
+    fisher.bite_model = BiteTimingModel(os.path.join(tempfile.mkdtemp(), "bite_timing.json"))
+    fisher.action.on_recast = lambda now: (water.cast(now), fisher.bite_model.on_cast(now))
+
+    clock = VirtualClock()
+    loop = clock.new_event_loop()
+    wall_start = time.perf_counter()
+    try:
+        loop.run_until_complete(run_session(args.hours * 3600, water))
+    finally:
+        loop.close()
+    wall = time.perf_counter() - wall_start
+
+    frames = fisher.wakeups["capture"]
+    print(f"Simulated {clock.now() / 3600:.2f}h in {wall:.3f}s wall ({clock.now() / wall:,.0f}x real time)")
+    print(f"Casts: {water.casts} | Frames: {frames} ({frames / clock.now():.2f}/s) | "
+          f"Action wakeups: {fisher.wakeups['action']} | Stalled probes: {fisher.wakeups['stalled']}")
+    print(fisher.bite_model.summary())
+    print(fisher.action.settle_summary())
+    print(f"Stall watchdog ({fisher.stall_watchdog.stalls} stalls, CPU per simulated second): "
+          f"{fisher.stall_watchdog.savings.describe(clock.now())}")
+    print(f"Wall time per frame (capture stand-in, detection, scheduling): {wall / max(1, frames) * 1e6:.1f}us")
+    print("Stage timings (ms):\n" + fisher.profiler.summary())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import json
+import os
+import time
+from collections import deque
+
+# --- Stage Profiler ---
+# Low-overhead timing for the fishing loop stages (grab, fingerprint, detect, decide, act, sleep).
+# Each stage feeds a fixed-size log2 histogram, so recording is O(1) and memory never grows.
+# Optionally keeps the last N per-frame spans for a Chrome trace export (chrome://tracing or Perfetto).
+
+NUM_BUCKETS = 40 # Bucket i holds durations in [2^(i-1), 2^i) ns; 2^40 ns is about 18 minutes
+
+
+class StageProfiler:
+    def __init__(self, stages, trace_capacity=0):
+        self.stages = list(stages)
+        self.histograms = {stage: [0] * NUM_BUCKETS for stage in self.stages}
+        self.counts = {stage: 0 for stage in self.stages}
+        self.totals_ns = {stage: 0 for stage in self.stages}
+        self.max_ns = {stage: 0 for stage in self.stages}
+        # Ring buffer of (stage, start_ns, duration_ns, frame) spans, only if tracing is enabled
+        self.spans = deque(maxlen=trace_capacity) if trace_capacity else None
+        self.frame = 0
+        self.origin_ns = time.perf_counter_ns()
+
+    def next_frame(self):
+        self.frame += 1
+
+    def record(self, stage, start_ns, end_ns):
+        """Records one stage duration measured with time.perf_counter_ns()."""
+        duration = end_ns - start_ns
+        bucket = min(duration.bit_length(), NUM_BUCKETS - 1)
+        self.histograms[stage][bucket] += 1
+        self.counts[stage] += 1
+        self.totals_ns[stage] += duration
+        if duration > self.max_ns[stage]:
+            self.max_ns[stage] = duration
+        if self.spans is not None:
+            self.spans.append((stage, start_ns, duration, self.frame))
+
+    def percentile_ns(self, stage, fraction):
+        """Upper bound of the histogram bucket holding the given fraction of samples."""
+        count = self.counts[stage]
+        if count == 0:
+            return 0
+        target = fraction * count
+        seen = 0
+        for bucket, bucket_count in enumerate(self.histograms[stage]):
+            seen += bucket_count
+            if seen >= target:
+                return min(1 << bucket, self.max_ns[stage])
+        return self.max_ns[stage]
+
+    def summary(self):
+        """Returns a small text table of per-stage timings (in milliseconds)."""
+        width = max(8, *map(len, self.stages))
+        lines = [f"{'stage':<{width}} {'count':>7} {'mean':>9} {'p50<=':>9} {'p99<=':>9} {'max':>9}"]
+        for stage in self.stages:
+            count = self.counts[stage]
+            if count == 0:
+                lines.append(f"{stage:<{width}} {0:>7}")
+                continue
+            mean = self.totals_ns[stage] / count / 1e6
+            p50 = self.percentile_ns(stage, 0.50) / 1e6
+            p99 = self.percentile_ns(stage, 0.99) / 1e6
+            worst = self.max_ns[stage] / 1e6
+            lines.append(f"{stage:<{width}} {count:>7} {mean:>9.3f} {p50:>9.3f} {p99:>9.3f} {worst:>9.3f}")
+        return "\n".join(lines)
+
+    def export_chrome_trace(self, path):
+        """Writes the recorded spans as Chrome trace JSON ("X" complete events, microseconds)."""
+        if self.spans is None:
+            print("Tracing is disabled; nothing to export.")
+            return
+        pid = os.getpid()
+        events = [
+            {
+                "name": stage,
+                "cat": "fisher",
+                "ph": "X",
+                "ts": (start_ns - self.origin_ns) / 1000,
+                "dur": duration / 1000,
+                "pid": pid,
+                "tid": 0 if stage in ("grab", "fingerprint") else 1, # Capture thread vs event loop
+                "args": {"frame": frame},
+            }
+            for stage, start_ns, duration, frame in self.spans
+        ]
+        with open(path, 'w') as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        print(f"Wrote {len(events)} trace events to {path}")